@@ -0,0 +1,74 @@
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from rest_framework.exceptions import NotFound, PermissionDenied
+
+from boards_app.cache import aget_board_detail, aset_board_detail
+from boards_app.models import Boards
+from core.async_views import AsyncReadView, render_json
+from core.conditional import not_modified_response, set_validators
+from core.fieldsets import request_fieldset
+from .serializers import BoardsDetailSerializer, BoardsSerializer
+from .views import BOARD_FORBIDDEN, BoardsViewSet, board_etag
+
+
+class BoardListAsyncView(AsyncReadView):
+    """
+    Async GET /api/boards/: the boards the user owns or is a member of.
+    """
+    fallback = BoardsViewSet.as_view({'get': 'list', 'post': 'create'})
+    authentication_message = 'Authentication required to access boards.'
+
+    async def read(self, request, user):
+        boards = [board async for board in Boards.objects.visible_to(user)]
+        return BoardsSerializer(boards, many=True, context={'fieldset': request_fieldset(request)}).data
+
+
+class BoardDetailAsyncView(AsyncReadView):
+    """
+    Async GET /api/boards/<id>/.
+
+    Like `BoardsViewSet.retrieve`, answers conditional requests from the
+    version stamp and serves the rendered document from the board detail
+    cache, which both paths share.
+    """
+    fallback = BoardsViewSet.as_view({
+        'get': 'retrieve', 'put': 'update', 'patch': 'partial_update', 'delete': 'destroy',
+    })
+    authentication_message = 'Authentication required to access boards.'
+
+    async def read(self, request, user, pk):
+        stamp = await (
+            Boards.objects
+            .visible_to(user)
+            .filter(pk=pk)
+            .values('id', 'version', 'updated_at')
+            .afirst()
+        )
+        if stamp is None:
+            if await Boards.objects.filter(pk=pk).aexists():
+                raise PermissionDenied(BOARD_FORBIDDEN)
+            raise NotFound('No Boards matches the given query.')
+
+        etag = board_etag(stamp)
+        response = not_modified_response(request, etag, stamp['updated_at'])
+        if response is None:
+            response = await self.render_board(request, pk, stamp['version'])
+        return set_validators(response, etag, stamp['updated_at'])
+
+    async def render_board(self, request, pk, version):
+        """
+        Return the rendered board detail of the given version, from the cache if possible.
+        """
+        fieldset = request_fieldset(request)
+        cached = await aget_board_detail(pk, version, fieldset.key)
+        if cached is not None:
+            content, content_type = cached
+            return HttpResponse(content, content_type=content_type)
+
+        board = await Boards.objects.with_details(fieldset).aget(pk=pk)
+        context = {'request': request, 'fieldset': fieldset}
+        # The tasks are fetched as rows while serializing; only on cache misses.
+        data = await sync_to_async(lambda: BoardsDetailSerializer(board, context=context).data)()
+        response = render_json(data)
+        await aset_board_detail(pk, version, response.content, response['Content-Type'], fieldset.key)
+        return response
@@ -1,9 +1,11 @@
 from rest_framework import serializers
 from boards_app.models import Boards
 from django.contrib.auth.models import User
+from core.fieldsets import ALL_FIELDS, SparseFieldsetSerializerMixin
+from core.middleware import MeasuredSerializerMixin
 
 
-class UserMinimalSerializer(serializers.ModelSerializer):
+class UserMinimalSerializer(MeasuredSerializerMixin, serializers.ModelSerializer):
     fullname = serializers.SerializerMethodField()
 
     class Meta:
@@ -14,13 +16,15 @@ class UserMinimalSerializer(serializers.ModelSerializer):
         return f"{obj.first_name} {obj.last_name}".strip()
 
 
-class BoardsSerializer(serializers.ModelSerializer):
+class BoardsSerializer(MeasuredSerializerMixin, SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for the Boards model.
 
-    This serializer provides computed fields to display metadata about a board,
-    such as the number of members, tickets, tasks to do, and high-priority tasks.
-    It also includes the owner's ID explicitly.
+    This serializer provides metadata about a board, such as the number of
+    members, tickets, tasks to do, and high-priority tasks. The counters are
+    read from the denormalized columns on the board, so no extra queries are
+    needed. It also includes the owner's ID explicitly.
+    Reads are limited to the `fieldset` context (see `core.fieldsets`).
 
     Fields:
         id (int): Unique identifier of the board.
@@ -30,19 +34,7 @@ class BoardsSerializer(serializers.ModelSerializer):
         tasks_to_do_count (int): Count of tasks with status 'to-do'.
         tasks_high_prio_count (int): Count of tasks with priority 'high'.
         owner_id (int): ID of the user who owns the board.
-
-    Methods:
-        get_member_count(obj): Returns the number of members associated with the board.
-        get_ticket_count(obj): Returns the number of tasks related to the board.
-        get_tasks_to_do_count(obj): Returns the number of tasks with status 'to-do'.
-        get_tasks_high_prio_count(obj): Returns the number of tasks with priority 'high'.
-        perform_create(serializer): Sets the owner of the board to the current request user.
     """
-    member_count = serializers.SerializerMethodField()
-    ticket_count = serializers.SerializerMethodField()
-    tasks_to_do_count = serializers.SerializerMethodField()
-    tasks_high_prio_count = serializers.SerializerMethodField()
-
 
     # WRITE: Accepts member IDs
     members = serializers.PrimaryKeyRelatedField(
@@ -63,57 +55,10 @@ class BoardsSerializer(serializers.ModelSerializer):
             'owner_id',
             'members',    
         ]
+        read_only_fields = Boards.COUNTER_FIELDS
 
-    def get_member_count(self, obj):
-        """
-        Return the number of members associated with the board.
-
-        Args:
-            obj (Boards): The board instance.
-
-        Returns:
-            int: Number of users linked as members.
-        """
-        return obj.members.count()
-
-    def get_ticket_count(self, obj):
-        """
-        Return the number of tasks assigned to the board.
-
-        Args:
-            obj (Boards): The board instance.
-
-        Returns:
-            int: Number of related tasks.
-        """
-        return obj.tasks.count()
-
-    def get_tasks_high_prio_count(self, obj):
-        """
-        Return the number of tasks with high priority.
 
-        Args:
-            obj (Boards): The board instance.
-
-        Returns:
-            int: Count of tasks with priority set to 'high'.
-        """
-        return obj.tasks.filter(priority='high').count()
-    
-    def get_tasks_to_do_count(self, obj):
-        """
-        Return the number of tasks with status to-do.
-
-        Args:
-            obj (Boards): The board instance.
-
-        Returns:
-            int: Count of tasks with priority set to 'high'.
-        """
-        return obj.tasks.filter(status='to-do').count()
-
-
-class BoardsDetailSerializer(serializers.ModelSerializer):
+class BoardsDetailSerializer(MeasuredSerializerMixin, serializers.ModelSerializer):
     """
     Detailed serializer for the Boards model.
 
@@ -130,6 +75,8 @@ class BoardsDetailSerializer(serializers.ModelSerializer):
     Special behavior:
         - On PATCH requests, the representation includes `owner_data`
           and `members_data` with detailed user info instead of standard fields.
+        - Other reads are limited to the `fieldset` context (see
+          `core.fieldsets`); members and tasks are only loaded if requested.
     """
 
     owner_id = serializers.IntegerField(source='owner.id', read_only=True)
@@ -146,19 +93,30 @@ class BoardsDetailSerializer(serializers.ModelSerializer):
         model = Boards
         fields = ['id', 'title', 'owner_id', 'members', 'tasks']
 
-    def get_tasks(self, obj):
+    def get_tasks(self, obj, fieldset=ALL_FIELDS):
         """
         Retrieve all tasks related to this board.
 
+        Tasks are serialized from `.values()` rows in the shape of
+        `TasksSerializerNoBoard`, ordered by id.
+
         Args:
             obj (Boards): The board instance.
+            fieldset (Fieldset): The fields of each task to serialize.
 
         Returns:
             list: Serialized list of related tasks without board details.
         """
-        from tasks_app.api.serializers import TasksSerializerNoBoard
-        tasks = obj.tasks.all()
-        return TasksSerializerNoBoard(tasks, many=True).data
+        from tasks_app.api.serializers import serialize_task_rows
+        return serialize_task_rows(self.get_task_rows(obj, fieldset), include_board=False, fieldset=fieldset)
+
+    @staticmethod
+    def get_task_rows(obj, fieldset=ALL_FIELDS):
+        """
+        Return the task rows of a board, ordered by id, as serialized by `get_tasks`.
+        """
+        from tasks_app.api.serializers import task_rows
+        return task_rows(obj.tasks.order_by('pk'), fieldset)
 
     def to_representation(self, instance):
         """
@@ -166,6 +124,8 @@ class BoardsDetailSerializer(serializers.ModelSerializer):
 
         On PATCH requests, return a simplified representation containing
         `owner_data` and detailed `members_data`.
+        Other representations only contain the fields of the `fieldset`
+        context.
 
         Args:
             instance (Boards): The board instance.
@@ -181,13 +141,15 @@ class BoardsDetailSerializer(serializers.ModelSerializer):
                 'owner_data': UserMinimalSerializer(instance.owner).data,
                 'members_data': UserMinimalSerializer(instance.members.all(), many=True).data
             }
-        return {
-            'id': instance.id,
-            'title': instance.title,
-            'owner_id': instance.owner.id,
-            'members': UserMinimalSerializer(instance.members.all(), many=True).data,
-            'tasks': self.get_tasks(instance)
+        fieldset = self.context.get('fieldset', ALL_FIELDS)
+        fields = {
+            'id': lambda: instance.id,
+            'title': lambda: instance.title,
+            'owner_id': lambda: instance.owner_id,
+            'members': lambda: UserMinimalSerializer(instance.members.all(), many=True).data,
+            'tasks': lambda: self.get_tasks(instance, fieldset['tasks']),
         }
+        return fieldset.apply({name: value() for name, value in fields.items() if fieldset.wants(name)})
 
     def update(self, instance, validated_data):
         """
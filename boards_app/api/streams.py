@@ -0,0 +1,160 @@
+import asyncio
+import hashlib
+import json
+import secrets
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import JsonResponse, StreamingHttpResponse
+from rest_framework.exceptions import AuthenticationFailed
+
+from boards_app.events import board_topic, broker, user_topic
+from boards_app.models import Boards
+from user_auth_app.api.authentication import CachedTokenAuthentication
+
+
+def format_event(event):
+    """
+    Encode an event as a server-sent events message.
+
+    Args:
+        event (dict): The event; its `type` becomes the SSE event name.
+
+    Returns:
+        str: The encoded message.
+    """
+    return f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+
+def issue_ticket(token):
+    """
+    Issue a single-use ticket that opens an event stream for `token`.
+
+    Browsers cannot set headers on an `EventSource`, so they pass a ticket
+    in the query string instead of the token itself, which would end up in
+    access logs. Tickets are kept in the `event_tickets` cache, shared by
+    the worker issuing them and the ASGI process redeeming them, and expire
+    after `BOARD_EVENTS_TICKET_TTL` seconds.
+
+    Args:
+        token (Token): The token the stream authenticates with.
+
+    Returns:
+        str: The ticket.
+    """
+    ticket = secrets.token_urlsafe(32)
+    caches['event_tickets'].set(ticket_cache_key(ticket), token.key, getattr(settings, 'BOARD_EVENTS_TICKET_TTL', 30))
+    return ticket
+
+
+def redeem_ticket(ticket):
+    """
+    Return the token key of a ticket and invalidate it, or None if it is unknown, used or expired.
+    """
+    cache = caches['event_tickets']
+    key = cache.get(ticket_cache_key(ticket))
+    # Only the request that actually deletes the entry may use the ticket.
+    if key is None or not cache.delete(ticket_cache_key(ticket)):
+        return None
+    return key
+
+
+def ticket_cache_key(ticket):
+    return 'event-ticket:' + hashlib.sha256(ticket.encode()).hexdigest()
+
+
+def get_token_key(request):
+    """
+    Return the token sent in the `Authorization` header or redeemed from the `ticket` query parameter.
+    """
+    header = request.headers.get('Authorization', '').split()
+    if len(header) == 2 and header[0].lower() == CachedTokenAuthentication.keyword.lower():
+        return header[1]
+    ticket = request.GET.get('ticket')
+    return redeem_ticket(ticket) if ticket else None
+
+
+async def get_topics(user):
+    """
+    Return the topics a user's stream subscribes to.
+
+    Args:
+        user (User): The authenticated user.
+
+    Returns:
+        list: The user's own topic and the topics of all boards the user can see.
+    """
+    board_ids = Boards.objects.visible_to(user).values_list('pk', flat=True)
+    return [user_topic(user.pk)] + [board_topic(board_id) async for board_id in board_ids]
+
+
+async def event_stream(user, key, topics):
+    """
+    Yield the board events of a user as server-sent events.
+
+    Starts with a `ready` event, after which the client should fetch the
+    changes it missed while disconnected. A comment line is sent whenever
+    no event arrived for `BOARD_EVENTS_HEARTBEAT` seconds, so proxies keep
+    the connection open. When the user gains or loses access to a board,
+    the subscription is updated before the `access` event is forwarded.
+    Every `BOARD_EVENTS_RECHECK` seconds the token is authenticated again
+    and the subscription updated; once the token is deleted or the user
+    deactivated, a `revoked` event ends the stream.
+
+    Args:
+        user (User): The authenticated user.
+        key (str): The key of the token the stream was opened with.
+        topics (list): The initial topics, see `get_topics`.
+
+    Yields:
+        str: Encoded SSE messages.
+    """
+    heartbeat = getattr(settings, 'BOARD_EVENTS_HEARTBEAT', 15)
+    recheck = getattr(settings, 'BOARD_EVENTS_RECHECK', 60)
+    loop = asyncio.get_running_loop()
+    with broker.subscribe(topics) as subscription:
+        yield format_event({'type': 'ready'})
+        checked_at = loop.time()
+        while True:
+            try:
+                event = await subscription.get(timeout=min(heartbeat, recheck))
+            except asyncio.TimeoutError:
+                event = None
+            if (event is not None and event['type'] == 'access') or loop.time() - checked_at >= recheck:
+                try:
+                    user, _ = await CachedTokenAuthentication().aauthenticate_credentials(key)
+                except AuthenticationFailed:
+                    yield format_event({'type': 'revoked'})
+                    return
+                broker.resubscribe(subscription, await get_topics(user))
+                checked_at = loop.time()
+            yield ': keep-alive\n\n' if event is None else format_event(event)
+
+
+async def board_events(request):
+    """
+    Stream task, comment and membership events of the user's boards.
+
+    Only served by the ASGI application (see `core.asgi_urls`); every open
+    stream is a coroutine waiting on its queue, not a worker or thread.
+
+    Authenticates with the `Authorization` header or a `ticket` from
+    `POST /api/events/tickets/`; tokens in the query string are not
+    accepted.
+
+    Returns:
+        StreamingHttpResponse | JsonResponse: The event stream, or 401 if
+        the token or ticket is missing or invalid.
+    """
+    key = get_token_key(request)
+    if not key:
+        return JsonResponse({'detail': 'Authentication credentials were not provided.'}, status=401)
+    try:
+        user, _ = await CachedTokenAuthentication().aauthenticate_credentials(key)
+    except AuthenticationFailed as exc:
+        return JsonResponse({'detail': str(exc.detail)}, status=401)
+
+    response = StreamingHttpResponse(event_stream(user, key, await get_topics(user)), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -1,5 +1,5 @@
 from django.urls import path, include
-from .views import BoardsViewSet
+from .views import BoardEventTicketView, BoardsViewSet
 from rest_framework.routers import DefaultRouter
 from user_auth_app.api.views import EmailCheckView
 
@@ -10,4 +10,5 @@ router.register(r'boards', BoardsViewSet)
 urlpatterns = [
    path('', include( router.urls)),
    path('email-check/', EmailCheckView.as_view(), name='email-check'),
+   path('events/tickets/', BoardEventTicketView.as_view(), name='board-event-tickets'),
 ]
\ No newline at end of file
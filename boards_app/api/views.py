@@ -1,8 +1,28 @@
-from boards_app.models import Boards
-from rest_framework import viewsets
+from boards_app.models import BoardChange, Boards
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
 from rest_framework.permissions import BasePermission
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from .serializers import BoardsSerializer, BoardsDetailSerializer
-from rest_framework.exceptions import NotAuthenticated, PermissionDenied
+from rest_framework.exceptions import NotAuthenticated, PermissionDenied, ValidationError
+from tasks_app.models import Comment, Tasks
+from django.conf import settings
+from django.http import HttpResponse
+from core.conditional import ConditionalRetrieveMixin
+from core.fieldsets import SparseFieldsetViewMixin
+from boards_app.api.streams import issue_ticket
+from boards_app.cache import get_board_detail, set_board_detail
+
+
+BOARD_FORBIDDEN = "Forbidden. You do not have permission to perform this action."
+
+
+def board_etag(stamp):
+    """
+    Return the quoted ETag of a board version stamp with `id` and `version`.
+    """
+    return f'"board-{stamp["id"]}-v{stamp["version"]}"'
 
 
 # Permission class to control access to Board instances.
@@ -31,10 +51,10 @@ class BoardAccessPermission(BasePermission):
             if obj.owner == user:
                 return True
 
-        raise PermissionDenied("Forbidden. You do not have permission to perform this action.")
+        raise PermissionDenied(BOARD_FORBIDDEN)
 
 
-class BoardsViewSet(viewsets.ModelViewSet):
+class BoardsViewSet(SparseFieldsetViewMixin, ConditionalRetrieveMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing Boards.
 
@@ -47,6 +67,12 @@ class BoardsViewSet(viewsets.ModelViewSet):
         - Uses `BoardsSerializer` for other actions, such as list and create.
         - Automatically assigns the currently authenticated user as the owner
           when creating a new board.
+        - `retrieve` sends an ETag based on the board version and answers
+          `If-None-Match` with 304 without loading the tasks.
+        - Rendered JSON board details are cached per board version and
+          sparse fieldset.
+        - `changes` returns the tasks and comments changed after a cursor
+          from the board change log.
 
     Permissions:
         - By default, allows any read-only access.
@@ -55,6 +81,73 @@ class BoardsViewSet(viewsets.ModelViewSet):
 
     queryset = Boards.objects.all()
     permission_classes = [BoardAccessPermission]
+    changes_limit = 500
+
+    def get_queryset(self):
+        """
+        Returns the boards queryset for the current action.
+
+        The list action only returns boards the user owns or is a member of;
+        `BoardsSerializer` reads the stored counters, so no per-board COUNT
+        queries are issued.
+        Detail actions preload the owner and the members (unless the
+        fieldset leaves them out) so that `BoardsDetailSerializer` renders
+        without N+1 queries.
+
+        Returns:
+            QuerySet: Boards for the current action.
+        """
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            queryset = queryset.visible_to(self.request.user)
+        elif self.action in ['retrieve', 'partial_update', 'update']:
+            queryset = queryset.with_details(self.get_fieldset())
+        return queryset
+
+    def get_version_stamp(self):
+        """
+        Return the ETag and last modification time of the requested board.
+
+        Returns:
+            tuple | None: The version stamp, or None if the board is not
+            visible to the user.
+        """
+        stamp = (
+            Boards.objects
+            .visible_to(self.request.user)
+            .filter(pk=self.kwargs['pk'])
+            .values('id', 'version', 'updated_at')
+            .first()
+        )
+        if stamp is None:
+            return None
+        self.board_version = stamp['version']
+        return board_etag(stamp), stamp['updated_at']
+
+    def retrieve_current(self, request, etag, *args, **kwargs):
+        """
+        Serve the board detail from the versioned cache, rendering it on a miss.
+
+        Only plain JSON responses are cached; other formats (e.g. the
+        browsable API) are rendered as usual. Access is checked before the
+        cache is consulted, by the visibility filter of the version stamp.
+
+        Returns:
+            HttpResponse: The rendered board detail.
+        """
+        renderer = request.accepted_renderer
+        if renderer.format != 'json' or request.accepted_media_type != renderer.media_type:
+            return super().retrieve_current(request, etag, *args, **kwargs)
+
+        board_id, variant = self.kwargs['pk'], self.get_fieldset().key
+        cached = get_board_detail(board_id, self.board_version, variant)
+        if cached is None:
+            serializer = self.get_serializer(self.get_object())
+            content = renderer.render(serializer.data, renderer.media_type, self.get_renderer_context())
+            cached = (content, renderer.media_type)
+            set_board_detail(board_id, self.board_version, *cached, variant=variant)
+        content, content_type = cached
+        return HttpResponse(content, content_type=content_type)
 
     def get_serializer_class(self):
         """
@@ -71,9 +164,149 @@ class BoardsViewSet(viewsets.ModelViewSet):
         """
         Handles creation of a new Board instance.
 
-        Automatically sets the owner field to the currently authenticated user.
+        Automatically sets the owner field to the currently authenticated user
+        and reloads the counters, which were updated in the database when the
+        members were added.
 
         Args:
             serializer (Serializer): The serializer instance with validated data.
         """
-        serializer.save(owner=self.request.user)
\ No newline at end of file
+        board = serializer.save(owner=self.request.user)
+        board.refresh_from_db(fields=Boards.COUNTER_FIELDS)
+
+    @action(detail=True, methods=['get'])
+    def changes(self, request, pk=None):
+        """
+        Return the tasks and comments of the board that changed after a cursor.
+
+        `?since=<cursor>` reads the board change log from the given cursor
+        and returns the current state of every task and comment created or
+        updated since, plus the ids of deleted ones. At most
+        `changes_limit` log entries are read per request; `has_more`
+        tells the client to ask again with the returned cursor.
+
+        Without `since`, or when the cursor predates the truncated part of
+        the log, the whole board is returned with `reset` set, and the
+        client should replace its copy.
+
+        Returns:
+            Response: The changes and the cursor to use for the next request.
+        """
+        board = self.get_object()
+        since = request.query_params.get('since')
+        if since is None:
+            return Response(self.get_board_snapshot(board))
+        if not (since.isascii() and since.isdigit()):
+            raise ValidationError({'since': 'The cursor must be a non-negative integer.'})
+
+        entries = list(
+            BoardChange.objects
+            .filter(board=board, id__gt=int(since))
+            .order_by('id')
+            .values_list('id', 'kind', 'object_id', 'action')[:self.changes_limit + 1]
+        )
+        if entries and entries[0][3] == BoardChange.ACTION_TRUNCATE:
+            return Response(self.get_board_snapshot(board))
+
+        has_more = len(entries) > self.changes_limit
+        entries = entries[:self.changes_limit]
+        latest = {}
+        for _, kind, object_id, change in entries:
+            latest[(kind, object_id)] = change
+        upserted = {BoardChange.KIND_TASK: set(), BoardChange.KIND_COMMENT: set()}
+        for (kind, object_id), change in latest.items():
+            if change == BoardChange.ACTION_UPSERT:
+                upserted[kind].add(object_id)
+
+        tasks = Tasks.objects.none()
+        if upserted[BoardChange.KIND_TASK]:
+            tasks = board.tasks.filter(pk__in=upserted[BoardChange.KIND_TASK])
+        comments = Comment.objects.none()
+        if upserted[BoardChange.KIND_COMMENT]:
+            comments = Comment.objects.filter(task__board=board, pk__in=upserted[BoardChange.KIND_COMMENT])
+        payload = self.serialize_board_content(tasks, comments)
+
+        # Upserted objects that are gone by now were deleted or moved away.
+        found = {
+            BoardChange.KIND_TASK: {task['id'] for task in payload['tasks']},
+            BoardChange.KIND_COMMENT: {comment['id'] for comment in payload['comments']},
+        }
+        deleted = {BoardChange.KIND_TASK: [], BoardChange.KIND_COMMENT: []}
+        for (kind, object_id), change in latest.items():
+            if kind in deleted and object_id not in found[kind]:
+                deleted[kind].append(object_id)
+
+        return Response({
+            'cursor': entries[-1][0] if entries else int(since),
+            'has_more': has_more,
+            'reset': False,
+            **payload,
+            'deleted': {'tasks': sorted(deleted[BoardChange.KIND_TASK]),
+                        'comments': sorted(deleted[BoardChange.KIND_COMMENT])},
+        })
+
+    def get_board_snapshot(self, board):
+        """
+        Return all tasks and comments of the board as a full resynchronization.
+
+        The cursor is read before the content, so changes made in between
+        are delivered again by the next delta request rather than lost.
+
+        Args:
+            board (Boards): The board.
+
+        Returns:
+            dict: The change feed payload with `reset` set.
+        """
+        cursor = BoardChange.objects.latest_cursor(board.pk)
+        payload = self.serialize_board_content(
+            board.tasks.all(),
+            Comment.objects.filter(task__board=board),
+        )
+        return {
+            'cursor': cursor,
+            'has_more': False,
+            'reset': True,
+            **payload,
+            'deleted': {'tasks': [], 'comments': []},
+        }
+
+    def serialize_board_content(self, tasks, comments):
+        """
+        Serialize tasks and comments for the change feed.
+
+        Args:
+            tasks (QuerySet): Tasks to include.
+            comments (QuerySet): Comments to include.
+
+        Returns:
+            dict: Serialized `tasks` and `comments`; comments carry their task id.
+        """
+        from tasks_app.api.serializers import CommentSerializer, serialize_task_rows, task_rows
+        comments = comments.select_related('author').order_by('pk')
+        return {
+            'tasks': serialize_task_rows(task_rows(tasks.order_by('pk')), include_board=False),
+            'comments': [
+                {**CommentSerializer(comment).data, 'task': comment.task_id}
+                for comment in comments
+            ],
+        }
+
+
+class BoardEventTicketView(APIView):
+    """
+    Issue a single-use ticket for opening the event stream at `/api/events/`.
+
+    The stream is opened with `GET /api/events/?ticket=<ticket>` within
+    `BOARD_EVENTS_TICKET_TTL` seconds; see `boards_app.api.streams`.
+
+    Methods:
+        post(): Returns a new ticket for the authenticated token.
+    """
+
+    def post(self, request):
+        ticket = issue_ticket(request.auth)
+        return Response(
+            {'ticket': ticket, 'expires_in': getattr(settings, 'BOARD_EVENTS_TICKET_TTL', 30)},
+            status=status.HTTP_201_CREATED,
+        )
@@ -0,0 +1,78 @@
+"""
+Versioned cache of rendered board detail documents.
+
+Entries are keyed by board id, board version and sparse fieldset (see
+`core.fieldsets`), so any change that advances `Boards.version` makes
+older entries unreachable; they are never served stale and simply age
+out of the cache. The cache alias is
+`board_detail` (locmem per process, or file based to share between
+workers); documents larger than `BOARD_DETAIL_CACHE_MAX_BYTES` are not
+stored, which together with the backend's MAX_ENTRIES caps memory use.
+"""
+from django.conf import settings
+from django.core.cache import caches
+
+
+def _cache():
+    return caches['board_detail']
+
+
+def _key(board_id, version, variant=''):
+    key = f'board-detail:{board_id}:{version}'
+    return f'{key}:{variant}' if variant else key
+
+
+def get_board_detail(board_id, version, variant=''):
+    """
+    Return the cached rendered document of a board version.
+
+    Args:
+        board_id (int): The board id.
+        version (int): The board version.
+        variant (str): Key of the sparse fieldset, empty for the full document.
+
+    Returns:
+        tuple | None: (content bytes, content type) or None on a miss.
+    """
+    return _cache().get(_key(board_id, version, variant))
+
+
+async def aget_board_detail(board_id, version, variant=''):
+    """
+    Async counterpart of `get_board_detail`.
+    """
+    return await _cache().aget(_key(board_id, version, variant))
+
+
+def _fits(content):
+    return len(content) <= getattr(settings, 'BOARD_DETAIL_CACHE_MAX_BYTES', 512 * 1024)
+
+
+def set_board_detail(board_id, version, content, content_type, variant=''):
+    """
+    Store the rendered document of a board version if it fits the size cap.
+
+    Args:
+        board_id (int): The board id.
+        version (int): The board version the document was built for.
+        content (bytes): The rendered document.
+        content_type (str): The response content type.
+        variant (str): Key of the sparse fieldset, empty for the full document.
+
+    Returns:
+        bool: True if the document was cached.
+    """
+    if not _fits(content):
+        return False
+    _cache().set(_key(board_id, version, variant), (content, content_type))
+    return True
+
+
+async def aset_board_detail(board_id, version, content, content_type, variant=''):
+    """
+    Async counterpart of `set_board_detail`.
+    """
+    if not _fits(content):
+        return False
+    await _cache().aset(_key(board_id, version, variant), (content, content_type))
+    return True
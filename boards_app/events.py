@@ -0,0 +1,182 @@
+"""
+In-process publish/subscribe of board events.
+
+The signal handlers in `boards_app.signals` publish an event on the topic
+of the affected board once the surrounding transaction commits, and on the
+topic of a user whose board access changed. The server-sent events stream
+in `boards_app.api.streams` subscribes to the topics of one user.
+
+Subscribers are bound to an asyncio event loop and only hold a bounded
+queue, so a single loop serves thousands of idle connections. A consumer
+that falls behind does not slow down publishers: once its queue is full,
+the queued events are dropped and replaced by one `resync` event, after
+which the client catches up through `/api/boards/<id>/changes/`.
+
+The broker is process local. Writes and streams must be served by the same
+ASGI process, or `broker` has to be replaced by an implementation backed by
+an external message bus with the same `subscribe`/`publish` interface.
+"""
+import asyncio
+import threading
+
+from django.conf import settings
+
+from core import metrics
+
+RESYNC = {'type': 'resync'}
+
+
+def board_topic(board_id):
+    return f'board:{board_id}'
+
+
+def user_topic(user_id):
+    return f'user:{user_id}'
+
+
+class Subscription:
+    """
+    Bounded event queue of one subscriber, bound to the running event loop.
+
+    Methods:
+        get(timeout): Waits for the next event.
+        push(event): Queues an event; runs on the subscriber's loop.
+        close(): Unsubscribes from all topics.
+    """
+
+    def __init__(self, broker, topics, max_queue):
+        self.broker = broker
+        self.topics = frozenset(topics)
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=max_queue)
+
+    async def get(self, timeout=None):
+        """
+        Wait for the next event.
+
+        Args:
+            timeout (float | None): Seconds to wait before giving up.
+
+        Returns:
+            dict: The event.
+
+        Raises:
+            TimeoutError: If no event arrived within `timeout`.
+        """
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+    def push(self, event):
+        """
+        Queue an event, collapsing the backlog into a resync event when full.
+        """
+        if self.queue.full():
+            dropped = 0
+            while not self.queue.empty():
+                self.queue.get_nowait()
+                dropped += 1
+            metrics.counter('events.dropped').inc(dropped + 1)
+            event = RESYNC
+        self.queue.put_nowait(event)
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class Broker:
+    """
+    Thread-safe fan-out of events to the subscribers of a topic.
+
+    `publish` may be called from any thread; events are handed to each
+    subscriber's event loop with `call_soon_threadsafe`.
+
+    Methods:
+        subscribe(topics): Returns a new subscription to the given topics.
+        resubscribe(subscription, topics): Replaces the topics of a subscription.
+        unsubscribe(subscription): Removes a subscription.
+        publish(topic, event): Delivers an event to the topic's subscribers.
+    """
+
+    def __init__(self):
+        self._subscribers = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, topics, max_queue=None):
+        """
+        Subscribe the current event loop to the given topics.
+
+        Args:
+            topics (Iterable[str]): Topics to receive events from.
+            max_queue (int | None): Queue size, defaults to `BOARD_EVENTS_QUEUE_SIZE`.
+
+        Returns:
+            Subscription: The new subscription; use it as a context manager
+            or call `close()` when done.
+        """
+        if max_queue is None:
+            max_queue = getattr(settings, 'BOARD_EVENTS_QUEUE_SIZE', 100)
+        subscription = Subscription(self, topics, max_queue)
+        with self._lock:
+            for topic in subscription.topics:
+                self._subscribers.setdefault(topic, set()).add(subscription)
+        metrics.gauge('events.subscribers').inc()
+        return subscription
+
+    def resubscribe(self, subscription, topics):
+        """
+        Replace the topics of an existing subscription, keeping its queue.
+        """
+        with self._lock:
+            self._remove(subscription)
+            subscription.topics = frozenset(topics)
+            for topic in subscription.topics:
+                self._subscribers.setdefault(topic, set()).add(subscription)
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            removed = self._remove(subscription)
+        if removed:
+            metrics.gauge('events.subscribers').dec()
+
+    def _remove(self, subscription):
+        removed = False
+        for topic in subscription.topics:
+            subscribers = self._subscribers.get(topic)
+            if subscribers and subscription in subscribers:
+                subscribers.discard(subscription)
+                removed = True
+                if not subscribers:
+                    del self._subscribers[topic]
+        return removed
+
+    def publish(self, topic, event):
+        """
+        Deliver an event to every subscriber of a topic.
+
+        Args:
+            topic (str): The topic, see `board_topic` and `user_topic`.
+            event (dict): JSON serializable event.
+
+        Returns:
+            int: Number of subscribers the event was handed to.
+        """
+        with self._lock:
+            subscribers = list(self._subscribers.get(topic, ()))
+        delivered = 0
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.push, event)
+                delivered += 1
+            except RuntimeError:
+                # The subscriber's loop is closed; it will never read again.
+                self.unsubscribe(subscription)
+        metrics.counter('events.published').inc()
+        return delivered
+
+
+broker = Broker()
@@ -0,0 +1,299 @@
+import json
+import statistics
+import time
+from contextlib import ExitStack
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+from django.test import Client
+from django.test.utils import override_settings
+from rest_framework.authtoken.models import Token
+
+from boards_app.models import Boards
+from boards_app.seed import SEED_PASSWORD
+from tasks_app.models import Comment, Tasks
+
+
+LATENCY_METRICS = ('p50_ms', 'p95_ms', 'p99_ms')
+
+
+class QueryCounter:
+    """
+    Database execute wrapper counting the queries run through it.
+    """
+
+    def __init__(self):
+        self.queries = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries += 1
+        return execute(sql, params, many, context)
+
+
+class Route:
+    """
+    One benchmarked API call.
+
+    Attributes:
+        method (str): HTTP method.
+        name (str): Route label, e.g. `GET /api/tasks/<id>/`.
+        path (str | callable): Request path. Writes may pass a function
+            creating the target object and returning the path; it runs
+            untimed before every request, inside the rolled back
+            transaction.
+        data (dict): JSON body of the request.
+        auth (bool): Whether to send the token.
+    """
+
+    def __init__(self, method, name, path, data=None, auth=True):
+        self.method = method
+        self.name = f'{method} {name}'
+        self.path = path
+        self.data = data
+        self.auth = auth
+
+    @property
+    def writes(self):
+        return self.method != 'GET'
+
+
+def percentiles(latencies):
+    """
+    Return p50, p95 and p99 of latencies in milliseconds.
+    """
+    cuts = statistics.quantiles(latencies, n=100, method='inclusive')
+    return {'p50_ms': round(cuts[49], 3), 'p95_ms': round(cuts[94], 3), 'p99_ms': round(cuts[98], 3)}
+
+
+def compare(report, baseline, tolerance):
+    """
+    Diff a benchmark report against a baseline report.
+
+    A route regressed if it runs more queries, or if one of its latency
+    percentiles grew by more than `tolerance` percent.
+
+    Args:
+        report (dict): The current report.
+        baseline (dict): A report of an earlier run.
+        tolerance (float): Allowed latency growth in percent.
+
+    Returns:
+        tuple: (diff, regressions). The diff maps each route present in both
+        reports to its metrics with baseline, current and change in percent.
+    """
+    diff, regressions = {}, []
+    for name, current in report['routes'].items():
+        previous = baseline.get('routes', {}).get(name)
+        if previous is None:
+            continue
+        diff[name] = {}
+        for metric in ('queries', 'bytes') + LATENCY_METRICS:
+            before, after = previous.get(metric), current.get(metric)
+            if before is None or after is None:
+                continue
+            change = round((after - before) / before * 100, 1) if before else None
+            diff[name][metric] = {'baseline': before, 'current': after, 'change_pct': change}
+            if metric == 'queries' and after > before:
+                regressions.append(f'{name}: {before} -> {after} queries')
+            elif metric in LATENCY_METRICS and change is not None and change > tolerance:
+                regressions.append(f'{name}: {metric} {before} -> {after} (+{change}%)')
+    return diff, regressions
+
+
+class Command(BaseCommand):
+    """
+    Benchmark every API route through Django's test client and report JSON.
+
+    Each route is requested `--requests` times after one warm-up request,
+    against the configured database (fill it with `seed_kanmind`). Writes
+    run in transactions that are rolled back, so every request sees the
+    same data and the database is left unchanged. Throttles are disabled.
+    Latencies cover Django's request handling in this process; queries
+    are counted on every database connection while the client runs. The
+    event stream is left out, since it only exists under ASGI and never
+    ends.
+    """
+    help = 'Report latency percentiles, query counts and payload sizes of every API route as JSON.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help='Username to benchmark as (default: owner of the board with most tasks).')
+        parser.add_argument('--password', default=SEED_PASSWORD, help='Password of the user, for the login route.')
+        parser.add_argument('--requests', type=int, default=50, help='Requests per route (default: 50).')
+        parser.add_argument('--route', action='append', dest='routes', help='Only run routes containing this text; repeatable.')
+        parser.add_argument('--output', help='Write the report to this file instead of stdout.')
+        parser.add_argument('--baseline', help='Report of an earlier run to diff against.')
+        parser.add_argument('--tolerance', type=float, default=25, help='Allowed latency growth against the baseline in percent (default: 25).')
+        parser.add_argument('--fail-on-regression', action='store_true', help='Exit with an error if the baseline diff finds regressions.')
+
+    def handle(self, *args, **options):
+        if options['requests'] < 2:
+            raise CommandError('--requests must be at least 2.')
+        baseline = self.load_baseline(options['baseline'])
+        user = self.get_user(options['user'])
+        routes = self.get_routes(user, options['password'])
+        if options['routes']:
+            routes = [route for route in routes if any(text in route.name for text in options['routes'])]
+
+        token, _ = Token.objects.get_or_create(user=user)
+        headers = {'Authorization': f'Token {token.key}'}
+        client = Client(raise_request_exception=False)
+        rest_framework = {**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': {}}
+        # The test client sends the host 'testserver', as in the test runner.
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'], REST_FRAMEWORK=rest_framework):
+            results = {
+                route.name: self.run_route(client, route, headers if route.auth else {}, options['requests'])
+                for route in routes
+            }
+
+        report = {
+            'meta': {
+                'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                'user': user.username,
+                'requests': options['requests'],
+                'data': {
+                    'users': User.objects.count(),
+                    'boards': Boards.objects.count(),
+                    'tasks': Tasks.objects.count(),
+                    'comments': Comment.objects.count(),
+                },
+            },
+            'routes': results,
+        }
+        regressions = []
+        if baseline is not None:
+            report['diff'], regressions = compare(report, baseline, options['tolerance'])
+            report['regressions'] = regressions
+        self.write_report(report, options['output'])
+
+        for regression in regressions:
+            self.stderr.write(f'Regression: {regression}')
+        if regressions and options['fail_on_regression']:
+            raise CommandError(f'{len(regressions)} regression(s) against {options["baseline"]}.')
+
+    def load_baseline(self, path):
+        if path is None:
+            return None
+        try:
+            with open(path) as file:
+                return json.load(file)
+        except (OSError, ValueError) as exc:
+            raise CommandError(f'Cannot read baseline {path}: {exc}')
+
+    def write_report(self, report, path):
+        document = json.dumps(report, indent=2)
+        if path is None:
+            self.stdout.write(document)
+            return
+        with open(path, 'w') as file:
+            file.write(document + '\n')
+        self.stdout.write(self.style.SUCCESS(f'Wrote {len(report["routes"])} routes to {path}.'))
+
+    def get_user(self, username):
+        """
+        Return the benchmarked user: the given one, or the owner of the biggest board.
+        """
+        if username is not None:
+            try:
+                return User.objects.get(username=username)
+            except User.DoesNotExist:
+                raise CommandError(f"User '{username}' does not exist.")
+        board = Boards.objects.order_by('-ticket_count', 'pk').select_related('owner').first()
+        if board is None:
+            raise CommandError('No boards to benchmark; run seed_kanmind first.')
+        return board.owner
+
+    def get_routes(self, user, password):
+        """
+        Return every API route, targeting the user's biggest owned board.
+        """
+        board = Boards.objects.filter(owner=user).order_by('-ticket_count', 'pk').first()
+        task = Tasks.objects.filter(board=board).order_by('-comments_count', 'pk').first() if board else None
+        if task is None:
+            raise CommandError(f"User '{user.username}' owns no board with tasks to benchmark.")
+
+        def new_comment():
+            comment = Comment.objects.create(task=task, author=user, text='bench comment')
+            return f'/api/tasks/{task.pk}/comments/{comment.pk}/'
+
+        new_task = {
+            'board': board.pk, 'title': 'bench task', 'description': 'bench', 'status': 'to-do',
+            'priority': 'medium', 'assignee_id': user.pk, 'reviewer_id': user.pk, 'due_date': '2030-01-01',
+        }
+        registration = {
+            'fullname': 'Bench User', 'email': 'bench-registration@example.com',
+            'password': 'bench-password', 'repeated_password': 'bench-password',
+        }
+        return [
+            Route('POST', '/api/registration/', '/api/registration/', registration, auth=False),
+            Route('POST', '/api/login/', '/api/login/', {'email': user.email, 'password': password}, auth=False),
+            Route('GET', '/api/email-check/', f'/api/email-check/?email={user.email}'),
+            Route('GET', '/api/profiles/', '/api/profiles/'),
+            Route('GET', '/api/boards/', '/api/boards/'),
+            Route('POST', '/api/boards/', '/api/boards/', {'title': 'bench board', 'members': [user.pk]}),
+            Route('GET', '/api/boards/<id>/', f'/api/boards/{board.pk}/'),
+            Route('PATCH', '/api/boards/<id>/', f'/api/boards/{board.pk}/', {'title': 'bench board'}),
+            Route('DELETE', '/api/boards/<id>/', f'/api/boards/{board.pk}/'),
+            Route('GET', '/api/boards/<id>/changes/', f'/api/boards/{board.pk}/changes/'),
+            Route('GET', '/api/tasks/', '/api/tasks/'),
+            Route('POST', '/api/tasks/', '/api/tasks/', new_task),
+            Route('GET', '/api/tasks/<id>/', f'/api/tasks/{task.pk}/'),
+            Route('PATCH', '/api/tasks/<id>/', f'/api/tasks/{task.pk}/', {'status': 'done'}),
+            Route('DELETE', '/api/tasks/<id>/', f'/api/tasks/{task.pk}/'),
+            Route('GET', '/api/tasks/reviewing/', '/api/tasks/reviewing/'),
+            Route('GET', '/api/tasks/assigned-to-me/', '/api/tasks/assigned-to-me/'),
+            Route('GET', '/api/tasks/high-prio/', '/api/tasks/high-prio/'),
+            Route('GET', '/api/tasks/<id>/comments/', f'/api/tasks/{task.pk}/comments/'),
+            Route('POST', '/api/tasks/<id>/comments/', f'/api/tasks/{task.pk}/comments/', {'content': 'bench comment'}),
+            Route('DELETE', '/api/tasks/<id>/comments/<id>/', new_comment),
+        ]
+
+    def run_route(self, client, route, headers, requests):
+        """
+        Request a route repeatedly and summarize the measurements.
+
+        Returns:
+            dict: Status of the last response, latency percentiles, queries
+            and payload size of the last response.
+        """
+        latencies = []
+        for index in range(requests + 1):
+            started, response, queries = self.request(client, route, headers)
+            if index:
+                latencies.append(started)
+        return {
+            'status': response.status_code,
+            **percentiles(latencies),
+            'queries': queries,
+            'bytes': len(response.content),
+        }
+
+    def request(self, client, route, headers):
+        """
+        Send one request, rolling back writes.
+
+        Returns:
+            tuple: (latency in ms, response, number of queries).
+        """
+        if not route.writes:
+            return self.send(client, route, route.path, headers)
+        with transaction.atomic():
+            path = route.path() if callable(route.path) else route.path
+            result = self.send(client, route, path, headers)
+            transaction.set_rollback(True)
+        return result
+
+    def send(self, client, route, path, headers):
+        kwargs = {'headers': headers}
+        if route.data is not None:
+            kwargs.update(data=route.data, content_type='application/json')
+        counter = QueryCounter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(counter))
+            started = time.perf_counter()
+            response = getattr(client, route.method.lower())(path, **kwargs)
+            latency = (time.perf_counter() - started) * 1000
+        return latency, response, counter.queries
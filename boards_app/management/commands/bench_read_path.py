@@ -0,0 +1,138 @@
+import asyncio
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient, Client
+from django.test.utils import override_settings
+from rest_framework.authtoken.models import Token
+
+from boards_app.models import Boards
+from tasks_app.models import Tasks
+
+
+def summarize(latencies, wall_time):
+    """
+    Summarize request latencies of one benchmark run.
+
+    Args:
+        latencies (list): Latencies in milliseconds.
+        wall_time (float): Duration of the whole run in seconds.
+
+    Returns:
+        dict: Throughput in requests per second and p50/p99 latency in ms.
+    """
+    percentiles = statistics.quantiles(latencies, n=100, method='inclusive')
+    return {
+        'throughput': len(latencies) / wall_time,
+        'p50': percentiles[49],
+        'p99': percentiles[98],
+    }
+
+
+class Command(BaseCommand):
+    """
+    Compare the hot GET endpoints under the WSGI and the ASGI application.
+
+    The WSGI run drives Django's WSGI handler (`core.urls`, DRF views) from
+    a pool of threads, like a threaded gunicorn worker. The ASGI run drives
+    the ASGI handler (`core.asgi_urls`, async views) from concurrent tasks
+    on a single event loop. Both run in this process against the configured
+    database. The numbers cover request handling only; network and server
+    front-end overhead are excluded.
+    """
+    help = 'Compare throughput and p99 latency of the hot GET endpoints under WSGI and ASGI.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', required=True, help='Username whose token and boards are used.')
+        parser.add_argument('--requests', type=int, default=500, help='Requests per endpoint and deployment (default: 500).')
+        parser.add_argument('--concurrency', type=int, default=20, help='Threads or concurrent tasks (default: 20).')
+        parser.add_argument('--path', action='append', dest='paths', help='Only benchmark this path; repeatable.')
+
+    def handle(self, *args, **options):
+        try:
+            user = get_user_model().objects.get(username=options['user'])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"User '{options['user']}' does not exist.")
+        token, _ = Token.objects.get_or_create(user=user)
+        headers = {'Authorization': f'Token {token.key}'}
+        requests, concurrency = options['requests'], options['concurrency']
+        if requests < 2 or concurrency < 1:
+            raise CommandError('--requests must be at least 2 and --concurrency at least 1.')
+
+        paths = options['paths'] or self.get_paths(user)
+        self.stdout.write(f"{'path':<40} {'server':<6} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8}")
+        # The test clients send the host 'testserver', as in the test runner.
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+            for path in paths:
+                for server, run in (('wsgi', self.run_wsgi), ('asgi', self.run_asgi)):
+                    result = run(path, headers, requests, concurrency)
+                    self.stdout.write(
+                        f"{path:<40} {server:<6} {result['throughput']:>9.1f} "
+                        f"{result['p50']:>8.2f} {result['p99']:>8.2f}"
+                    )
+
+    def get_paths(self, user):
+        """
+        Return the benchmarked paths, using the user's first board and task.
+        """
+        board = Boards.objects.visible_to(user).order_by('pk').first()
+        task = Tasks.objects.filter(board=board).order_by('pk').first() if board else None
+        if task is None:
+            raise CommandError(f"User '{user.username}' has no board with tasks to benchmark.")
+        return [
+            '/api/boards/',
+            f'/api/boards/{board.pk}/',
+            '/api/tasks/',
+            f'/api/tasks/{task.pk}/',
+            '/api/tasks/reviewing/',
+            '/api/tasks/assigned-to-me/',
+            '/api/tasks/high-prio/',
+            f'/api/tasks/{task.pk}/comments/',
+        ]
+
+    def check_response(self, path, response):
+        if response.status_code >= 400:
+            raise CommandError(f'GET {path} returned {response.status_code}.')
+
+    def run_wsgi(self, path, headers, requests, concurrency):
+        local = threading.local()
+
+        def fetch(_):
+            if not hasattr(local, 'client'):
+                local.client = Client()
+            started = time.perf_counter()
+            response = local.client.get(path, headers=headers)
+            elapsed = (time.perf_counter() - started) * 1000
+            self.check_response(path, response)
+            return elapsed
+
+        with override_settings(ROOT_URLCONF='core.urls'):
+            started = time.perf_counter()
+            with ThreadPoolExecutor(concurrency) as pool:
+                latencies = list(pool.map(fetch, range(requests)))
+            return summarize(latencies, time.perf_counter() - started)
+
+    def run_asgi(self, path, headers, requests, concurrency):
+        async def run():
+            client = AsyncClient()
+            slots = asyncio.Semaphore(concurrency)
+
+            async def fetch():
+                async with slots:
+                    started = time.perf_counter()
+                    response = await client.get(path, headers=headers)
+                    elapsed = (time.perf_counter() - started) * 1000
+                self.check_response(path, response)
+                return elapsed
+
+            started = time.perf_counter()
+            latencies = await asyncio.gather(*(fetch() for _ in range(requests)))
+            return summarize(latencies, time.perf_counter() - started)
+
+        with override_settings(ROOT_URLCONF='core.asgi_urls'):
+            return asyncio.run(run())
@@ -0,0 +1,25 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from boards_app.models import BoardChange
+
+
+class Command(BaseCommand):
+    """
+    Drop old entries from the board change log.
+
+    Each board keeps a truncate marker in place of its dropped entries, so
+    clients polling `/api/boards/<id>/changes/` with an older cursor receive
+    a full resynchronization instead of an incomplete delta.
+    """
+    help = 'Delete board change log entries older than the given number of days.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=30, help='Keep entries from the last N days (default: 30).')
+
+    def handle(self, *args, **options):
+        before = timezone.now() - timedelta(days=options['days'])
+        deleted = BoardChange.objects.truncate(before)
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} change log entries.'))
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from boards_app.models import Boards
+from tasks_app.models import Tasks
+
+
+class Command(BaseCommand):
+    """
+    Rebuild the denormalized member and task counters of all boards, and
+    the comment counters of their tasks.
+
+    The counters are maintained by signal handlers; bulk operations and raw
+    SQL bypass them, and this command repairs any resulting drift.
+    """
+    help = 'Recompute member, ticket, to-do and high-priority counters for boards and comment counters for tasks.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('board_ids', nargs='*', type=int, help='Only recompute these boards.')
+
+    def handle(self, *args, **options):
+        boards = Boards.objects.all()
+        if options['board_ids']:
+            boards = boards.filter(pk__in=options['board_ids'])
+        updated = boards.recompute_counters()
+        tasks = Tasks.objects.filter(board__in=boards.values('pk')).recompute_comments_count()
+        self.stdout.write(self.style.SUCCESS(f'Recomputed counters for {updated} board(s) and {tasks} task(s).'))
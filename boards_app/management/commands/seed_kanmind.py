@@ -0,0 +1,44 @@
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from boards_app.seed import SEED_PASSWORD, seed
+
+
+class Command(BaseCommand):
+    """
+    Fill the database with synthetic users, boards, tasks and comments.
+
+    Runs can be repeated with different prefixes to grow the data set.
+    """
+    help = 'Generate synthetic KanMind data at a configurable scale.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=50, help='Number of users (default: 50).')
+        parser.add_argument('--boards', type=int, default=20, help='Number of boards (default: 20).')
+        parser.add_argument('--members', type=int, default=5, help='Members per board, including the owner (default: 5).')
+        parser.add_argument('--tasks', type=int, default=50, help='Tasks per board (default: 50).')
+        parser.add_argument('--comments', type=int, default=3, help='Average comments per task (default: 3).')
+        parser.add_argument('--prefix', default='seed', help='Prefix of usernames and emails (default: seed).')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0).')
+
+    def handle(self, *args, **options):
+        if options['users'] < 1 or options['members'] < 1:
+            raise CommandError('--users and --members must be at least 1.')
+        if User.objects.filter(username__startswith=f"{options['prefix']}-user-").exists():
+            raise CommandError(f"Data with prefix '{options['prefix']}' exists already; pass another --prefix.")
+
+        started = time.perf_counter()
+        counts = seed(
+            users=options['users'],
+            boards=options['boards'],
+            members=options['members'],
+            tasks=options['tasks'],
+            comments=options['comments'],
+            prefix=options['prefix'],
+            random_seed=options['seed'],
+        )
+        summary = ', '.join(f'{count} {name}' for name, count in counts.items())
+        self.stdout.write(self.style.SUCCESS(f'Created {summary} in {time.perf_counter() - started:.1f} s.'))
+        self.stdout.write(f"Users log in as {options['prefix']}-user-<n>@example.com with password '{SEED_PASSWORD}'.")
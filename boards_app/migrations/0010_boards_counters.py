@@ -0,0 +1,60 @@
+# Generated by Django 5.2.5 on 2026-10-18 20:27
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    Boards = apps.get_model('boards_app', 'Boards')
+    Tasks = apps.get_model('tasks_app', 'Tasks')
+
+    def count(queryset, outer_field):
+        counted = (
+            queryset
+            .filter(**{outer_field: OuterRef('pk')})
+            .order_by()
+            .values(outer_field)
+            .annotate(count=Count('pk'))
+            .values('count')
+        )
+        return Coalesce(Subquery(counted, output_field=IntegerField()), Value(0))
+
+    Boards.objects.update(
+        member_count=count(Boards.members.through.objects.all(), 'boards'),
+        ticket_count=count(Tasks.objects.all(), 'board'),
+        tasks_to_do_count=count(Tasks.objects.filter(status='to-do'), 'board'),
+        tasks_high_prio_count=count(Tasks.objects.filter(priority='high'), 'board'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('boards_app', '0009_remove_boards_tasks_to_do'),
+        ('tasks_app', '0016_comment_task_created_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='boards',
+            name='member_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='boards',
+            name='tasks_high_prio_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='boards',
+            name='tasks_to_do_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='boards',
+            name='ticket_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.5 on 2026-10-18 20:35
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('boards_app', '0011_boards_version_stamp'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BoardChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('task', 'Task'), ('comment', 'Comment'), ('board', 'Board')], max_length=10)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('action', models.CharField(choices=[('upsert', 'Upsert'), ('delete', 'Delete'), ('truncate', 'Truncate')], max_length=10)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('board', models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='changes', to='boards_app.boards')),
+            ],
+            options={
+                'verbose_name': 'Board change',
+                'verbose_name_plural': 'Board changes',
+                'indexes': [models.Index(fields=['board', 'id'], name='boardchange_board_seq_idx')],
+            },
+        ),
+    ]
@@ -1,29 +1,161 @@
 from django.db import models
+from django.db.models import Count, F, IntegerField, Max, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
 from django.conf import settings
+from django.utils import timezone
+from core.fieldsets import ALL_FIELDS
 from tasks_app.models import Tasks
 from user_auth_app.models import User
 
 
+def _count_subquery(queryset, outer_field):
+    """
+    Build a correlated COUNT(*) subquery for the given queryset.
+
+    Args:
+        queryset (QuerySet): Rows to count, not yet filtered by board.
+        outer_field (str): Field on the counted model that points to the board.
+
+    Returns:
+        Coalesce: Expression evaluating to the number of matching rows (0 if none).
+    """
+    counted = (
+        queryset
+        .filter(**{outer_field: OuterRef('pk')})
+        .order_by()
+        .values(outer_field)
+        .annotate(count=Count('pk'))
+        .values('count')
+    )
+    return Coalesce(Subquery(counted, output_field=IntegerField()), Value(0))
+
+
+class BoardsQuerySet(models.QuerySet):
+    """
+    Custom queryset for boards.
+
+    Methods:
+        visible_to(user): Restricts the boards to those the user owns or is a member of.
+        recompute_counters(): Rebuilds the stored member and task counters.
+        recompute_member_count(): Rebuilds the stored member counter.
+        touch(**changes): Advances the version stamp, optionally updating other fields.
+        with_details(): Preloads everything needed to render a board detail.
+    """
+
+    def visible_to(self, user):
+        """
+        Restrict the queryset to boards the user owns or is a member of.
+
+        Membership is checked with an IN subquery against the indexed
+        members table, so the filter runs in the database as part of a
+        single query, never duplicates boards and lets the database combine
+        the owner and membership indexes instead of scanning all boards.
+
+        Args:
+            user (User): The user whose boards should be returned.
+
+        Returns:
+            QuerySet: Boards accessible to the user.
+        """
+        memberships = Boards.members.through.objects.filter(user=user).values('boards')
+        return self.filter(Q(owner=user) | Q(pk__in=memberships))
+
+    def recompute_counters(self):
+        """
+        Recompute the stored member and task counters from scratch.
+
+        Runs a single UPDATE with correlated COUNT subqueries and is used to
+        repair drift, e.g. after bulk operations that bypass the signals.
+
+        Returns:
+            int: Number of boards updated.
+        """
+        return self.update(
+            member_count=_count_subquery(Boards.members.through.objects.all(), 'boards'),
+            ticket_count=_count_subquery(Tasks.objects.all(), 'board'),
+            tasks_to_do_count=_count_subquery(Tasks.objects.filter(status='to-do'), 'board'),
+            tasks_high_prio_count=_count_subquery(Tasks.objects.filter(priority='high'), 'board'),
+        )
+
+    def recompute_member_count(self):
+        """
+        Recompute the stored member count in a single UPDATE.
+
+        Returns:
+            int: Number of boards updated.
+        """
+        return self.touch(
+            member_count=_count_subquery(Boards.members.through.objects.all(), 'boards'),
+        )
+
+    def touch(self, **changes):
+        """
+        Advance the version stamp of the boards in a single UPDATE.
+
+        Any change that alters a board's detail payload must touch the board,
+        so that ETags and cached payloads keyed by the version go stale.
+
+        Args:
+            **changes: Additional field updates applied in the same UPDATE.
+
+        Returns:
+            int: Number of boards updated.
+        """
+        return self.update(version=F('version') + 1, updated_at=timezone.now(), **changes)
+
+    def with_details(self, fieldset=ALL_FIELDS):
+        """
+        Preload the owner and, if the fieldset includes them, the members of a board detail.
+
+        The tasks are not preloaded; `BoardsDetailSerializer` fetches them
+        as `.values()` rows in a single query. Serializing a board thus
+        takes a fixed number of queries regardless of how many tasks it
+        holds.
+
+        Args:
+            fieldset (Fieldset): The fields of the board detail to serialize.
+
+        Returns:
+            QuerySet: Boards with owner and members preloaded.
+        """
+        queryset = self.select_related('owner')
+        if fieldset.wants('members'):
+            queryset = queryset.prefetch_related('members')
+        return queryset
+
+
 class Boards(models.Model):
     """
     Represents a board within the Kanmind application.
 
     A board serves as a container for tasks and can have multiple members.
-    Only tasks with the status 'to-do' can be assigned via the tasks_to_do relationship.
+    The counter fields are denormalized and kept up to date by the signal
+    handlers in `boards_app.signals`; `recompute_board_stats` repairs drift.
+    The version stamp advances on every task, comment, membership or board
+    change and backs the ETag of the board and task detail endpoints.
 
     Attributes:
         title (CharField): The title or name of the board.
-        tasks_to_do (ManyToManyField): Tasks associated with this board, limited to tasks with status 'to-do'.
         owner (ForeignKey): The user who owns the board. Deleting the user will also delete the board.
         members (ManyToManyField): Users who are members of the board. Can be empty.
+        member_count (PositiveIntegerField): Number of members.
+        ticket_count (PositiveIntegerField): Number of tasks on the board.
+        tasks_to_do_count (PositiveIntegerField): Number of tasks with status 'to-do'.
+        tasks_high_prio_count (PositiveIntegerField): Number of tasks with priority 'high'.
+        version (PositiveBigIntegerField): Version stamp of the board and its content.
+        updated_at (DateTimeField): Time of the last change to the board or its content.
 
     Meta:
         verbose_name (str): Human-readable name for a single board.
         verbose_name_plural (str): Human-readable name for multiple boards.
 
     Methods:
+        save(): Saves the board without overwriting counters or version stamp.
         __str__(): Returns the board title as its string representation.
     """
+    COUNTER_FIELDS = ('member_count', 'ticket_count', 'tasks_to_do_count', 'tasks_high_prio_count')
+    STAMP_FIELDS = ('version', 'updated_at')
+
     title = models.CharField(max_length=255)
   
     owner = models.ForeignKey(
@@ -36,10 +168,38 @@ class Boards(models.Model):
         related_name='boards',
         blank=True
     )
+    member_count = models.PositiveIntegerField(default=0, editable=False)
+    ticket_count = models.PositiveIntegerField(default=0, editable=False)
+    tasks_to_do_count = models.PositiveIntegerField(default=0, editable=False)
+    tasks_high_prio_count = models.PositiveIntegerField(default=0, editable=False)
+    version = models.PositiveBigIntegerField(default=1, editable=False)
+    updated_at = models.DateTimeField(default=timezone.now, editable=False)
+
+    objects = BoardsQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'Board'
         verbose_name_plural = 'Boards'
+
+    def save(self, *args, **kwargs):
+        """
+        Save the board, leaving counters and version stamp of existing boards untouched.
+
+        The counters and the version are only changed through atomic UPDATEs,
+        so a full save must not write back values that were read earlier in
+        the request. Updating an existing board advances its version.
+        """
+        if self._state.adding:
+            super().save(*args, **kwargs)
+            return
+        managed = self.COUNTER_FIELDS + self.STAMP_FIELDS
+        if kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in managed
+            ]
+        super().save(*args, **kwargs)
+        Boards.objects.filter(pk=self.pk).touch()
    
     def __str__(self):
         """
@@ -49,3 +209,101 @@ class Boards(models.Model):
             str: The title of the board.
         """
         return self.title
+
+
+class BoardChangeQuerySet(models.QuerySet):
+    """
+    Custom queryset for the board change log.
+
+    Methods:
+        latest_cursor(board_id): Returns the newest change id of a board.
+        truncate(before): Drops old changes, leaving a marker per board.
+    """
+
+    def latest_cursor(self, board_id):
+        """
+        Return the id of the newest change recorded for a board.
+
+        Args:
+            board_id (int): The board.
+
+        Returns:
+            int: The newest change id, or 0 if the board has no changes.
+        """
+        return self.filter(board_id=board_id).aggregate(cursor=Max('id'))['cursor'] or 0
+
+    def truncate(self, before):
+        """
+        Delete changes recorded before the given time.
+
+        The newest deleted change of each board is kept as a `truncate`
+        marker, so clients whose cursor predates it know that they missed
+        changes and must resynchronize.
+
+        Args:
+            before (datetime): Changes recorded earlier are dropped.
+
+        Returns:
+            int: Number of deleted changes.
+        """
+        old = self.filter(created_at__lt=before)
+        markers = list(old.values('board_id').annotate(last=Max('id')).values_list('last', flat=True))
+        self.filter(pk__in=markers).update(kind=BoardChange.KIND_BOARD, action=BoardChange.ACTION_TRUNCATE)
+        deleted, _ = old.exclude(pk__in=markers).delete()
+        return deleted
+
+
+class BoardChange(models.Model):
+    """
+    Append-only log of task and comment changes on a board.
+
+    The auto-incrementing id is the monotonic sequence number that clients
+    use as their sync cursor. Rows are written by the signal handlers in
+    `boards_app.signals` in the same transaction as the change itself; a
+    task moved to another board is logged as a deletion on the old board.
+
+    Attributes:
+        board (ForeignKey): The board that changed. The foreign key has no
+            database constraint because changes are still logged while a
+            board is being deleted; they are removed afterwards.
+        kind (CharField): 'task', 'comment', or 'board' for truncate markers.
+        object_id (PositiveBigIntegerField): Id of the changed task or comment.
+        action (CharField): 'upsert', 'delete' or 'truncate'.
+        created_at (DateTimeField): Time the change was recorded.
+
+    Meta:
+        indexes (list): Index serving the per-board scan from a cursor.
+    """
+    KIND_TASK = 'task'
+    KIND_COMMENT = 'comment'
+    KIND_BOARD = 'board'
+    KIND_CHOICES = [(KIND_TASK, 'Task'), (KIND_COMMENT, 'Comment'), (KIND_BOARD, 'Board')]
+
+    ACTION_UPSERT = 'upsert'
+    ACTION_DELETE = 'delete'
+    ACTION_TRUNCATE = 'truncate'
+    ACTION_CHOICES = [(ACTION_UPSERT, 'Upsert'), (ACTION_DELETE, 'Delete'), (ACTION_TRUNCATE, 'Truncate')]
+
+    board = models.ForeignKey(
+        Boards,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        related_name='changes'
+    )
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.PositiveBigIntegerField()
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    objects = BoardChangeQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = 'Board change'
+        verbose_name_plural = 'Board changes'
+        indexes = [
+            models.Index(fields=['board', 'id'], name='boardchange_board_seq_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.action} {self.kind} {self.object_id} on board {self.board_id}"
@@ -0,0 +1,120 @@
+"""
+Synthetic data for benchmarks and load tests.
+
+`seed()` generates users, boards with overlapping memberships, tasks with a
+realistic status and priority mix, and comments, all with `bulk_create`.
+The bulk inserts bypass the signal handlers, so the denormalized board and
+task counters are written directly. The change log is left empty; clients
+of the delta sync endpoint get a snapshot on their first request.
+"""
+import random
+from datetime import date, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from boards_app.models import Boards
+from tasks_app.models import Comment, Tasks
+
+SEED_PASSWORD = 'kanmind-seed'
+
+STATUS_WEIGHTS = {'to-do': 40, 'in-progress': 25, 'reviewing': 15, 'done': 20}
+PRIORITY_WEIGHTS = {'low': 35, 'medium': 40, 'high': 20, 'critical': 5}
+
+BATCH_SIZE = 1000
+
+
+def pick(rng, weights):
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+@transaction.atomic
+def seed(users=50, boards=20, members=5, tasks=50, comments=3, prefix='seed', random_seed=0):
+    """
+    Generate a data set at the given scale.
+
+    Board members are drawn from all users, so most users are on several
+    boards. The number of comments per task varies around `comments`.
+
+    Args:
+        users (int): Number of users; all get the password `SEED_PASSWORD`.
+        boards (int): Number of boards, each owned by a random user.
+        members (int): Members per board, including the owner.
+        tasks (int): Tasks per board.
+        comments (int): Average comments per task.
+        prefix (str): Prefix of the generated usernames and emails.
+        random_seed (int): Seed making the data set reproducible.
+
+    Returns:
+        dict: Number of created users, boards, tasks and comments.
+    """
+    rng = random.Random(random_seed)
+    password = make_password(SEED_PASSWORD)
+    created_users = User.objects.bulk_create([
+        User(
+            username=f'{prefix}-user-{index}',
+            email=f'{prefix}-user-{index}@example.com',
+            first_name=f'User{index}',
+            last_name=prefix.title(),
+            password=password,
+        )
+        for index in range(users)
+    ], batch_size=BATCH_SIZE)
+
+    owners = [rng.choice(created_users) for _ in range(boards)]
+    created_boards = Boards.objects.bulk_create([
+        Boards(title=f'{prefix} board {index}', owner=owner)
+        for index, owner in enumerate(owners)
+    ], batch_size=BATCH_SIZE)
+
+    board_members = {}
+    memberships = []
+    for board, owner in zip(created_boards, owners):
+        sample = rng.sample(created_users, min(members, len(created_users)))
+        board_members[board.pk] = [owner] + [user for user in sample if user.pk != owner.pk][:members - 1]
+        memberships += [
+            Boards.members.through(boards_id=board.pk, user_id=user.pk)
+            for user in board_members[board.pk]
+        ]
+    Boards.members.through.objects.bulk_create(memberships, batch_size=BATCH_SIZE)
+
+    created_tasks = Tasks.objects.bulk_create([
+        new_task(rng, board, board_members[board.pk], index, comments)
+        for board in created_boards
+        for index in range(tasks)
+    ], batch_size=BATCH_SIZE)
+
+    created_comments = Comment.objects.bulk_create([
+        Comment(task=task, author=rng.choice(board_members[task.board_id]), text=f'Comment {index} on {task.title}')
+        for task in created_tasks
+        for index in range(task.comments_count)
+    ], batch_size=BATCH_SIZE)
+
+    if created_boards:
+        Boards.objects.filter(pk__range=(created_boards[0].pk, created_boards[-1].pk)).recompute_counters()
+    return {
+        'users': len(created_users),
+        'boards': len(created_boards),
+        'tasks': len(created_tasks),
+        'comments': len(created_comments),
+    }
+
+
+def new_task(rng, board, members, index, comments):
+    """
+    Build an unsaved task on the board with random attributes.
+    """
+    due_date = date.today() + timedelta(days=rng.randint(-30, 60)) if rng.random() < 0.7 else None
+    return Tasks(
+        board=board,
+        title=f'Task {index} on {board.title}',
+        description=f'Generated task {index}.',
+        status=pick(rng, STATUS_WEIGHTS),
+        priority=pick(rng, PRIORITY_WEIGHTS),
+        owner=rng.choice(members),
+        assignee=rng.choice(members) if rng.random() < 0.8 else None,
+        reviewer=rng.choice(members) if rng.random() < 0.5 else None,
+        due_date=due_date,
+        comments_count=rng.randint(0, comments * 2),
+    )
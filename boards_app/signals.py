@@ -0,0 +1,275 @@
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import F, Q, QuerySet
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from boards_app.events import board_topic, broker, user_topic
+from boards_app.models import BoardChange, Boards
+from tasks_app.models import Comment, Tasks
+
+
+def task_counters(status, priority):
+    """
+    Return how much a task with the given status and priority adds to each board counter.
+
+    Args:
+        status (str): The task status.
+        priority (str): The task priority.
+
+    Returns:
+        dict: Counter field names mapped to 0 or 1.
+    """
+    return {
+        'ticket_count': 1,
+        'tasks_to_do_count': int(status == 'to-do'),
+        'tasks_high_prio_count': int(priority == 'high'),
+    }
+
+
+def apply_counter_deltas(board_id, deltas):
+    """
+    Apply counter deltas to a board and advance its version in a single atomic UPDATE.
+
+    Args:
+        board_id (int): The board to update.
+        deltas (dict): Counter field names mapped to signed deltas.
+    """
+    changes = {field: F(field) + delta for field, delta in deltas.items() if delta}
+    if board_id is not None:
+        Boards.objects.filter(pk=board_id).touch(**changes)
+
+
+def deleted_model(origin):
+    """
+    Return the model whose deletion started a cascade, given a post_delete `origin`.
+    """
+    return origin.model if isinstance(origin, QuerySet) else type(origin)
+
+
+def publish_on_commit(topic, event):
+    """
+    Publish a board event once the current transaction commits.
+
+    Args:
+        topic (str): The event topic.
+        event (dict): The event.
+    """
+    transaction.on_commit(lambda: broker.publish(topic, event))
+
+
+def record_changes(*changes):
+    """
+    Append entries to the board change log and publish them as events.
+
+    Args:
+        *changes (tuple): (board_id, kind, object_id, action) tuples.
+    """
+    changes = [change for change in changes if change[0] is not None]
+    BoardChange.objects.bulk_create([
+        BoardChange(board_id=board_id, kind=kind, object_id=object_id, action=action)
+        for board_id, kind, object_id, action in changes
+    ])
+    for board_id, kind, object_id, action in changes:
+        publish_on_commit(board_topic(board_id), {'type': kind, 'action': action, 'board': board_id, 'id': object_id})
+
+
+@receiver(post_save, sender=Tasks)
+def update_counters_on_task_save(sender, instance, created, **kwargs):
+    """
+    Keep the board counters, version and change log in sync when a task is created or changed.
+
+    The deltas are computed from the values `Tasks.save` read in the
+    write transaction, not from those the instance was loaded with.
+    """
+    current = {name: getattr(instance, name) for name in Tasks.TRACKED_FIELDS}
+    stored = getattr(instance, '_stored_values', None)
+    previous = {**current, **(stored or {})}
+
+    changes = [(instance.board_id, BoardChange.KIND_TASK, instance.pk, BoardChange.ACTION_UPSERT)]
+    if previous['board_id'] != current['board_id']:
+        changes.append((previous['board_id'], BoardChange.KIND_TASK, instance.pk, BoardChange.ACTION_DELETE))
+    record_changes(*changes)
+
+    if created:
+        apply_counter_deltas(instance.board_id, task_counters(instance.status, instance.priority))
+        return
+    if stored is None:
+        # Saved over a row that was not read first; recompute_board_stats repairs the counters.
+        apply_counter_deltas(instance.board_id, {})
+        return
+
+    old = task_counters(previous['status'], previous['priority'])
+    new = task_counters(current['status'], current['priority'])
+    if previous['board_id'] == current['board_id']:
+        apply_counter_deltas(current['board_id'], {field: new[field] - old[field] for field in new})
+    else:
+        apply_counter_deltas(previous['board_id'], {field: -value for field, value in old.items()})
+        apply_counter_deltas(current['board_id'], new)
+
+
+@receiver(post_delete, sender=Tasks)
+def update_counters_on_task_delete(sender, instance, origin=None, **kwargs):
+    """
+    Decrement the board counters, advance the version and log a tombstone when a task is deleted.
+
+    Tasks removed together with their board are skipped; the board's
+    counters and change log go with it. Tasks deleted through
+    `Tasks.delete` are decremented by the values read in the delete
+    transaction, and skipped if another request deleted them first.
+    """
+    if origin is not None and deleted_model(origin) is Boards:
+        return
+    stored = {name: getattr(instance, name) for name in Tasks.TRACKED_FIELDS}
+    if hasattr(instance, '_stored_values'):
+        if instance._stored_values is None:
+            return
+        stored = instance._stored_values
+    record_changes((stored['board_id'], BoardChange.KIND_TASK, instance.pk, BoardChange.ACTION_DELETE))
+    counters = task_counters(stored['status'], stored['priority'])
+    apply_counter_deltas(stored['board_id'], {field: -value for field, value in counters.items()})
+
+
+@receiver(m2m_changed, sender=Boards.members.through)
+def update_member_count(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Recount the members and advance the version of every board whose membership changed.
+
+    Publishes a membership event to the board and an access event to every
+    user who joined or left it. Handles both `board.members` and the
+    reverse `user.boards` manager.
+    """
+    if action == 'pre_clear':
+        if reverse:
+            instance._cleared_board_ids = list(instance.boards.values_list('pk', flat=True))
+        else:
+            instance._cleared_member_ids = list(instance.members.values_list('pk', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if not reverse:
+        board_ids = [instance.pk]
+        user_ids = pk_set if pk_set is not None else getattr(instance, '_cleared_member_ids', [])
+    else:
+        board_ids = pk_set if pk_set is not None else getattr(instance, '_cleared_board_ids', [])
+        user_ids = [instance.pk]
+    Boards.objects.filter(pk__in=board_ids).recompute_member_count()
+
+    for board_id in board_ids:
+        publish_on_commit(board_topic(board_id), {'type': 'membership', 'board': board_id})
+        for user_id in user_ids:
+            publish_on_commit(user_topic(user_id), {'type': 'access', 'board': board_id})
+
+
+# User fields rendered in board and task documents.
+DISPLAYED_USER_FIELDS = frozenset({'email', 'first_name', 'last_name'})
+
+
+@receiver(post_save, sender=User)
+def touch_boards_on_user_save(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Advance the version of the boards that show a saved user.
+
+    Board and task documents embed the email and full name of the owner,
+    the members, the assignees and the reviewers, so their ETags and
+    cached payloads must go stale when these change. Saves limited to
+    other fields, such as the `last_login` update on login, are skipped.
+    """
+    if created or (update_fields is not None and not DISPLAYED_USER_FIELDS & set(update_fields)):
+        return
+    memberships = Boards.members.through.objects.filter(user=instance).values('boards')
+    tasks = Tasks.objects.filter(Q(assignee=instance) | Q(reviewer=instance)).values('board')
+    Boards.objects.filter(Q(owner=instance) | Q(pk__in=memberships) | Q(pk__in=tasks)).touch()
+
+
+@receiver(pre_delete, sender=User)
+def remember_user_boards(sender, instance, **kwargs):
+    """
+    Remember the boards of a user about to be deleted.
+
+    Deleting a user removes its memberships through a cascade, which sends
+    no `m2m_changed`.
+    """
+    instance._member_board_ids = list(instance.boards.values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=User)
+def update_member_count_on_user_delete(sender, instance, **kwargs):
+    """
+    Recount the members and advance the version of the boards a deleted user was a member of.
+    """
+    board_ids = getattr(instance, '_member_board_ids', [])
+    Boards.objects.filter(pk__in=board_ids).recompute_member_count()
+    for board_id in board_ids:
+        publish_on_commit(board_topic(board_id), {'type': 'membership', 'board': board_id})
+
+
+@receiver(post_save, sender=Comment)
+def update_comments_count_on_save(sender, instance, created, **kwargs):
+    """
+    Increment the task's `comments_count` when a comment is created.
+    """
+    if created:
+        Tasks.objects.filter(pk=instance.task_id).update(comments_count=F('comments_count') + 1)
+
+
+@receiver(post_delete, sender=Comment)
+def update_comments_count_on_delete(sender, instance, origin=None, **kwargs):
+    """
+    Decrement the task's `comments_count` when a comment is deleted.
+
+    Comments removed together with their task or board are skipped.
+    """
+    if origin is not None and deleted_model(origin) in (Tasks, Boards):
+        return
+    Tasks.objects.filter(pk=instance.task_id).update(comments_count=F('comments_count') - 1)
+
+
+@receiver(post_save, sender=Comment)
+def log_comment_save(sender, instance, **kwargs):
+    """
+    Log a new or changed comment and advance the version of its board.
+
+    The task is logged as well, because its `comments_count` changes.
+    """
+    board_id = Tasks.objects.filter(pk=instance.task_id).values_list('board_id', flat=True).first()
+    record_changes(
+        (board_id, BoardChange.KIND_COMMENT, instance.pk, BoardChange.ACTION_UPSERT),
+        (board_id, BoardChange.KIND_TASK, instance.task_id, BoardChange.ACTION_UPSERT),
+    )
+    Boards.objects.filter(pk=board_id).touch()
+
+
+@receiver(post_delete, sender=Comment)
+def log_comment_delete(sender, instance, origin=None, **kwargs):
+    """
+    Log a tombstone for a deleted comment and advance the version of its board.
+
+    Comments removed together with their task or board are covered by the
+    task's tombstone or the dropped change log and are not logged
+    individually. Comments removed with their author are logged.
+    """
+    if origin is not None and deleted_model(origin) in (Tasks, Boards):
+        return
+    board_id = Tasks.objects.filter(pk=instance.task_id).values_list('board_id', flat=True).first()
+    record_changes(
+        (board_id, BoardChange.KIND_COMMENT, instance.pk, BoardChange.ACTION_DELETE),
+        (board_id, BoardChange.KIND_TASK, instance.task_id, BoardChange.ACTION_UPSERT),
+    )
+    Boards.objects.filter(pk=board_id).touch()
+
+
+@receiver(post_delete, sender=Boards)
+def drop_change_log(sender, instance, **kwargs):
+    """
+    Remove the change log of a deleted board and publish a single board event.
+
+    Tasks and comments deleted with the board are neither logged nor
+    published individually.
+    """
+    BoardChange.objects.filter(board_id=instance.pk).delete()
+    publish_on_commit(
+        board_topic(instance.pk),
+        {'type': BoardChange.KIND_BOARD, 'action': BoardChange.ACTION_DELETE, 'board': instance.pk, 'id': instance.pk},
+    )
@@ -1,3 +1,887 @@
-from django.test import TestCase
+import asyncio
+import json
+import os
+import tempfile
+import threading
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User, update_last_login
+from django.core.cache import caches
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from boards_app.api.views import BoardsViewSet
+from boards_app.events import RESYNC, Broker, board_topic, broker, user_topic
+from boards_app.models import BoardChange, Boards
+from boards_app.seed import seed
+from core.testing import QueryScalingTestCase
+from tasks_app.models import Comment, Tasks
+
+
+class BoardsListQueryCountTests(APITestCase):
+    """
+    Regression tests for the number of SQL queries issued by GET /api/boards/.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner', email='owner@example.com', password='pw')
+        self.member = User.objects.create_user(username='member', email='member@example.com', password='pw')
+        self.client.force_authenticate(self.user)
+
+    def create_board(self, title, tasks=0):
+        board = Boards.objects.create(title=title, owner=self.user)
+        board.members.add(self.user, self.member)
+        for index in range(tasks):
+            Tasks.objects.create(
+                title=f'{title} task {index}',
+                description='description',
+                board=board,
+                status='to-do' if index % 2 else 'done',
+                priority='high' if index % 3 == 0 else 'low',
+            )
+        return board
+
+    def list_boards(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/boards/')
+        self.assertEqual(response.status_code, 200)
+        return response, len(queries)
+
+    def test_query_count_does_not_grow_with_boards(self):
+        self.create_board('first', tasks=3)
+        _, single_board_queries = self.list_boards()
+
+        for index in range(5):
+            self.create_board(f'board {index}', tasks=4)
+        response, many_boards_queries = self.list_boards()
+
+        self.assertEqual(len(response.data), 6)
+        self.assertEqual(single_board_queries, many_boards_queries)
+        self.assertEqual(many_boards_queries, 1)
+
+    def test_counts_match_tasks(self):
+        self.create_board('counted', tasks=6)
+        response, _ = self.list_boards()
+
+        board = response.data[0]
+        self.assertEqual(board['member_count'], 2)
+        self.assertEqual(board['ticket_count'], 6)
+        self.assertEqual(board['tasks_to_do_count'], 3)
+        self.assertEqual(board['tasks_high_prio_count'], 2)
+
+
+class BoardsDetailQueryCountTests(APITestCase):
+    """
+    Benchmark-style regression tests for GET /api/boards/<id>/.
+
+    Renders the same board with a growing number of tasks and asserts that
+    the number of SQL queries stays constant.
+    """
+
+    def setUp(self):
+        caches['board_detail'].clear()
+        self.owner = User.objects.create_user(username='owner', email='owner@example.com')
+        self.board = Boards.objects.create(title='detail', owner=self.owner)
+        self.board.members.add(self.owner)
+        self.client.force_authenticate(self.owner)
+
+    def add_tasks(self, count):
+        for index in range(count):
+            assignee = User.objects.create_user(username=f'assignee{self.board.tasks.count()}')
+            reviewer = User.objects.create_user(username=f'reviewer{self.board.tasks.count()}')
+            self.board.members.add(assignee, reviewer)
+            task = Tasks.objects.create(
+                title=f'task {index}',
+                description='description',
+                board=self.board,
+                priority='medium',
+                assignee=assignee,
+                reviewer=reviewer,
+            )
+            task.comments.create(text='first', author=self.owner)
+            task.comments.create(text='second', author=assignee)
+
+    def retrieve_board(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f'/api/boards/{self.board.id}/')
+        self.assertEqual(response.status_code, 200)
+        return response, len(queries)
+
+    def test_query_count_does_not_grow_with_tasks(self):
+        counts = {}
+        for total in (1, 10, 30):
+            self.add_tasks(total - self.board.tasks.count())
+            response, counts[total] = self.retrieve_board()
+            self.assertEqual(len(response.json()['tasks']), total)
+
+        self.assertEqual(len(set(counts.values())), 1, counts)
+        # version stamp, board + owner, members, tasks with assignee/reviewer
+        self.assertLessEqual(counts[30], 4)
+
+    def test_detail_payload(self):
+        self.add_tasks(2)
+        response, _ = self.retrieve_board()
+
+        self.assertEqual(response.json()['owner_id'], self.owner.id)
+        self.assertEqual(len(response.json()['members']), 5)
+        task = response.json()['tasks'][0]
+        self.assertEqual(task['comments_count'], 2)
+        self.assertEqual(task['assignee']['id'], self.board.tasks.order_by('pk')[0].assignee_id)
+
+
+class BoardsListVisibilityTests(APITestCase):
+    """
+    Tests that GET /api/boards/ only returns boards the user can access.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='user', email='user@example.com')
+        self.other = User.objects.create_user(username='other', email='other@example.com')
+        self.client.force_authenticate(self.user)
+
+    def test_only_owned_and_member_boards_are_listed(self):
+        owned = Boards.objects.create(title='owned', owner=self.user)
+        shared = Boards.objects.create(title='shared', owner=self.other)
+        shared.members.add(self.user, self.other)
+        foreign = Boards.objects.create(title='foreign', owner=self.other)
+        foreign.members.add(self.other)
+
+        response = self.client.get('/api/boards/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertCountEqual([board['id'] for board in response.data], [owned.id, shared.id])
+
+    def test_owner_and_member_board_is_listed_once(self):
+        board = Boards.objects.create(title='mine', owner=self.user)
+        board.members.add(self.user)
+
+        response = self.client.get('/api/boards/')
+
+        self.assertEqual([item['id'] for item in response.data], [board.id])
+
+
+class BoardCountersTests(APITestCase):
+    """
+    Tests that the denormalized board counters follow task and member changes.
+    """
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', email='owner@example.com')
+        self.member = User.objects.create_user(username='member', email='member@example.com')
+        self.board = Boards.objects.create(title='board', owner=self.owner)
+        self.board.members.add(self.owner, self.member)
+        self.client.force_authenticate(self.owner)
+
+    def counters(self, board=None):
+        board = board or self.board
+        board.refresh_from_db()
+        return [getattr(board, field) for field in Boards.COUNTER_FIELDS]
+
+    def create_task(self, status='to-do', priority='high'):
+        response = self.client.post('/api/tasks/', {
+            'board': self.board.id,
+            'title': 'task',
+            'description': 'description',
+            'status': status,
+            'priority': priority,
+            'assignee_id': self.member.id,
+            'reviewer_id': self.owner.id,
+            'due_date': '2026-01-01',
+        })
+        self.assertEqual(response.status_code, 201)
+        return Tasks.objects.get(pk=response.data['id'])
+
+    def test_task_create_update_and_delete(self):
+        task = self.create_task()
+        self.assertEqual(self.counters(), [2, 1, 1, 1])
+
+        response = self.client.patch(f'/api/tasks/{task.id}/', {'status': 'done', 'priority': 'low'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.counters(), [2, 1, 0, 0])
+
+        Tasks.objects.get(pk=task.pk).delete()
+        self.assertEqual(self.counters(), [2, 0, 0, 0])
+
+    def test_stale_saves_apply_the_change_once(self):
+        task = self.create_task(status='to-do')
+        first, second = Tasks.objects.get(pk=task.pk), Tasks.objects.get(pk=task.pk)
+
+        first.status = 'done'
+        first.save()
+        second.status = 'done'
+        second.save()
+
+        self.assertEqual(self.counters(), [2, 1, 0, 1])
+        Tasks.objects.get(pk=task.pk).delete()
+        self.assertEqual(self.counters(), [2, 0, 0, 0])
+
+    def test_stale_deletes_use_the_stored_values(self):
+        task = self.create_task(status='to-do')
+        first, second = Tasks.objects.get(pk=task.pk), Tasks.objects.get(pk=task.pk)
+
+        updated = Tasks.objects.get(pk=task.pk)
+        updated.status = 'done'
+        updated.save()
+        first.delete()
+        second.delete()
+
+        self.assertEqual(self.counters(), [2, 0, 0, 0])
+
+    def test_moving_a_task_updates_both_boards(self):
+        task = self.create_task()
+        other = Boards.objects.create(title='other', owner=self.owner)
+
+        task.board = other
+        task.save()
+
+        self.assertEqual(self.counters(), [2, 0, 0, 0])
+        self.assertEqual(self.counters(other), [0, 1, 1, 1])
+
+    def test_membership_changes(self):
+        third = User.objects.create_user(username='third', email='third@example.com')
+        self.board.members.add(third, self.member)
+        self.assertEqual(self.counters()[0], 3)
+
+        self.board.members.remove(third, User.objects.create_user(username='stranger'))
+        self.assertEqual(self.counters()[0], 2)
+
+        self.member.boards.clear()
+        self.assertEqual(self.counters()[0], 1)
+
+    def test_deleting_a_member_updates_member_count(self):
+        version = Boards.objects.get(pk=self.board.pk).version
+
+        self.member.delete()
+
+        self.assertEqual(self.counters()[0], 1)
+        self.assertGreater(self.board.version, version)
+
+    def test_board_save_keeps_counters(self):
+        stale = Boards.objects.get(pk=self.board.pk)
+        self.create_task()
+
+        stale.title = 'renamed'
+        stale.save()
+
+        self.assertEqual(self.counters(), [2, 1, 1, 1])
+
+    def test_created_board_reports_members(self):
+        response = self.client.post('/api/boards/', {'title': 'new', 'members': [self.owner.id, self.member.id]})
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['member_count'], 2)
+
+    def test_recompute_command_repairs_drift(self):
+        self.create_task()
+        Tasks.objects.bulk_create([
+            Tasks(title='bulk', description='description', board=self.board, priority='high', status='to-do'),
+        ])
+        Boards.objects.filter(pk=self.board.pk).update(member_count=0)
+
+        call_command('recompute_board_stats', stdout=StringIO())
+
+        self.assertEqual(self.counters(), [2, 2, 2, 2])
+
+
+class BoardConditionalGetTests(APITestCase):
+    """
+    Tests for ETag based conditional GETs on board and task details.
+    """
+
+    def setUp(self):
+        caches['board_detail'].clear()
+        self.owner = User.objects.create_user(username='owner', email='owner@example.com')
+        self.board = Boards.objects.create(title='board', owner=self.owner)
+        self.board.members.add(self.owner)
+        self.task = Tasks.objects.create(title='task', description='description', board=self.board, priority='low')
+        self.client.force_authenticate(self.owner)
+        self.url = f'/api/boards/{self.board.id}/'
+
+    def test_unchanged_board_returns_304_with_one_query(self):
+        etag = self.client.get(self.url)['ETag']
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_changes_invalidate_the_etag(self):
+        changes = [
+            lambda: Tasks.objects.create(title='new', description='d', board=self.board, priority='low'),
+            lambda: self.task.comments.create(text='comment', author=self.owner),
+            lambda: self.board.members.add(User.objects.create_user(username='member')),
+            lambda: Tasks.objects.get(pk=self.task.pk).save(),
+        ]
+        for change in changes:
+            etag = self.client.get(self.url)['ETag']
+            change()
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotEqual(response['ETag'], etag)
+
+    def test_user_changes_invalidate_the_etag(self):
+        reviewer = User.objects.create_user(username='reviewer', email='reviewer@example.com')
+        Tasks.objects.filter(pk=self.task.pk).update(reviewer=reviewer)
+        for user in [self.owner, reviewer]:
+            etag = self.client.get(self.url)['ETag']
+            user.first_name = 'Renamed'
+            user.save()
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.json()['tasks'][0]['reviewer']['fullname'], 'Renamed')
+
+    def test_logins_keep_the_etag(self):
+        etag = self.client.get(self.url)['ETag']
+
+        update_last_login(None, self.owner)
+
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_last_modified_is_sent(self):
+        response = self.client.get(self.url)
+
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_non_member_gets_no_304(self):
+        etag = self.client.get(self.url)['ETag']
+        self.client.force_authenticate(User.objects.create_user(username='stranger'))
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_task_retrieve_supports_etags(self):
+        url = f'/api/tasks/{self.task.id}/'
+        etag = self.client.get(url)['ETag']
+
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.task.comments.create(text='comment', author=self.owner)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+class BoardDetailCacheTests(APITestCase):
+    """
+    Tests for the versioned cache of rendered board details.
+    """
+
+    def setUp(self):
+        caches['board_detail'].clear()
+        self.owner = User.objects.create_user(username='owner', email='owner@example.com')
+        self.board = Boards.objects.create(title='board', owner=self.owner)
+        self.board.members.add(self.owner)
+        self.task = Tasks.objects.create(title='task', description='description', board=self.board, priority='low')
+        self.client.force_authenticate(self.owner)
+        self.url = f'/api/boards/{self.board.id}/'
+
+    def test_cached_detail_is_served_with_one_query(self):
+        first = self.client.get(self.url)
+
+        with self.assertNumQueries(1):
+            second = self.client.get(self.url)
+
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second['Content-Type'], 'application/json')
+        self.assertEqual(second['ETag'], first['ETag'])
+
+    def test_changes_are_visible_immediately(self):
+        self.client.get(self.url)
+
+        response = self.client.patch(f'/api/tasks/{self.task.id}/', {'title': 'renamed'})
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(self.client.get(self.url).json()['tasks'][0]['title'], 'renamed')
+
+    def test_non_member_is_not_served_from_cache(self):
+        self.client.get(self.url)
+        self.client.force_authenticate(User.objects.create_user(username='stranger'))
+
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    @override_settings(BOARD_DETAIL_CACHE_MAX_BYTES=10)
+    def test_large_documents_are_not_cached(self):
+        self.client.get(self.url)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(len(queries), 1)
+
+
+class BoardSparseFieldsetTests(APITestCase):
+    """
+    Tests for `?fields=` and `?exclude=` on the board endpoints.
+    """
+
+    def setUp(self):
+        caches['board_detail'].clear()
+        self.owner = User.objects.create_user(username='owner', email='owner@example.com', first_name='Olga')
+        self.board = Boards.objects.create(title='board', owner=self.owner)
+        self.board.members.add(self.owner)
+        self.task = Tasks.objects.create(
+            title='task', description='description', board=self.board, priority='low', status='to-do',
+            assignee=self.owner, reviewer=self.owner,
+        )
+        self.client.force_authenticate(self.owner)
+        self.url = f'/api/boards/{self.board.id}/'
+
+    def test_board_overview(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f'{self.url}?fields=id,title,tasks.id,tasks.title,tasks.status,tasks.assignee.id')
+
+        self.assertEqual(response.json(), {
+            'id': self.board.id,
+            'title': 'board',
+            'tasks': [{'id': self.task.id, 'title': 'task', 'status': 'to-do', 'assignee': {'id': self.owner.id}}],
+        })
+        sql = ' '.join(query['sql'] for query in queries)
+        self.assertNotIn('INNER JOIN "boards_app_boards_members"', sql)
+        tasks_query = queries[-1]['sql']
+        self.assertIn('tasks_app_tasks', tasks_query)
+        self.assertNotIn('JOIN', tasks_query)
+        self.assertNotIn('comments_count', tasks_query)
+
+    def test_exclude(self):
+        response = self.client.get(f'{self.url}?exclude=tasks,members.email')
+
+        self.assertEqual(response.json(), {
+            'id': self.board.id,
+            'title': 'board',
+            'owner_id': self.owner.id,
+            'members': [{'id': self.owner.id, 'fullname': 'Olga'}],
+        })
+
+    def test_cached_per_fieldset(self):
+        sparse = f'{self.url}?fields=title'
+        self.assertEqual(self.client.get(sparse).json(), {'title': 'board'})
+        self.assertIn('tasks', self.client.get(self.url).json())
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(sparse).json(), {'title': 'board'})
+
+    def test_list(self):
+        response = self.client.get('/api/boards/?fields=id,ticket_count')
+
+        self.assertEqual(response.json(), [{'id': self.board.id, 'ticket_count': 1}])
+
+    def test_writes_return_the_full_document(self):
+        response = self.client.patch(f'{self.url}?fields=title', {'title': 'renamed'})
+
+        self.assertEqual(set(response.json()), {'id', 'title', 'owner_data', 'members_data'})
+
+
+class BoardChangesTests(APITestCase):
+    """
+    Tests for the delta sync endpoint GET /api/boards/<id>/changes/.
+    """
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', email='owner@example.com')
+        self.board = Boards.objects.create(title='board', owner=self.owner)
+        self.board.members.add(self.owner)
+        self.task = Tasks.objects.create(title='task', description='description', board=self.board, priority='low')
+        self.comment = self.task.comments.create(text='comment', author=self.owner)
+        self.client.force_authenticate(self.owner)
+        self.url = f'/api/boards/{self.board.id}/changes/'
+
+    def get_changes(self, since=None):
+        params = {} if since is None else {'since': since}
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_snapshot_without_cursor(self):
+        data = self.get_changes()
+
+        self.assertTrue(data['reset'])
+        self.assertEqual([task['id'] for task in data['tasks']], [self.task.id])
+        self.assertEqual(data['comments'][0]['task'], self.task.id)
+        self.assertEqual(data['cursor'], BoardChange.objects.latest_cursor(self.board.id))
+
+    def test_delta_contains_upserts_and_tombstones(self):
+        cursor = self.get_changes()['cursor']
+        created = Tasks.objects.create(title='new', description='d', board=self.board, priority='high')
+        changed = Tasks.objects.get(pk=self.task.pk)
+        changed.title = 'renamed'
+        changed.save()
+        Comment.objects.get(pk=self.comment.pk).delete()
+        removed = Tasks.objects.create(title='gone', description='d', board=self.board, priority='low')
+        Tasks.objects.get(pk=removed.pk).delete()
+
+        data = self.get_changes(cursor)
+
+        self.assertFalse(data['reset'])
+        self.assertFalse(data['has_more'])
+        self.assertEqual({task['id']: task['title'] for task in data['tasks']},
+                         {self.task.id: 'renamed', created.id: 'new'})
+        self.assertEqual(data['comments'], [])
+        self.assertEqual(data['deleted'], {'tasks': [removed.id], 'comments': [self.comment.id]})
+        self.assertEqual(self.get_changes(data['cursor'])['tasks'], [])
+
+    def test_deleting_the_author_logs_comment_tombstones(self):
+        author = User.objects.create_user(username='author', email='author@example.com')
+        comment = self.task.comments.create(text='by author', author=author)
+        cursor = self.get_changes()['cursor']
+        version = Boards.objects.get(pk=self.board.pk).version
+
+        author.delete()
+
+        data = self.get_changes(cursor)
+        self.assertEqual(data['deleted']['comments'], [comment.id])
+        self.assertEqual([task['id'] for task in data['tasks']], [self.task.id])
+        self.assertGreater(Boards.objects.get(pk=self.board.pk).version, version)
+
+    def test_moved_task_is_deleted_on_the_old_board(self):
+        cursor = self.get_changes()['cursor']
+        other = Boards.objects.create(title='other', owner=self.owner)
+        task = Tasks.objects.get(pk=self.task.pk)
+        task.board = other
+        task.save()
+
+        data = self.get_changes(cursor)
+
+        self.assertEqual(data['deleted']['tasks'], [self.task.id])
+        self.assertEqual(data['tasks'], [])
+
+    def test_paging_through_the_log(self):
+        cursor = self.get_changes()['cursor']
+        for index in range(3):
+            Tasks.objects.create(title=f'task {index}', description='d', board=self.board, priority='low')
+
+        with mock.patch.object(BoardsViewSet, 'changes_limit', 2):
+            first = self.get_changes(cursor)
+            second = self.get_changes(first['cursor'])
+
+        self.assertTrue(first['has_more'])
+        self.assertEqual(len(first['tasks']), 2)
+        self.assertFalse(second['has_more'])
+        self.assertEqual(len(second['tasks']), 1)
+
+    def test_cursor_before_truncation_resets(self):
+        cursor = self.get_changes()['cursor']
+        Tasks.objects.create(title='new', description='d', board=self.board, priority='low')
+        BoardChange.objects.truncate(timezone.now() + timedelta(seconds=1))
+
+        data = self.get_changes(cursor)
+
+        self.assertTrue(data['reset'])
+        self.assertEqual(len(data['tasks']), 2)
+        self.assertFalse(self.get_changes(data['cursor'])['reset'])
+
+    def test_invalid_cursor_and_foreign_board(self):
+        self.assertEqual(self.client.get(self.url, {'since': 'abc'}).status_code, 400)
+
+        self.client.force_authenticate(User.objects.create_user(username='stranger'))
+        self.assertEqual(self.client.get(self.url, {'since': 0}).status_code, 403)
+
+    def test_deleting_a_board_drops_its_log(self):
+        self.board.delete()
+
+        self.assertFalse(BoardChange.objects.filter(board_id=self.board.id).exists())
+
+
+class BoardEventBrokerTests(SimpleTestCase):
+    """
+    Tests for the in-process pub/sub broker behind the event stream.
+    """
+
+    async def test_events_fan_out_by_topic(self):
+        broker = Broker()
+        with broker.subscribe(['board:1']) as first, broker.subscribe(['board:1', 'board:2']) as second:
+            self.assertEqual(broker.publish('board:1', {'type': 'task'}), 2)
+            self.assertEqual(broker.publish('board:2', {'type': 'comment'}), 1)
+            self.assertEqual(broker.publish('board:3', {'type': 'task'}), 0)
+
+            self.assertEqual(await first.get(timeout=1), {'type': 'task'})
+            self.assertEqual(await second.get(timeout=1), {'type': 'task'})
+            self.assertEqual(await second.get(timeout=1), {'type': 'comment'})
+            with self.assertRaises(asyncio.TimeoutError):
+                await first.get(timeout=0.01)
+
+        self.assertEqual(broker.publish('board:1', {'type': 'task'}), 0)
+
+    async def test_slow_consumer_gets_a_resync(self):
+        broker = Broker()
+        with broker.subscribe(['board:1'], max_queue=3) as subscription:
+            for index in range(5):
+                broker.publish('board:1', {'type': 'task', 'id': index})
+            await asyncio.sleep(0)
+
+            self.assertEqual(await subscription.get(timeout=1), RESYNC)
+            self.assertEqual(await subscription.get(timeout=1), {'type': 'task', 'id': 4})
+
+    async def test_publish_from_another_thread(self):
+        broker = Broker()
+        with broker.subscribe(['board:1']) as subscription:
+            thread = threading.Thread(target=broker.publish, args=('board:1', {'type': 'task'}))
+            thread.start()
+            thread.join()
+
+            self.assertEqual(await subscription.get(timeout=1), {'type': 'task'})
+
+    async def test_resubscribe_switches_topics(self):
+        broker = Broker()
+        with broker.subscribe(['board:1']) as subscription:
+            broker.resubscribe(subscription, ['board:2'])
+            broker.publish('board:1', {'type': 'old'})
+            broker.publish('board:2', {'type': 'new'})
+
+            self.assertEqual(await subscription.get(timeout=1), {'type': 'new'})
+
+
+class BoardEventPublishingTests(TestCase):
+    """
+    Tests that task, comment and membership changes are published after commit.
+    """
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', email='owner@example.com')
+        self.member = User.objects.create_user(username='member', email='member@example.com')
+        self.board = Boards.objects.create(title='board', owner=self.owner)
+
+    def published(self, change):
+        with mock.patch.object(broker, 'publish') as publish:
+            with self.captureOnCommitCallbacks(execute=True):
+                change()
+                publish.assert_not_called()
+        return [call.args for call in publish.call_args_list]
+
+    def test_task_and_comment_events(self):
+        topic = board_topic(self.board.id)
+        events = self.published(
+            lambda: Tasks.objects.create(title='task', description='d', board=self.board, priority='low')
+        )
+        task = Tasks.objects.get()
+        self.assertEqual(events, [(topic, {'type': 'task', 'action': 'upsert', 'board': self.board.id, 'id': task.id})])
+
+        events = self.published(lambda: task.comments.create(text='comment', author=self.owner))
+        self.assertEqual([event['type'] for _, event in events], ['comment', 'task'])
+
+    def test_membership_events_reach_board_and_user(self):
+        events = self.published(lambda: self.board.members.add(self.member))
+
+        self.assertEqual(events, [
+            (board_topic(self.board.id), {'type': 'membership', 'board': self.board.id}),
+            (user_topic(self.member.id), {'type': 'access', 'board': self.board.id}),
+        ])
+
+        events = self.published(lambda: self.board.members.clear())
+        self.assertIn((user_topic(self.member.id), {'type': 'access', 'board': self.board.id}), events)
+
+    def test_board_delete_publishes_one_event(self):
+        for index in range(3):
+            Tasks.objects.create(title=f'task {index}', description='d', board=self.board, priority='low')
+        board_id = self.board.id
+
+        events = self.published(lambda: self.board.delete())
+
+        self.assertEqual(events, [
+            (board_topic(board_id), {'type': 'board', 'action': 'delete', 'board': board_id, 'id': board_id}),
+        ])
+
+
+@override_settings(ROOT_URLCONF='core.asgi_urls', BOARD_EVENTS_HEARTBEAT=0.05)
+class BoardEventStreamTests(TestCase):
+    """
+    Tests for the server-sent events stream at /api/events/.
+    """
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', email='owner@example.com')
+        self.board = Boards.objects.create(title='board', owner=self.owner)
+        self.foreign = Boards.objects.create(title='foreign', owner=User.objects.create_user(username='other'))
+        self.token = Token.objects.create(user=self.owner)
+
+    async def issue_ticket(self):
+        response = await self.async_client.post(
+            '/api/events/tickets/', headers={'Authorization': f'Token {self.token.key}'},
+        )
+        self.assertEqual(response.status_code, 201)
+        return response.json()['ticket']
+
+    async def test_stream_delivers_events_of_visible_boards(self):
+        response = await self.async_client.get('/api/events/', {'ticket': await self.issue_ticket()})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = aiter(response.streaming_content)
+
+        self.assertEqual(await anext(stream), b'event: ready\ndata: {"type": "ready"}\n\n')
+        broker.publish(board_topic(self.foreign.id), {'type': 'task', 'id': 1})
+        broker.publish(board_topic(self.board.id), {'type': 'task', 'id': 2})
+
+        self.assertEqual(await anext(stream), b'event: task\ndata: {"type": "task", "id": 2}\n\n')
+        self.assertEqual(await anext(stream), b': keep-alive\n\n')
+
+        # The ASGI handler cancels the response on client disconnect.
+        pending = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0)
+        pending.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await pending
+        self.assertEqual(broker.publish(board_topic(self.board.id), {'type': 'task'}), 0)
+
+    async def test_stream_requires_a_valid_token(self):
+        response = await self.async_client.get('/api/events/')
+        self.assertEqual(response.status_code, 401)
+
+        response = await self.async_client.get('/api/events/', {'ticket': 'invalid'})
+        self.assertEqual(response.status_code, 401)
+
+        response = await self.async_client.get('/api/events/', headers={'Authorization': f'Token {self.token.key}'})
+        self.assertEqual(response.status_code, 200)
+
+    async def test_tokens_in_the_query_string_are_rejected(self):
+        response = await self.async_client.get('/api/events/', {'token': self.token.key})
+
+        self.assertEqual(response.status_code, 401)
+
+    async def test_tickets_are_single_use(self):
+        ticket = await self.issue_ticket()
+
+        first = await self.async_client.get('/api/events/', {'ticket': ticket})
+        second = await self.async_client.get('/api/events/', {'ticket': ticket})
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(second.status_code, 401)
+
+    @override_settings(BOARD_EVENTS_RECHECK=0.05)
+    async def test_stream_ends_once_the_token_is_revoked(self):
+        response = await self.async_client.get('/api/events/', {'ticket': await self.issue_ticket()})
+        stream = aiter(response.streaming_content)
+        self.assertEqual(await anext(stream), b'event: ready\ndata: {"type": "ready"}\n\n')
+
+        await self.token.adelete()
+
+        self.assertEqual(await anext(stream), b'event: revoked\ndata: {"type": "revoked"}\n\n')
+        with self.assertRaises(StopAsyncIteration):
+            await anext(stream)
+
+
+class BenchReadPathCommandTests(TransactionTestCase):
+    """
+    Smoke test for the WSGI/ASGI read path benchmark.
+    """
+    # Its requests may read from replica aliases, which mirror default in tests.
+    databases = '__all__'
+
+    def test_reports_both_servers(self):
+        user = User.objects.create_user(username='bench')
+        board = Boards.objects.create(title='board', owner=user)
+        Tasks.objects.create(title='task', description='d', board=board, priority='high')
+        out = StringIO()
+
+        call_command('bench_read_path', user='bench', requests=4, concurrency=2, paths=['/api/boards/'], stdout=out)
+
+        rows = [line.split()[:2] for line in out.getvalue().splitlines()[1:]]
+        self.assertEqual(rows, [['/api/boards/', 'wsgi'], ['/api/boards/', 'asgi']])
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class SeedTests(TestCase):
+    """
+    Tests the synthetic data generator.
+    """
+
+    def test_scale_and_counters(self):
+        counts = seed(users=12, boards=6, members=4, tasks=10, comments=2)
+
+        self.assertEqual(counts['users'], 12)
+        self.assertEqual(counts['boards'], 6)
+        self.assertEqual(counts['tasks'], 60)
+        self.assertEqual(counts['comments'], Comment.objects.count())
+        stored = list(Boards.objects.order_by('pk').values_list(*Boards.COUNTER_FIELDS))
+        Boards.objects.recompute_counters()
+        self.assertEqual(list(Boards.objects.order_by('pk').values_list(*Boards.COUNTER_FIELDS)), stored)
+        for task in Tasks.objects.all():
+            self.assertEqual(task.comments_count, task.comments.count())
+
+    def test_owners_are_members_and_memberships_overlap(self):
+        seed(users=8, boards=6, members=4, tasks=1, comments=0)
+
+        for board in Boards.objects.prefetch_related('members'):
+            self.assertIn(board.owner, board.members.all())
+            self.assertEqual(board.member_count, 4)
+        self.assertTrue(User.objects.filter(boards__isnull=False).annotate(n=Count('boards')).filter(n__gt=1).exists())
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class BenchKanmindCommandTests(TestCase):
+    """
+    Smoke tests for the endpoint benchmark.
+    """
+    routes = ['GET ', 'POST /api/boards/', 'DELETE /api/tasks/<id>/comments/']
+
+    def setUp(self):
+        seed(users=6, boards=3, members=3, tasks=5, comments=2)
+
+    def bench(self, **options):
+        out = StringIO()
+        call_command('bench_kanmind', requests=2, routes=self.routes, stdout=out, stderr=StringIO(), **options)
+        return json.loads(out.getvalue())
+
+    def test_reports_routes_and_rolls_back_writes(self):
+        counts = (Boards.objects.count(), Comment.objects.count())
+
+        report = self.bench()
+
+        self.assertIn('GET /api/boards/<id>/', report['routes'])
+        self.assertIn('DELETE /api/tasks/<id>/comments/<id>/', report['routes'])
+        for name, result in report['routes'].items():
+            self.assertLess(result['status'], 400, name)
+            self.assertGreater(result['queries'], 0, name)
+            self.assertLessEqual(result['p50_ms'], result['p99_ms'], name)
+        self.assertEqual((Boards.objects.count(), Comment.objects.count()), counts)
+
+    def test_baseline_diff_flags_extra_queries(self):
+        report = self.bench()
+        report['routes']['GET /api/tasks/']['queries'] -= 1
+        with tempfile.TemporaryDirectory() as directory:
+            baseline = os.path.join(directory, 'baseline.json')
+            with open(baseline, 'w') as file:
+                json.dump(report, file)
+
+            diff = self.bench(baseline=baseline, tolerance=float('inf'))
+            with self.assertRaises(CommandError):
+                self.bench(baseline=baseline, tolerance=float('inf'), fail_on_regression=True)
+
+        queries = diff['diff']['GET /api/tasks/']['queries']
+        self.assertEqual(queries['current'], queries['baseline'] + 1)
+        self.assertEqual(len(diff['regressions']), 1, diff['regressions'])
+        self.assertIn('GET /api/tasks/', diff['regressions'][0])
+
+
+class BoardRoutesQueryScalingTests(QueryScalingTestCase):
+    """
+    Tests that the board routes take the same number of queries at every data scale.
+    """
+
+    def test_list(self):
+        self.assertConstantQueries(lambda data: ('GET', '/api/boards/', None))
+
+    def test_create(self):
+        self.assertConstantQueries(lambda data: ('POST', '/api/boards/', {'title': 'new', 'members': [data.user.pk]}))
+
+    def test_detail(self):
+        self.assertConstantQueries(lambda data: ('GET', f'/api/boards/{data.board.pk}/', None))
+
+    def test_update(self):
+        self.assertConstantQueries(lambda data: ('PATCH', f'/api/boards/{data.board.pk}/', {'title': 'renamed'}))
+
+    def test_delete(self):
+        self.assertConstantQueries(lambda data: ('DELETE', f'/api/boards/{data.board.pk}/', None))
+
+    def test_changes(self):
+        self.assertConstantQueries(lambda data: ('GET', f'/api/boards/{data.board.pk}/changes/', None))
@@ -0,0 +1,37 @@
+"""
+URL configuration of the ASGI application.
+
+Extends `core.urls` with the streaming endpoint, which holds its connection
+open on the event loop, and with async views for the hot GET endpoints
+(`core.async_views`). Neither is routed under WSGI. The async views come
+first and hand all other methods to the DRF views of the same URLs; they
+share the URL names of those views, so metrics and query budgets
+(`core.middleware`) label both the same.
+`core.asgi` selects this module through the DJANGO_ROOT_URLCONF
+environment variable.
+"""
+from django.urls import path
+
+from boards_app.api.async_views import BoardDetailAsyncView, BoardListAsyncView
+from boards_app.api.streams import board_events
+from core.urls import urlpatterns as wsgi_urlpatterns
+from tasks_app.api.async_views import (
+    CommentListAsyncView,
+    TaskDetailAsyncView,
+    TasksAssignedToMeAsyncView,
+    TasksAsyncView,
+    TasksHighPrioAsyncView,
+    TasksInReviewAsyncView,
+)
+
+urlpatterns = [
+    path('api/events/', board_events, name='board-events'),
+    path('api/boards/', BoardListAsyncView.as_view(), name='boards-list'),
+    path('api/boards/<int:pk>/', BoardDetailAsyncView.as_view(), name='board-detail'),
+    path('api/tasks/', TasksAsyncView.as_view(), name='task-list'),
+    path('api/tasks/reviewing/', TasksInReviewAsyncView.as_view(), name='tasks-reviewing'),
+    path('api/tasks/assigned-to-me/', TasksAssignedToMeAsyncView.as_view(), name='tasks-assigned-to-me'),
+    path('api/tasks/high-prio/', TasksHighPrioAsyncView.as_view(), name='tasks-high-prio'),
+    path('api/tasks/<int:pk>/', TaskDetailAsyncView.as_view(), name='task-detail'),
+    path('api/tasks/<int:task_pk>/comments/', CommentListAsyncView.as_view(), name='task-comments-list'),
+] + wsgi_urlpatterns
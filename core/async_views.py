@@ -0,0 +1,108 @@
+"""
+Async read path for the hot GET endpoints.
+
+`AsyncReadView` answers GET and HEAD on the event loop with the async ORM
+and async token authentication, and hands every other request to the DRF
+view of the same URL. That covers writes, paginated lists and the
+browsable API. The async views are only routed by `core.asgi_urls`; under
+WSGI the DRF views serve everything. Both paths return the same documents.
+"""
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import exceptions
+from rest_framework.settings import api_settings
+
+from user_auth_app.api.authentication import CachedTokenAuthentication
+
+
+def render_json(data, status=200):
+    """
+    Render data with the JSON renderer configured first in `DEFAULT_RENDERER_CLASSES`.
+
+    Args:
+        data: Serialized data.
+        status (int): The response status.
+
+    Returns:
+        HttpResponse: The JSON response.
+    """
+    renderer = api_settings.DEFAULT_RENDERER_CLASSES[0]()
+    return HttpResponse(renderer.render(data), content_type=renderer.media_type, status=status)
+
+
+class AsyncReadView(View):
+    """
+    Base class of async GET endpoints backed by a DRF view.
+
+    Subclasses implement `read(request, user, **kwargs)`, which returns
+    serialized data or a finished `HttpResponse`, and raise DRF exceptions
+    for error responses.
+
+    Attributes:
+        fallback (callable): The DRF view serving all other requests to the URL.
+        authentication_message (str): Detail of the 401 response for
+            anonymous users, matching the permission class of the DRF view.
+        fallback_params (tuple): Query parameters that are only handled by
+            the DRF view, i.e. pagination and format selection.
+    """
+    fallback = None
+    authentication_message = 'Authentication credentials were not provided.'
+    fallback_params = ('cursor', 'page_size', 'format')
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    def use_fallback(self, request):
+        """
+        Return True if the request must be served by the DRF view.
+        """
+        if request.method not in ('GET', 'HEAD'):
+            return True
+        if any(param in request.GET for param in self.fallback_params):
+            return True
+        return 'text/html' in request.headers.get('Accept', '')
+
+    async def dispatch(self, request, *args, **kwargs):
+        if self.use_fallback(request):
+            # Looked up on the class so the view function is not bound as a method.
+            return await sync_to_async(type(self).fallback)(request, *args, **kwargs)
+        return await super().dispatch(request, *args, **kwargs)
+
+    async def get(self, request, *args, **kwargs):
+        try:
+            user = await self.authenticate(request)
+            response = await self.read(request, user, *args, **kwargs)
+        except exceptions.APIException as exc:
+            response = render_json({'detail': exc.detail}, status=exc.status_code)
+            if exc.status_code == 401:
+                response['WWW-Authenticate'] = CachedTokenAuthentication.keyword
+        if not isinstance(response, HttpResponse):
+            response = render_json(response)
+        patch_vary_headers(response, ['Accept'])
+        return response
+
+    async def authenticate(self, request):
+        """
+        Authenticate the request by token; anonymous requests are rejected.
+
+        Sets `request.user`, as DRF does, so middleware sees the user.
+
+        Returns:
+            User: The authenticated user.
+
+        Raises:
+            AuthenticationFailed: If the token is invalid.
+            NotAuthenticated: If no token was sent.
+        """
+        result = await CachedTokenAuthentication().aauthenticate(request)
+        if result is None:
+            raise exceptions.NotAuthenticated(self.authentication_message)
+        request.user = result[0]
+        return result[0]
+
+    async def read(self, request, user, *args, **kwargs):
+        raise NotImplementedError('.read() must be overridden')
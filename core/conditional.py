@@ -0,0 +1,68 @@
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+
+def not_modified_response(request, etag, last_modified):
+    """
+    Return a 304 response if the client's cached copy is still current.
+
+    Args:
+        request (HttpRequest): The request carrying `If-None-Match` / `If-Modified-Since`.
+        etag (str): Quoted ETag of the current version.
+        last_modified (datetime): Aware time of the last change.
+
+    Returns:
+        HttpResponse | None: The 304 response, or None if the client needs the full response.
+    """
+    return get_conditional_response(request, etag=etag, last_modified=int(last_modified.timestamp()))
+
+
+def set_validators(response, etag, last_modified):
+    """
+    Add the `ETag` and `Last-Modified` headers to a response.
+    """
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(int(last_modified.timestamp()))
+    return response
+
+
+class ConditionalRetrieveMixin:
+    """
+    ViewSet mixin answering conditional GETs on `retrieve` from a version stamp.
+
+    Views implement `get_version_stamp()`, which must be a single cheap query
+    that also enforces read access. When the client's `If-None-Match` or
+    `If-Modified-Since` header still matches, a 304 is returned without
+    loading or serializing the object. Otherwise `retrieve_current()` builds
+    the full response, which carries `ETag` and `Last-Modified` headers.
+    """
+
+    def get_version_stamp(self):
+        """
+        Return the (etag, last_modified) pair of the requested object.
+
+        Returns:
+            tuple | None: Quoted ETag and aware datetime, or None if the
+            object does not exist or the user may not read it, in which
+            case the normal retrieve produces the error response.
+        """
+        raise NotImplementedError('.get_version_stamp() must be overridden')
+
+    def retrieve(self, request, *args, **kwargs):
+        stamp = self.get_version_stamp()
+        if stamp is None:
+            return super().retrieve(request, *args, **kwargs)
+
+        etag, last_modified = stamp
+        response = not_modified_response(request, etag, last_modified)
+        if response is None:
+            response = self.retrieve_current(request, etag, *args, **kwargs)
+        return set_validators(response, etag, last_modified)
+
+    def retrieve_current(self, request, etag, *args, **kwargs):
+        """
+        Build the full response for the object version identified by `etag`.
+
+        Views can override this, e.g. to serve a cached payload per version.
+        """
+        return super().retrieve(request, *args, **kwargs)
@@ -0,0 +1,178 @@
+"""
+Primary/replica database routing.
+
+Writes always go to `default`, the primary. Reads go to one of the aliases
+in the `DATABASE_REPLICAS` setting, but only inside a request that
+`ReplicaRoutingMiddleware` allowed to use a replica: a safe (GET, HEAD,
+OPTIONS) request from a client that has not written recently. Everything
+else, e.g. management commands, signal handlers and unsafe requests,
+reads from the primary. Once a request writes, its remaining reads go to
+the primary as well, and the client is pinned to the primary for
+`DATABASE_REPLICA_STICKINESS` seconds so it always sees its own changes.
+"""
+import hashlib
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# Per-request routing state: None outside requests and for requests pinned to
+# the primary, otherwise a dict with a `wrote` flag.
+_replica_reads = ContextVar('replica_reads', default=None)
+
+
+def get_replicas():
+    return list(getattr(settings, 'DATABASE_REPLICAS', []))
+
+
+def get_pin_cache():
+    """
+    Return the cache holding the pins, shared between workers.
+    """
+    return caches['replica_pins']
+
+
+@contextmanager
+def replica_reads():
+    """
+    Allow reads in the block to go to a replica, until the first write.
+
+    Yields:
+        dict: The routing state; `wrote` is set once the block writes.
+    """
+    state = {'wrote': False}
+    token = _replica_reads.set(state)
+    try:
+        yield state
+    finally:
+        _replica_reads.reset(token)
+
+
+class PrimaryReplicaRouter:
+    """
+    Send writes to the primary and eligible reads to a random replica.
+
+    Methods:
+        db_for_read(model): A replica if the current request may use one.
+        db_for_write(model): Always the primary; pins the request to it.
+        allow_relation(obj1, obj2): Allows relations between all aliases.
+        allow_migrate(db, app_label): Only migrates the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = _replica_reads.get()
+        replicas = get_replicas()
+        if state is None or state['wrote'] or not replicas:
+            return DEFAULT_DB_ALIAS
+        # Reads inside a transaction must see the transaction's own writes.
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        state = _replica_reads.get()
+        if state is not None:
+            state['wrote'] = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {DEFAULT_DB_ALIAS, *get_replicas()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+def client_key(request):
+    """
+    Return a key identifying the client of a request for write stickiness.
+
+    Token clients are identified by a hash of their `Authorization` header,
+    which is available before authentication runs in the view; other clients
+    by their session or address.
+    """
+    credentials = (
+        request.headers.get('Authorization')
+        or request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+        or request.META.get('REMOTE_ADDR', '')
+    )
+    return credentials_key(credentials)
+
+
+def credentials_key(credentials):
+    """
+    Return the stickiness key of a client presenting `credentials`, e.g. `Token <key>`.
+    """
+    return 'db-primary-until:' + hashlib.sha256(credentials.encode()).hexdigest()
+
+
+def pin_to_primary(key):
+    """
+    Send the reads of the client with stickiness key `key` to the primary
+    for the next `DATABASE_REPLICA_STICKINESS` seconds.
+    """
+    if not get_replicas():
+        return
+    stickiness = getattr(settings, 'DATABASE_REPLICA_STICKINESS', 5)
+    if stickiness > 0:
+        get_pin_cache().set(key, time.time() + stickiness, stickiness)
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Decide per request whether reads may go to a replica.
+
+    Safe requests use replicas unless the client wrote within the last
+    `DATABASE_REPLICA_STICKINESS` seconds. Requests that are unsafe or
+    that wrote pin their client to the primary for that long. The pins are
+    kept in the `replica_pins` cache, shared between workers.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.uses_replicas(request):
+            response = self.get_response(request)
+            self.record_write(request)
+            return response
+        with replica_reads() as state:
+            response = self.get_response(request)
+        if state['wrote']:
+            self.record_write(request)
+        return response
+
+    async def __acall__(self, request):
+        if not self.uses_replicas(request):
+            response = await self.get_response(request)
+            self.record_write(request)
+            return response
+        with replica_reads() as state:
+            response = await self.get_response(request)
+        if state['wrote']:
+            self.record_write(request)
+        return response
+
+    def uses_replicas(self, request):
+        if not get_replicas() or request.method not in SAFE_METHODS:
+            return False
+        return (get_pin_cache().get(client_key(request)) or 0) <= time.time()
+
+    def record_write(self, request):
+        if request.method not in SAFE_METHODS:
+            pin_to_primary(client_key(request))
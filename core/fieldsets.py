@@ -0,0 +1,169 @@
+"""
+Sparse fieldsets: `?fields=` and `?exclude=` on read endpoints.
+
+Both parameters take comma-separated field names; dotted paths select
+fields of nested objects, e.g. `?fields=id,title,assignee.id` or
+`?exclude=tasks.description`. On list endpoints they apply to every item.
+Views use the fieldset to skip the queries and joins behind fields that
+are left out, and serializers to drop those fields. Unknown names are
+ignored. Writes always return the full representation.
+"""
+import hashlib
+import json
+
+from rest_framework.permissions import SAFE_METHODS
+
+
+def parse_paths(value):
+    """
+    Parse comma-separated dotted paths into a tree.
+
+    A name mapped to None stands for the whole field; a name mapped to a
+    dict only covers the fields of the nested object listed there. A whole
+    field wins over nested paths into it.
+
+    Args:
+        value (str): e.g. `id,assignee.id,assignee.email`.
+
+    Returns:
+        dict: e.g. `{'id': None, 'assignee': {'id': None, 'email': None}}`.
+    """
+    tree = {}
+    for path in value.split(','):
+        parts = [part.strip() for part in path.split('.')]
+        if not all(parts):
+            continue
+        node = tree
+        for part in parts[:-1]:
+            if part in node and node[part] is None:
+                break
+            node = node.setdefault(part, {})
+        else:
+            node[parts[-1]] = None
+    return tree
+
+
+class Fieldset:
+    """
+    The fields of a representation a client asked for.
+
+    Attributes:
+        include (dict | None): Tree of `?fields=`, or None for all fields.
+        exclude (dict): Tree of `?exclude=`.
+    """
+
+    def __init__(self, include=None, exclude=None):
+        self.include = include
+        self.exclude = exclude or {}
+
+    @classmethod
+    def from_query(cls, params):
+        """
+        Build the fieldset of the `fields` and `exclude` query parameters.
+
+        Args:
+            params (QueryDict): The query parameters.
+
+        Returns:
+            Fieldset: The requested fieldset.
+        """
+        fields, exclude = params.get('fields'), params.get('exclude')
+        return cls(parse_paths(fields) if fields else None, parse_paths(exclude) if exclude else None)
+
+    @property
+    def is_all(self):
+        return self.include is None and not self.exclude
+
+    @property
+    def key(self):
+        """
+        Return a short stable identifier of the fieldset; empty for all fields.
+        """
+        if self.is_all:
+            return ''
+        document = json.dumps([self.include, self.exclude], sort_keys=True)
+        return hashlib.sha256(document.encode()).hexdigest()[:16]
+
+    def wants(self, name):
+        """
+        Return True if the field `name` is part of the representation.
+        """
+        if self.include is not None and name not in self.include:
+            return False
+        return not (name in self.exclude and self.exclude[name] is None)
+
+    def __getitem__(self, name):
+        """
+        Return the fieldset of the nested object in field `name`.
+        """
+        include = None if self.include is None else self.include.get(name)
+        return Fieldset(include, self.exclude.get(name))
+
+    def apply(self, data):
+        """
+        Drop the fields that were not asked for from serialized data.
+
+        Args:
+            data (dict | list): A representation or a list of them.
+
+        Returns:
+            dict | list: The trimmed data.
+        """
+        if self.is_all:
+            return data
+        if isinstance(data, list):
+            return [self.apply(item) for item in data]
+        if isinstance(data, dict):
+            return {name: self[name].apply(value) for name, value in data.items() if self.wants(name)}
+        return data
+
+
+ALL_FIELDS = Fieldset()
+
+
+def request_fieldset(request):
+    """
+    Return the fieldset of a request; writes always get all fields.
+    """
+    if request.method not in SAFE_METHODS:
+        return ALL_FIELDS
+    return Fieldset.from_query(request.GET)
+
+
+class SparseFieldsetViewMixin:
+    """
+    View mixin passing the request's fieldset to serializers as `fieldset` context.
+    """
+
+    def get_fieldset(self):
+        if not hasattr(self, '_fieldset'):
+            self._fieldset = request_fieldset(self.request)
+        return self._fieldset
+
+    def get_serializer_context(self):
+        return {**super().get_serializer_context(), 'fieldset': self.get_fieldset()}
+
+
+class SparseFieldsetSerializerMixin:
+    """
+    Serializer mixin leaving out the fields that the `fieldset` context excludes.
+
+    Excluded fields are removed before serialization, so their sources are
+    never read. Nested fields are trimmed from the output. Only applies to
+    the top-level serializer (or the items of a top-level list).
+    """
+
+    def get_fieldset(self):
+        if self.root is self or self.root is self.parent:
+            return self.context.get('fieldset', ALL_FIELDS)
+        return ALL_FIELDS
+
+    def get_fields(self):
+        fields = super().get_fields()
+        fieldset = self.get_fieldset()
+        for name in [name for name, field in fields.items() if not field.write_only and not fieldset.wants(name)]:
+            del fields[name]
+        return fields
+
+    def to_representation(self, instance):
+        return self.get_fieldset().apply(super().to_representation(instance))
@@ -0,0 +1,41 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from core.sqlite import copy_database
+
+
+class Command(BaseCommand):
+    """
+    Copy the primary SQLite database into the files of the read replicas.
+
+    Stands in for replication when the replicas are local SQLite files
+    (`DB_REPLICA_PATHS`). Replicas lag the primary by up to one interval;
+    the replica router's stickiness hides that lag from the writing client.
+    """
+    help = 'Copy the primary SQLite database to the configured read replicas.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=float, default=0,
+            help='Repeat the copy every this many seconds until interrupted (default: copy once).',
+        )
+
+    def handle(self, *args, **options):
+        if connections[DEFAULT_DB_ALIAS].vendor != 'sqlite':
+            raise CommandError('sync_replica only copies SQLite databases.')
+        replicas = settings.DATABASE_REPLICAS
+        if not replicas:
+            raise CommandError('No read replicas configured; set DB_REPLICA_PATHS.')
+
+        source = settings.DATABASES[DEFAULT_DB_ALIAS]['NAME']
+        while True:
+            for alias in replicas:
+                started = time.perf_counter()
+                copy_database(source, settings.DATABASES[alias]['NAME'])
+                self.stdout.write(f'{alias}: synced in {(time.perf_counter() - started) * 1000:.1f} ms')
+            if options['interval'] <= 0:
+                return
+            time.sleep(options['interval'])
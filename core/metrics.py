@@ -0,0 +1,124 @@
+"""
+Minimal in-process metrics registry.
+
+Metrics live in the memory of the current worker process; every gunicorn
+worker keeps its own numbers. They are exposed through `MetricsView`.
+"""
+import threading
+from collections import deque
+
+
+class Counter:
+    """
+    Monotonically increasing counter.
+    """
+
+    def __init__(self):
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self._value += amount
+
+    def snapshot(self):
+        return {'type': 'counter', 'value': self._value}
+
+
+class Gauge:
+    """
+    Value that can go up and down, e.g. the number of queued jobs.
+    """
+
+    def __init__(self):
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount=1):
+        with self._lock:
+            self._value -= amount
+
+    @property
+    def value(self):
+        return self._value
+
+    def snapshot(self):
+        return {'type': 'gauge', 'value': self._value}
+
+
+def _percentile(samples, percent):
+    """Return the nearest-rank percentile of an already sorted list."""
+    return samples[min(len(samples) - 1, int(round(percent / 100 * (len(samples) - 1))))]
+
+
+class Histogram:
+    """
+    Rolling histogram over the most recent `size` observations.
+    """
+
+    def __init__(self, size=1024):
+        self._samples = deque(maxlen=size)
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        with self._lock:
+            self._samples.append(value)
+            self._count += 1
+
+    def snapshot(self):
+        with self._lock:
+            samples = sorted(self._samples)
+            count = self._count
+        if not samples:
+            return {'type': 'histogram', 'count': count}
+        return {
+            'type': 'histogram',
+            'count': count,
+            'window': len(samples),
+            'p50': _percentile(samples, 50),
+            'p95': _percentile(samples, 95),
+            'p99': _percentile(samples, 99),
+            'max': samples[-1],
+        }
+
+
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+def _get_or_create(name, factory):
+    metric = _registry.get(name)
+    if metric is None:
+        with _registry_lock:
+            metric = _registry.setdefault(name, factory())
+    return metric
+
+
+def counter(name):
+    """Return the counter registered under `name`, creating it if needed."""
+    return _get_or_create(name, Counter)
+
+
+def gauge(name):
+    """Return the gauge registered under `name`, creating it if needed."""
+    return _get_or_create(name, Gauge)
+
+
+def histogram(name):
+    """Return the histogram registered under `name`, creating it if needed."""
+    return _get_or_create(name, Histogram)
+
+
+def snapshot():
+    """
+    Return the current value of every registered metric.
+
+    Returns:
+        dict: Metric name mapped to its snapshot, sorted by name.
+    """
+    return {name: _registry[name].snapshot() for name in sorted(_registry)}
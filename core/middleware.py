@@ -0,0 +1,239 @@
+"""
+Per-request instrumentation.
+
+`RequestMetricsMiddleware` measures every request: the SQL queries it ran
+and the time spent in them, the time spent serializing and rendering the
+response, and the response size. It records everything in rolling
+per-endpoint histograms (`core.metrics`), checks the query count against
+the `QUERY_BUDGETS` setting and, in DEBUG or for staff users, reports the
+timings in a `Server-Timing` header.
+"""
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.utils.functional import SimpleLazyObject, empty
+
+from core import metrics
+
+logger = logging.getLogger(__name__)
+
+# Stats of the request being handled; copied into the threads that run
+# its sync code, so queries from async views are counted as well.
+_request_stats = ContextVar('request_stats', default=None)
+
+
+class QueryBudgetExceeded(Exception):
+    """
+    Raised in `raise` mode when an endpoint runs more queries than its budget.
+    """
+
+
+class RequestStats:
+    """
+    Measurements of one request.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.render_started = None
+        self.render_time = 0.0
+        self.serializing = False
+        self.serialize_time = 0.0
+
+    def timings(self):
+        """
+        Return the request's timings in milliseconds.
+
+        Returns:
+            dict: `db`, `serialize`, `render`, `app` (everything else,
+            mostly view code) and `total`.
+        """
+        total = (time.perf_counter() - self.started) * 1000
+        db, serialize, render = self.db_time * 1000, self.serialize_time * 1000, self.render_time * 1000
+        return {
+            'db': db,
+            'serialize': serialize,
+            'render': render,
+            'app': max(total - db - serialize - render, 0.0),
+            'total': total,
+        }
+
+
+@contextmanager
+def measure_serialization():
+    """
+    Add the time spent in the block to the current request's serializer time.
+
+    Nested blocks are only measured once, and queries run inside the block
+    count as database time, not serializer time. Usable as a decorator.
+    """
+    stats = _request_stats.get()
+    if stats is None or stats.serializing:
+        yield
+        return
+    stats.serializing = True
+    started, db_time = time.perf_counter(), stats.db_time
+    try:
+        yield
+    finally:
+        stats.serializing = False
+        stats.serialize_time += time.perf_counter() - started - (stats.db_time - db_time)
+
+
+class MeasuredSerializerMixin:
+    """
+    Serializer mixin reporting `to_representation` as serializer time.
+
+    Overrides of `to_representation` in subclasses are measured as well,
+    so the whole representation counts wherever the mixin sits in the bases.
+    """
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if 'to_representation' in vars(cls):
+            cls.to_representation = measure_serialization()(cls.to_representation)
+
+    @measure_serialization()
+    def to_representation(self, instance):
+        return super().to_representation(instance)
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    Database execute wrapper adding each query to the current request's stats.
+    """
+    stats = _request_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.queries += 1
+        stats.db_time += time.perf_counter() - started
+
+
+def install_query_recorder(sender=None, connection=None, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+connection_created.connect(install_query_recorder)
+
+
+def get_endpoint(request):
+    """
+    Return the label metrics and budgets use for a request, e.g. `GET boards-list`.
+    """
+    match = getattr(request, 'resolver_match', None)
+    return f"{request.method} {match.view_name if match else 'unresolved'}"
+
+
+def format_server_timing(stats, timings):
+    return ', '.join([
+        f'db;dur={timings["db"]:.1f};desc="{stats.queries} queries"',
+        f'serialize;dur={timings["serialize"]:.1f}',
+        f'render;dur={timings["render"]:.1f}',
+        f'app;dur={timings["app"]:.1f}',
+        f'total;dur={timings["total"]:.1f}',
+    ])
+
+
+class RequestMetricsMiddleware:
+    """
+    Measure queries, database, serializer and render time and response size per endpoint.
+
+    Endpoints are labelled with the request method and URL name. Each
+    measurement feeds a histogram named `http.<endpoint>.<measurement>`.
+    Serializer time is what `measure_serialization` blocks report. The
+    `Server-Timing` header is only sent in DEBUG or to staff users, as it
+    tells how long queries take.
+    If the endpoint has an entry in `QUERY_BUDGETS` and ran more queries,
+    the overrun is logged, or `QueryBudgetExceeded` is raised when
+    `QUERY_BUDGET_MODE` is `raise`, as `core.testing.TestRunner` sets it.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+        self.install_query_recorders()
+
+    def install_query_recorders(self):
+        # Connections opened before this module was imported missed the signal.
+        for connection in connections.all(initialized_only=True):
+            install_query_recorder(connection=connection)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        self.install_query_recorders()
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_stats.reset(token)
+        return self.finish(request, response, stats)
+
+    async def __acall__(self, request):
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _request_stats.reset(token)
+        return self.finish(request, response, stats)
+
+    def process_template_response(self, request, response):
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.render_started = time.perf_counter()
+            response.add_post_render_callback(lambda rendered: self.rendered(stats))
+        return response
+
+    def rendered(self, stats):
+        stats.render_time = time.perf_counter() - stats.render_started
+
+    def finish(self, request, response, stats):
+        endpoint = get_endpoint(request)
+        timings = stats.timings()
+        if self.shows_server_timing(request):
+            response['Server-Timing'] = format_server_timing(stats, timings)
+
+        metrics.histogram(f'http.{endpoint}.queries').observe(stats.queries)
+        for name, value in timings.items():
+            metrics.histogram(f'http.{endpoint}.{name}_ms').observe(value)
+        if not response.streaming:
+            metrics.histogram(f'http.{endpoint}.response_bytes').observe(len(response.content))
+
+        self.check_budget(endpoint, stats.queries)
+        return response
+
+    def shows_server_timing(self, request):
+        if settings.DEBUG:
+            return True
+        user = getattr(request, 'user', None)
+        if isinstance(user, SimpleLazyObject) and user._wrapped is empty:
+            # Loading the user now could query the session in an async context.
+            return False
+        return getattr(user, 'is_staff', False)
+
+    def check_budget(self, endpoint, queries):
+        budget = getattr(settings, 'QUERY_BUDGETS', {}).get(endpoint)
+        if budget is None or queries <= budget:
+            return
+        message = f'{endpoint} ran {queries} queries, over its budget of {budget}.'
+        if getattr(settings, 'QUERY_BUDGET_MODE', 'log') == 'raise':
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
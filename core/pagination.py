@@ -0,0 +1,43 @@
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+class OptInCursorPagination(CursorPagination):
+    """
+    Keyset (cursor) pagination that clients opt into per request.
+
+    Lists are only paginated when the request carries a `cursor` or
+    `page_size` query parameter, so existing clients keep receiving plain
+    lists. Pages are ordered by the view's `cursor_ordering` (default `id`),
+    which must be an indexed column that does not change after creation.
+
+    Attributes:
+        page_size_query_param (str): Lets clients pick the page size.
+        max_page_size (int): Hard cap from the `MAX_PAGE_SIZE` setting.
+    """
+    page_size_query_param = 'page_size'
+    ordering = 'id'
+
+    def __init__(self):
+        self.max_page_size = getattr(settings, 'MAX_PAGE_SIZE', 200)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Paginate the queryset if the client asked for it.
+
+        Returns:
+            list | None: The current page, or None to return the full list.
+        """
+        params = request.query_params
+        if self.cursor_query_param not in params and self.page_size_query_param not in params:
+            return None
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_ordering(self, request, queryset, view):
+        """
+        Return the keyset ordering declared by the view.
+        """
+        ordering = getattr(view, 'cursor_ordering', self.ordering)
+        if isinstance(ordering, str):
+            return (ordering,)
+        return tuple(ordering)
@@ -0,0 +1,76 @@
+"""
+JSON renderer and parser backed by orjson when it is installed.
+
+`FastJSONRenderer` and `FastJSONParser` are drop-in replacements for DRF's
+`JSONRenderer` and `JSONParser`, configured in `REST_FRAMEWORK`. orjson is
+an optional dependency: without it, and for everything orjson cannot
+reproduce, both classes fall back to the stdlib implementation of DRF.
+"""
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    # Dates and times go through DRF's encoder so they render exactly as before.
+    ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    Render compact JSON with orjson, producing the same documents as `JSONRenderer`.
+
+    Types orjson does not know, such as Decimals, lazy translation strings
+    and querysets, as well as dates and times, are converted by DRF's
+    `JSONEncoder`. Indented output (the browsable API, `indent=` in the
+    Accept header), `UNICODE_JSON = False`, `COMPACT_JSON = False` and data
+    orjson rejects, e.g. integers beyond 64 bits, are rendered by the stdlib.
+    Unlike the stdlib, orjson renders NaN and infinity as null.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """
+        Render `data` into JSON, returning a bytestring.
+        """
+        if data is None:
+            return b''
+        if (
+            orjson is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            content = orjson.dumps(data, default=self.encoder_class().default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Escaped like JSONRenderer does, keeping the output a JavaScript subset.
+        return content.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
+
+
+class FastJSONParser(JSONParser):
+    """
+    Parse JSON request bodies with orjson.
+
+    orjson only reads UTF-8 and rejects NaN and infinity, matching
+    `STRICT_JSON`. Other encodings and non-strict parsing use the stdlib.
+    """
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        """
+        Parse the incoming bytestream as JSON and return the resulting data.
+        """
+        encoding = (parser_context or {}).get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or not self.strict or encoding.lower().replace('_', '-') not in ('utf-8', 'utf8'):
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
@@ -12,8 +12,11 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from pathlib import Path
 import os
+
 import sentry_sdk
 
+from core.sqlite import sqlite_init_command
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -45,9 +48,12 @@ INSTALLED_APPS = [
     'user_auth_app',
     'tasks_app',
     'boards_app',
+    # Only for the management commands in core/management.
+    'core',
 ]
 
 MIDDLEWARE = [
+    'core.middleware.RequestMetricsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -56,6 +62,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.db_router.ReplicaRoutingMiddleware',
 ]
 
 CSRF_TRUSTED_ORIGINS = [
@@ -82,7 +89,8 @@ CORS_ALLOWED_ORIGINS = [
 
 ]
 
-ROOT_URLCONF = 'core.urls'
+# core.asgi switches to core.asgi_urls, which adds the event stream.
+ROOT_URLCONF = os.environ.get('DJANGO_ROOT_URLCONF', 'core.urls')
 
 TEMPLATES = [
     {
@@ -105,13 +113,123 @@ WSGI_APPLICATION = 'core.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Applied to every new SQLite connection. WAL lets readers continue while a
+# writer commits. synchronous=NORMAL is safe against application crashes in
+# WAL mode (a power loss can drop the last commits). busy_timeout (ms) makes
+# a writer wait for the lock instead of failing with "database is locked".
+# A negative cache_size is in KiB.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000)),
+    'mmap_size': 128 * 1024 * 1024,
+    'cache_size': -32 * 1024,
+    'temp_store': 'MEMORY',
+}
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Reuse connections across requests; core.asgi sets 0, because
+        # ASGI requests run their sync code in short-lived threads.
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'init_command': sqlite_init_command(SQLITE_PRAGMAS),
+            # Transactions take the write lock at BEGIN, so a transaction
+            # that reads before writing cannot fail to upgrade its lock.
+            'transaction_mode': 'IMMEDIATE',
+        },
     }
 }
 
+# Read replicas: DB_REPLICA_PATHS lists SQLite files kept in sync with the
+# primary (see the sync_replica command). Safe requests read from them;
+# writes go to the primary, and a client that wrote reads from the primary
+# for DATABASE_REPLICA_STICKINESS seconds. Tests mirror replicas to default.
+DATABASE_REPLICAS = []
+for index, path in enumerate(filter(None, os.environ.get('DB_REPLICA_PATHS', '').split(','))):
+    alias = f'replica_{index}'
+    DATABASES[alias] = {**DATABASES['default'], 'NAME': path.strip(), 'TEST': {'MIRROR': 'default'}}
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['core.db_router.PrimaryReplicaRouter']
+DATABASE_REPLICA_STICKINESS = int(os.environ.get('DB_REPLICA_STICKINESS', 5))
+
+
+# Caches
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+#
+# 'board_detail' holds rendered board detail documents keyed by board
+# version. Locmem evicts least recently used entries per process; point it
+# at FileBasedCache to share entries between gunicorn workers.
+#
+# 'replica_pins' holds the read-your-writes pins of core.db_router. It must
+# be shared between workers, or a client's next request may be served by a
+# worker that does not know the client just wrote.
+#
+# 'event_tickets' holds the single-use tickets of the event stream; it must
+# be shared between the workers issuing them and the ASGI process.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'board_detail': {
+        'BACKEND': os.environ.get('BOARD_DETAIL_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('BOARD_DETAIL_CACHE_LOCATION', 'board-detail'),
+        'TIMEOUT': 3600,
+        'OPTIONS': {
+            'MAX_ENTRIES': 500,
+        },
+    },
+    'event_tickets': {
+        'BACKEND': os.environ.get('EVENT_TICKET_CACHE_BACKEND', 'django.core.cache.backends.filebased.FileBasedCache'),
+        'LOCATION': os.environ.get('EVENT_TICKET_CACHE_LOCATION', str(BASE_DIR / 'event-tickets')),
+    },
+    'replica_pins': {
+        'BACKEND': os.environ.get('REPLICA_PIN_CACHE_BACKEND', 'django.core.cache.backends.filebased.FileBasedCache'),
+        'LOCATION': os.environ.get('REPLICA_PIN_CACHE_LOCATION', str(BASE_DIR / 'replica-pins')),
+    },
+}
+
+# Board detail documents above this size are not cached.
+BOARD_DETAIL_CACHE_MAX_BYTES = 512 * 1024
+
+# Query budgets checked by core.middleware.RequestMetricsMiddleware, keyed
+# by '<method> <url name>'. The read budgets include one query for token
+# authentication on a cache miss. Overruns are logged, and fail the request
+# in the test suite (see TEST_RUNNER).
+QUERY_BUDGETS = {
+    'GET boards-list': 3,
+    'GET board-detail': 6,
+    'GET boards-changes': 7,
+    'GET task-list': 2,
+    'GET task-detail': 5,
+    'GET tasks-reviewing': 2,
+    'GET tasks-assigned-to-me': 2,
+    'GET tasks-high-prio': 2,
+    'GET task-comments-list': 2,
+    'POST task-list': 10,
+    'PATCH task-detail': 12,
+    'POST task-comments-list': 10,
+}
+QUERY_BUDGET_MODE = os.environ.get('QUERY_BUDGET_MODE', 'log')
+
+# Runs the test suite with QUERY_BUDGET_MODE = 'raise'.
+TEST_RUNNER = 'core.testing.TestRunner'
+
+# Board event stream (/api/events/, ASGI only): events queued per client
+# before its backlog is replaced by a resync event, and seconds between
+# keep-alive comments.
+BOARD_EVENTS_QUEUE_SIZE = 100
+BOARD_EVENTS_HEARTBEAT = 15
+# Seconds a stream ticket stays valid, and between re-authentications of an
+# open stream.
+BOARD_EVENTS_TICKET_TTL = 30
+BOARD_EVENTS_RECHECK = 60
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -161,16 +279,75 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
-    ]
+        'user_auth_app.api.authentication.CachedTokenAuthentication',
+    ],
+    # orjson-backed when installed, otherwise the same as DRF's JSON classes.
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'core.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    # Lists are only paginated when ?cursor= or ?page_size= is sent.
+    'DEFAULT_PAGINATION_CLASS': 'core.pagination.OptInCursorPagination',
+    'PAGE_SIZE': 50,
+    # Reverse proxies in front of the app. Throttles identify clients by
+    # REMOTE_ADDR, or by the X-Forwarded-For entry this many hops back;
+    # leaving it unset would trust client-supplied X-Forwarded-For headers.
+    'NUM_PROXIES': int(os.environ.get('NUM_PROXIES', 0)),
+    # Token-bucket rates for user_auth_app.api.throttling, per IP and per email.
+    'DEFAULT_THROTTLE_RATES': {
+        'login_ip': '30/min',
+        'login_email': '10/min',
+        'registration_ip': '20/hour',
+        'registration_email': '5/hour',
+        'email_check_ip': '120/min',
+        'email_check_email': '30/min',
+    },
+}
+
+# Upper bound for ?page_size= on paginated list endpoints.
+MAX_PAGE_SIZE = 200
+
+# 'memory' keeps throttle buckets per worker process; 'sqlite' shares them
+# between all workers through a separate file (never the main database).
+# Either store keeps at most MAX_KEYS buckets.
+THROTTLE_BUCKET_STORE = {
+    'BACKEND': os.environ.get('THROTTLE_BUCKET_BACKEND', 'memory'),
+    'PATH': BASE_DIR / 'throttle.sqlite3',
+    'MAX_KEYS': 100000,
+}
+
+# In-process token -> user cache used by CachedTokenAuthentication. Deleted
+# tokens and deactivated users are dropped at once in the worker that made
+# the change and after TOKEN_CACHE_TTL in the others.
+TOKEN_CACHE_MAX_SIZE = 10000
+TOKEN_CACHE_TTL = 5  # seconds
+
+# Where PBKDF2 runs: 'inline' on the request worker, or 'process' in a
+# bounded process pool that answers 503 when WORKERS + QUEUE_SIZE is exceeded.
+PASSWORD_HASHING = {
+    'MODE': os.environ.get('PASSWORD_HASHING_MODE', 'inline'),
+    'WORKERS': 2,
+    'QUEUE_SIZE': 16,
+    'TIMEOUT': 10,  # seconds
 }
 
 AUTHENTICATION_BACKENDS = [
+    'user_auth_app.backends.EmailBackend',
     'django.contrib.auth.backends.ModelBackend',
 ]
 
 sentry_sdk.init(
-    dsn="https://b7b3b00ed507633867d9337cb15465e3@o4509949106651137.ingest.de.sentry.io/4509949168517200",
+    dsn=os.environ.get(
+        'SENTRY_DSN',
+        "https://b7b3b00ed507633867d9337cb15465e3@o4509949106651137.ingest.de.sentry.io/4509949168517200",
+    ),
+    # Share of requests traced as Sentry performance transactions.
+    traces_sample_rate=float(os.environ.get('SENTRY_TRACES_SAMPLE_RATE', 0)),
     # Add data like request headers and IP for users,
     # see https://docs.sentry.io/platforms/python/data-management/data-collected/ for more info
     send_default_pii=True,
@@ -0,0 +1,56 @@
+"""
+Connection initialization for the SQLite database.
+
+Django's SQLite backend runs the `init_command` option on every new
+connection. `sqlite_init_command()` builds it from the `SQLITE_PRAGMAS`
+setting, so the tuning lives in one dict that deployments can adjust.
+
+`copy_database()` refreshes a replica file from the primary, see
+`core.db_router`.
+"""
+import sqlite3
+from contextlib import closing
+
+
+def pragma_statements(pragmas):
+    """
+    Return the PRAGMA statements applying the given settings.
+
+    Args:
+        pragmas (dict): Pragma names mapped to their values.
+
+    Returns:
+        list: One `PRAGMA name=value` statement per entry.
+    """
+    return [f'PRAGMA {name}={value}' for name, value in pragmas.items()]
+
+
+def sqlite_init_command(pragmas):
+    """
+    Return the `init_command` option applying the given pragmas.
+
+    Args:
+        pragmas (dict): Pragma names mapped to their values.
+
+    Returns:
+        str: Semicolon separated PRAGMA statements.
+    """
+    return ';'.join(pragma_statements(pragmas))
+
+
+def copy_database(source, target, pages=1024):
+    """
+    Copy a SQLite database into another file with the online backup API.
+
+    The source stays readable and writable during the copy; writes made
+    while it runs restart the copy, so `target` ends up a consistent
+    snapshot. Readers of `target` see the old or the new contents.
+
+    Args:
+        source (str | Path): Path of the database to copy.
+        target (str | Path): Path of the copy; created if missing.
+        pages (int): Pages copied per step, between which the source lock
+            is released.
+    """
+    with closing(sqlite3.connect(source)) as src, closing(sqlite3.connect(target)) as dst:
+        src.backup(dst, pages=pages)
@@ -0,0 +1,134 @@
+"""
+Test helpers shared by the app test suites.
+
+`QueryScalingTestCase` runs an API request against a small and a large
+data set generated by `boards_app.seed` and asserts that both take the
+same number of SQL queries, which catches N+1 queries in serializers,
+permissions and signal handlers. `TestRunner` makes every test fail a
+request that exceeds its entry in `QUERY_BUDGETS`.
+"""
+import os
+import tempfile
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.db import connection
+from django.test import override_settings
+from django.test.runner import DiscoverRunner
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from boards_app.models import Boards
+from boards_app.seed import seed
+from tasks_app.models import Comment, Tasks
+from user_auth_app.models import UserProfile
+
+# Arguments of `seed()` for the data sets compared.
+SCALES = (
+    {'users': 4, 'boards': 2, 'members': 3, 'tasks': 2, 'comments': 1},
+    {'users': 24, 'boards': 8, 'members': 8, 'tasks': 20, 'comments': 4},
+)
+
+
+class TestRunner(DiscoverRunner):
+    """
+    Test runner enforcing the query budgets.
+
+    Sets `QUERY_BUDGET_MODE` to `raise` for the whole run, so an endpoint
+    going over its budget fails the test that requested it. Tests can
+    still override the mode. File based caches, such as `replica_pins`,
+    are moved to a temporary directory.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.cache_directory = tempfile.TemporaryDirectory()
+        cache_settings = {
+            alias: {**config, 'LOCATION': os.path.join(self.cache_directory.name, alias)}
+            if config['BACKEND'].endswith('.FileBasedCache') else config
+            for alias, config in settings.CACHES.items()
+        }
+        self.test_settings = override_settings(QUERY_BUDGET_MODE='raise', CACHES=cache_settings)
+        self.test_settings.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self.test_settings.disable()
+        self.cache_directory.cleanup()
+        super().teardown_test_environment(**kwargs)
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class QueryScalingTestCase(APITestCase):
+    """
+    Base class for query count regression tests.
+
+    Methods:
+        build_scale(index, scale): Seeds one data set and returns its fixtures.
+        assertConstantQueries(request): Asserts that a request takes the same
+            number of queries at every scale.
+    """
+    scales = SCALES
+
+    def setUp(self):
+        caches['board_detail'].clear()
+
+    def build_scale(self, index, scale):
+        """
+        Seed a data set and pick the objects the requests act on.
+
+        The user owns the first board and is a member of every board of the
+        data set. The user reviews all its tasks, and the first task is
+        assigned to the user, in review, of high priority and has a comment
+        by the user, so every list has rows.
+
+        Args:
+            index (int): Number of the scale, used as prefix and random seed.
+            scale (dict): Arguments of `seed()`.
+
+        Returns:
+            SimpleNamespace: `prefix`, `user`, `board`, `task`, `comment`
+            and `profile`.
+        """
+        prefix = f'scale{index}'
+        seed(prefix=prefix, random_seed=index, **scale)
+        boards = list(Boards.objects.filter(title__startswith=f'{prefix} board').order_by('pk'))
+        board = boards[0]
+        user = board.owner
+        for other in boards[1:]:
+            other.members.add(user)
+        Tasks.objects.filter(board__in=boards).update(reviewer=user)
+        task = Tasks.objects.filter(board=board).order_by('pk').first()
+        Tasks.objects.filter(pk=task.pk).update(status='reviewing', priority='high', assignee=user)
+        task.refresh_from_db()
+        Boards.objects.filter(pk=board.pk).recompute_counters()
+        comment = Comment.objects.create(task=task, author=user, text='comment')
+        UserProfile.objects.bulk_create([
+            UserProfile(user=member, bio='bio', location='location')
+            for member in User.objects.filter(username__startswith=f'{prefix}-user-')
+        ])
+        return SimpleNamespace(
+            prefix=prefix, user=user, board=board, task=task, comment=comment,
+            profile=UserProfile.objects.get(user=user),
+        )
+
+    def assertConstantQueries(self, request, authenticate=True):
+        """
+        Assert that a request takes the same number of queries at every scale.
+
+        Args:
+            request (callable): Takes the fixtures of `build_scale()` and
+                returns (method, path, data) of the request to send.
+            authenticate (bool): Whether to send the request as the fixture user.
+        """
+        counts = []
+        for index, scale in enumerate(self.scales):
+            fixtures = self.build_scale(index, scale)
+            method, path, data = request(fixtures)
+            self.client.force_authenticate(fixtures.user if authenticate else None)
+            with CaptureQueriesContext(connection) as queries:
+                response = getattr(self.client, method.lower())(path, data, format='json')
+            self.assertLess(response.status_code, 400, f'{method} {path}: {response.content[:300]}')
+            counts.append(len(queries))
+        self.assertEqual(len(set(counts)), 1, f'{method} {path} ran {counts} queries at {len(counts)} scales.')
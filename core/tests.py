@@ -0,0 +1,336 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import CacheHandler
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.management import call_command, get_commands
+from django.core.management.base import CommandError
+from django.db import connection, router
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from boards_app.models import Boards
+from core import metrics
+from core.db_router import ReplicaRoutingMiddleware, client_key, get_pin_cache
+from core.middleware import QueryBudgetExceeded
+from core.sqlite import copy_database, pragma_statements
+from tasks_app.models import Tasks
+
+
+class RequestMetricsMiddlewareTests(APITestCase):
+    """
+    Tests the per-request query and timing instrumentation.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='user', email='user@example.com', is_staff=True)
+        board = Boards.objects.create(title='board', owner=self.user)
+        board.members.add(self.user)
+        self.task = Tasks.objects.create(title='task', description='d', board=board, priority='high')
+        self.client.force_authenticate(self.user)
+
+    def server_timing(self, response):
+        return dict(
+            (entry.split(';')[0], entry.split(';', 1)[1])
+            for entry in response['Server-Timing'].split(', ')
+        )
+
+    def test_server_timing_reports_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/tasks/')
+
+        self.assertEqual(response.status_code, 200)
+        timing = self.server_timing(response)
+        self.assertEqual(set(timing), {'db', 'serialize', 'render', 'app', 'total'})
+        self.assertIn(f'desc="{len(queries)} queries"', timing['db'])
+
+    def test_serializer_time_is_measured_apart_from_the_view(self):
+        def slow_representation(serializer, instance):
+            time.sleep(0.05)
+            return {'id': instance.pk}
+
+        with mock.patch('rest_framework.serializers.Serializer.to_representation', slow_representation):
+            response = self.client.get(f'/api/tasks/{self.task.id}/')
+
+        self.assertEqual(response.status_code, 200)
+        serialize = float(self.server_timing(response)['serialize'].split('=')[1])
+        app = float(self.server_timing(response)['app'].split('=')[1])
+        self.assertGreaterEqual(serialize, 50)
+        self.assertLess(app, 50)
+
+    def test_server_timing_is_hidden_from_other_users(self):
+        self.user.is_staff = False
+        self.user.save()
+
+        response = self.client.get('/api/tasks/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Server-Timing', response)
+        with override_settings(DEBUG=True):
+            self.assertIn('Server-Timing', self.client.get('/api/tasks/'))
+
+    def test_histograms_per_endpoint(self):
+        before = metrics.histogram('http.GET task-detail.queries').snapshot()['count']
+
+        response = self.client.get(f'/api/tasks/{self.task.id}/')
+        self.assertEqual(response.status_code, 200)
+
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot['http.GET task-detail.queries']['count'], before + 1)
+        self.assertGreaterEqual(snapshot['http.GET task-detail.response_bytes']['max'], len(response.content))
+        self.assertIn('http.GET task-detail.render_ms', snapshot)
+
+    def test_async_views_are_measured(self):
+        auth = {'Authorization': f'Token {Token.objects.create(user=self.user).key}'}
+        with override_settings(ROOT_URLCONF='core.asgi_urls'):
+            response = async_to_sync(self.async_client.get)('/api/tasks/', headers=auth)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('desc="0 queries"', response['Server-Timing'])
+
+    def test_test_runner_enforces_budgets(self):
+        self.assertEqual(settings.QUERY_BUDGET_MODE, 'raise')
+
+    @override_settings(QUERY_BUDGETS={'GET task-list': 0}, QUERY_BUDGET_MODE='raise')
+    def test_budget_overrun_fails_in_raise_mode(self):
+        with self.assertRaises(QueryBudgetExceeded):
+            self.client.get('/api/tasks/')
+
+    @override_settings(QUERY_BUDGETS={'GET task-list': 0}, QUERY_BUDGET_MODE='log')
+    def test_budget_overrun_is_logged_in_log_mode(self):
+        with self.assertLogs('core.middleware', 'WARNING') as logs:
+            response = self.client.get('/api/tasks/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('GET task-list ran', logs.output[0])
+
+
+class SQLiteTuningTests(SimpleTestCase):
+    """
+    Concurrency tests for `SQLITE_PRAGMAS` on a temporary database file.
+    """
+
+    def connect(self, path, pragmas):
+        connection = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        for statement in pragma_statements(pragmas):
+            connection.execute(statement)
+        return connection
+
+    def run_workload(self, pragmas, readers=4, writes=20):
+        """
+        Write while reader threads hold read transactions open.
+
+        The writes start once every reader is inside its transaction, and
+        the readers commit after the last write, so no write can slip in
+        between two reads.
+
+        Returns:
+            tuple: The journal mode of the database and the lock errors raised.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'stress.sqlite3')
+            setup = self.connect(path, pragmas)
+            setup.execute('CREATE TABLE items (id INTEGER PRIMARY KEY, value TEXT)')
+            journal_mode = setup.execute('PRAGMA journal_mode').fetchone()[0]
+            setup.close()
+
+            reading = threading.Barrier(readers + 1)
+            done = threading.Event()
+            errors = []
+
+            def read():
+                connection = self.connect(path, pragmas)
+                connection.execute('BEGIN')
+                connection.execute('SELECT count(*) FROM items').fetchone()
+                reading.wait()
+                done.wait()
+                connection.execute('COMMIT')
+                connection.close()
+
+            def write():
+                connection = self.connect(path, pragmas)
+                for index in range(writes):
+                    try:
+                        connection.execute('BEGIN IMMEDIATE')
+                        connection.execute('INSERT INTO items (value) VALUES (?)', (str(index),))
+                        connection.execute('COMMIT')
+                    except sqlite3.OperationalError as exc:
+                        errors.append(exc)
+                        connection.execute('ROLLBACK')
+                connection.close()
+
+            threads = [threading.Thread(target=read) for _ in range(readers)]
+            for thread in threads:
+                thread.start()
+            try:
+                reading.wait(timeout=10)
+                write()
+            finally:
+                done.set()
+                for thread in threads:
+                    thread.join()
+            return journal_mode, errors
+
+    def test_writers_do_not_wait_for_readers(self):
+        # Without a busy timeout, a write that has to wait for a reader fails at once.
+        journal_mode, errors = self.run_workload({**settings.SQLITE_PRAGMAS, 'busy_timeout': 0})
+
+        self.assertEqual(journal_mode, 'wal')
+        self.assertEqual(errors, [])
+
+    def test_rollback_journal_serializes_readers_and_writers(self):
+        pragmas = {**settings.SQLITE_PRAGMAS, 'journal_mode': 'DELETE', 'busy_timeout': 0}
+
+        journal_mode, errors = self.run_workload(pragmas)
+
+        self.assertEqual(journal_mode, 'delete')
+        self.assertTrue(errors)
+        self.assertIn('locked', str(errors[0]))
+
+
+class SQLiteConnectionSettingsTests(TestCase):
+    """
+    Tests that Django connections are opened with the configured pragmas.
+    """
+
+    def test_pragmas_and_transaction_mode(self):
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA busy_timeout')
+            self.assertEqual(cursor.fetchone()[0], settings.SQLITE_PRAGMAS['busy_timeout'])
+            cursor.execute('PRAGMA synchronous')
+            self.assertEqual(cursor.fetchone()[0], 1)
+        self.assertEqual(connection.transaction_mode, 'IMMEDIATE')
+
+
+@override_settings(DATABASE_REPLICAS=['replica_0'], DATABASE_REPLICA_STICKINESS=5)
+class ReplicaRoutingTests(SimpleTestCase):
+    """
+    Tests which database the router picks inside requests.
+    """
+
+    def setUp(self):
+        get_pin_cache().clear()
+        self.factory = RequestFactory()
+        self.headers = {'Authorization': 'Token abc'}
+
+    def handle(self, request, write=False):
+        """
+        Run a request through the middleware and return the aliases its view read from.
+        """
+        reads = []
+
+        def view(request):
+            reads.append(router.db_for_read(Tasks))
+            if write:
+                router.db_for_write(Tasks)
+            reads.append(router.db_for_read(Tasks))
+            return HttpResponse()
+
+        ReplicaRoutingMiddleware(view)(request)
+        return reads
+
+    def test_reads_outside_requests_use_the_primary(self):
+        self.assertEqual(router.db_for_read(Tasks), 'default')
+
+    def test_safe_requests_read_from_a_replica(self):
+        reads = self.handle(self.factory.get('/api/tasks/', headers=self.headers))
+
+        self.assertEqual(reads, ['replica_0', 'replica_0'])
+
+    def test_unsafe_requests_read_from_the_primary(self):
+        reads = self.handle(self.factory.post('/api/tasks/', headers=self.headers), write=True)
+
+        self.assertEqual(reads, ['default', 'default'])
+
+    def test_reads_after_a_write_use_the_primary(self):
+        reads = self.handle(self.factory.get('/api/tasks/', headers=self.headers), write=True)
+
+        self.assertEqual(reads, ['replica_0', 'default'])
+
+    def test_client_sticks_to_the_primary_after_writing(self):
+        self.handle(self.factory.patch('/api/tasks/1/', headers=self.headers), write=True)
+
+        own = self.handle(self.factory.get('/api/tasks/', headers=self.headers))
+        other = self.handle(self.factory.get('/api/tasks/', headers={'Authorization': 'Token xyz'}))
+
+        self.assertEqual(own, ['default', 'default'])
+        self.assertEqual(other, ['replica_0', 'replica_0'])
+
+    def test_pins_are_shared_between_workers(self):
+        self.handle(self.factory.post('/api/tasks/', headers=self.headers), write=True)
+
+        # A second worker process opens its own connection to the cache.
+        other_worker = CacheHandler().create_connection('replica_pins')
+        pinned_until = other_worker.get(client_key(self.factory.get('/', headers=self.headers)))
+
+        self.assertIsInstance(other_worker, FileBasedCache)
+        self.assertGreater(pinned_until, time.time())
+
+    def test_stickiness_expires(self):
+        with override_settings(DATABASE_REPLICA_STICKINESS=1):
+            self.handle(self.factory.post('/api/tasks/', headers=self.headers), write=True)
+        with mock.patch('core.db_router.time.time', return_value=time.time() + 2):
+            reads = self.handle(self.factory.get('/api/tasks/', headers=self.headers))
+
+        self.assertEqual(reads, ['replica_0', 'replica_0'])
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_without_replicas_everything_uses_the_primary(self):
+        reads = self.handle(self.factory.get('/api/tasks/', headers=self.headers))
+
+        self.assertEqual(reads, ['default', 'default'])
+
+    def test_async_requests_read_from_a_replica(self):
+        reads = []
+
+        async def view(request):
+            reads.append(router.db_for_read(Tasks))
+            return HttpResponse()
+
+        async_to_sync(ReplicaRoutingMiddleware(view))(self.factory.get('/api/tasks/', headers=self.headers))
+
+        self.assertEqual(reads, ['replica_0'])
+
+
+class CopyDatabaseTests(SimpleTestCase):
+    """
+    Tests the backup copy used to keep replica files in sync.
+    """
+
+    def test_replica_receives_primary_rows(self):
+        with tempfile.TemporaryDirectory() as directory:
+            primary = os.path.join(directory, 'primary.sqlite3')
+            replica = os.path.join(directory, 'replica.sqlite3')
+            writer = sqlite3.connect(primary, isolation_level=None)
+            writer.execute('PRAGMA journal_mode=WAL')
+            writer.execute('CREATE TABLE items (name TEXT)')
+            writer.execute("INSERT INTO items VALUES ('first')")
+            copy_database(primary, replica)
+            writer.execute("INSERT INTO items VALUES ('second')")
+
+            reader = sqlite3.connect(replica)
+            try:
+                self.assertEqual(reader.execute('SELECT count(*) FROM items').fetchone()[0], 1)
+                copy_database(primary, replica)
+                self.assertEqual(reader.execute('SELECT count(*) FROM items').fetchone()[0], 2)
+            finally:
+                reader.close()
+                writer.close()
+
+    def test_sync_replica_is_a_core_command(self):
+        self.assertEqual(get_commands()['sync_replica'], 'core')
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_sync_replica_needs_replicas(self):
+        with self.assertRaisesMessage(CommandError, 'DB_REPLICA_PATHS'):
+            call_command('sync_replica')
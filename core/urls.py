@@ -19,6 +19,7 @@ from django.urls import path, include
 from django.conf.urls.static import static
 from core import settings
 from django.contrib.staticfiles.urls import staticfiles_urlpatterns
+from core.views import MetricsView
 
 def trigger_error(request):
     division_by_zero = 1 / 0
@@ -28,5 +29,6 @@ urlpatterns = [
     path('api/', include('user_auth_app.api.urls')),
     path('api/', include('tasks_app.api.urls')),
     path('api/', include('boards_app.api.urls')),
+    path('api/metrics/', MetricsView.as_view(), name='metrics'),
     path('sentry-debug/', trigger_error),
 ] + staticfiles_urlpatterns()
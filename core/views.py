@@ -0,0 +1,20 @@
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from core import metrics
+
+
+class MetricsView(APIView):
+    """
+    API view exposing the in-process metrics of the current worker.
+
+    Only staff users may read the metrics.
+
+    Methods:
+        get(request): Returns a snapshot of all registered metrics.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(metrics.snapshot())
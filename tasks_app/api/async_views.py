@@ -0,0 +1,119 @@
+from rest_framework.exceptions import NotFound
+
+from boards_app.models import Boards
+from core.async_views import AsyncReadView, render_json
+from core.conditional import not_modified_response, set_validators
+from core.fieldsets import request_fieldset
+from tasks_app.models import Comment, Tasks
+from .serializers import CommentSerializer, TasksSerializer, select_task_users, serialize_task_rows, task_rows
+from .views import (
+    CommentViewSet,
+    TasksAssignedToMeAsReviewerViewSet,
+    TasksHighPrioViewset,
+    TasksInReviewViewset,
+    TasksViewSet,
+    task_etag,
+)
+
+
+class TaskListAsyncView(AsyncReadView):
+    """
+    Base class of the async task lists; subclasses filter `Tasks` in `get_queryset`.
+    """
+
+    def get_queryset(self, user):
+        raise NotImplementedError('.get_queryset() must be overridden')
+
+    async def read(self, request, user):
+        fieldset = request_fieldset(request)
+        rows = [row async for row in task_rows(self.get_queryset(user), fieldset)]
+        return serialize_task_rows(rows, fieldset=fieldset)
+
+
+class TasksAsyncView(TaskListAsyncView):
+    """
+    Async GET /api/tasks/: tasks on the boards the user owns or is a member of.
+    """
+    fallback = TasksViewSet.as_view({'get': 'list', 'post': 'create'})
+    authentication_message = 'Authentication required to access tasks.'
+
+    def get_queryset(self, user):
+        return Tasks.objects.filter(board__in=Boards.objects.visible_to(user).values('pk'))
+
+
+class TasksInReviewAsyncView(TaskListAsyncView):
+    """
+    Async GET /api/tasks/reviewing/.
+    """
+    fallback = TasksInReviewViewset.as_view({'get': 'list'})
+
+    def get_queryset(self, user):
+        return Tasks.objects.filter(status='reviewing')
+
+
+class TasksAssignedToMeAsyncView(TaskListAsyncView):
+    """
+    Async GET /api/tasks/assigned-to-me/.
+    """
+    fallback = TasksAssignedToMeAsReviewerViewSet.as_view({'get': 'list'})
+
+    def get_queryset(self, user):
+        return Tasks.objects.filter(reviewer=user)
+
+
+class TasksHighPrioAsyncView(TaskListAsyncView):
+    """
+    Async GET /api/tasks/high-prio/.
+    """
+    fallback = TasksHighPrioViewset.as_view({'get': 'list'})
+
+    def get_queryset(self, user):
+        return Tasks.objects.filter(priority='high')
+
+
+class TaskDetailAsyncView(AsyncReadView):
+    """
+    Async GET /api/tasks/<id>/, answering conditional requests like `TasksViewSet.retrieve`.
+    """
+    fallback = TasksViewSet.as_view({
+        'get': 'retrieve', 'put': 'update', 'patch': 'partial_update', 'delete': 'destroy',
+    })
+    authentication_message = 'Authentication required to access tasks.'
+
+    async def read(self, request, user, pk):
+        stamp = await (
+            Tasks.objects
+            .filter(pk=pk)
+            .values('id', 'board__version', 'board__updated_at')
+            .afirst()
+        )
+        if stamp is None:
+            raise NotFound('No Tasks matches the given query.')
+
+        etag = task_etag(stamp)
+        response = not_modified_response(request, etag, stamp['board__updated_at'])
+        if response is None:
+            fieldset = request_fieldset(request)
+            try:
+                task = await select_task_users(Tasks.objects.all(), fieldset).aget(pk=pk)
+            except Tasks.DoesNotExist:
+                raise NotFound('No Tasks matches the given query.')
+            context = {'request': request, 'fieldset': fieldset}
+            response = render_json(TasksSerializer(task, context=context).data)
+        return set_validators(response, etag, stamp['board__updated_at'])
+
+
+class CommentListAsyncView(AsyncReadView):
+    """
+    Async GET /api/tasks/<task_id>/comments/.
+    """
+    fallback = CommentViewSet.as_view({'get': 'list', 'post': 'create'})
+    authentication_message = 'Authentication required to access tasks.'
+
+    async def read(self, request, user, task_pk):
+        fieldset = request_fieldset(request)
+        comments = Comment.objects.filter(task__id=task_pk)
+        if fieldset.wants('author'):
+            comments = comments.select_related('author')
+        comments = [comment async for comment in comments]
+        return CommentSerializer(comments, many=True, context={'fieldset': fieldset}).data
@@ -1,6 +1,8 @@
 from rest_framework.permissions import BasePermission, SAFE_METHODS
 from rest_framework.exceptions import NotAuthenticated, PermissionDenied
 
+from tasks_app.models import Comment
+
 
 class IsBoardMemberOrReadOnly(BasePermission):
     """
@@ -9,6 +11,9 @@ class IsBoardMemberOrReadOnly(BasePermission):
     - Safe methods (GET, HEAD, OPTIONS) are always allowed.
     - Only the task author or board owner can delete a task.
     - Only board members can update a task.
+
+    Also guards comments, whose author is `author` and whose board is the
+    board of their task.
     """
 
     def has_permission(self, request, view):
@@ -39,12 +44,14 @@ class IsBoardMemberOrReadOnly(BasePermission):
         if not user or not user.is_authenticated:
             raise NotAuthenticated(detail="Unauthorized. The user must be logged in.")
 
+        board = obj.task.board if isinstance(obj, Comment) else obj.board
         if request.method == "DELETE":
-            if user == obj.author or user == obj.board.owner:
+            author_id = obj.author_id if isinstance(obj, Comment) else obj.owner_id
+            if user.pk in (author_id, board.owner_id):
                 return True
             raise PermissionDenied(detail="Forbidden. Only the task author or the board owner can delete the task.")
 
-        if user not in obj.board.members.all():
+        if user not in board.members.all():
             raise PermissionDenied(detail="Forbidden. The user must be a member of the board to which the task belongs.")
 
         # If all checks pass, permission is granted
@@ -1,16 +1,21 @@
+from operator import itemgetter
+
 from django.contrib.auth import get_user_model
 User = get_user_model()
 from rest_framework import serializers
 from tasks_app.models import Tasks, Comment
 from boards_app.api.serializers import UserMinimalSerializer
+from core.fieldsets import ALL_FIELDS, SparseFieldsetSerializerMixin
+from core.middleware import MeasuredSerializerMixin, measure_serialization
 
 
-class TasksSerializer(serializers.ModelSerializer):
+class TasksSerializer(MeasuredSerializerMixin, SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for the Tasks model.
 
     Handles serialization and deserialization of Task instances,
     including assignee and reviewer details, task metadata, and deadlines.
+    Reads are limited to the `fieldset` context (see `core.fieldsets`).
 
     Fields:
         id (int): Unique identifier of the task.
@@ -27,7 +32,7 @@ class TasksSerializer(serializers.ModelSerializer):
         comments_count (int): Number of comments associated with the task (read-only).
     """
 
-    comments_count = serializers.SerializerMethodField()
+    comments_count = serializers.IntegerField(read_only=True)
     priority = serializers.CharField()
     status = serializers.CharField()
     due_date = serializers.DateField()
@@ -65,18 +70,6 @@ class TasksSerializer(serializers.ModelSerializer):
             'board': {'required': True},
         }
 
-    def get_comments_count(self, obj):
-        """
-        Returns the number of comments related to the task.
-
-        Args:
-            obj (Tasks): The task instance.
-
-        Returns:
-            int: The count of related comments.
-        """
-        return obj.comments.count()
-
     def to_representation(self, instance):
         """
         Customize the serialized representation of the task.
@@ -98,10 +91,12 @@ class TasksSerializer(serializers.ModelSerializer):
         return data
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(MeasuredSerializerMixin, SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for the Comment model.
 
+    Reads are limited to the `fieldset` context (see `core.fieldsets`).
+
     Fields:
         id (int): Unique identifier of the comment.
         created_at (datetime): Timestamp of when the comment was created.
@@ -117,7 +112,7 @@ class CommentSerializer(serializers.ModelSerializer):
         fields = ['id', 'created_at', 'author', 'content']
 
 
-class ReviewerSerializer(serializers.Serializer):
+class ReviewerSerializer(MeasuredSerializerMixin, serializers.Serializer):
     """
     Serializer to validate the reviewer field for a task.
 
@@ -136,7 +131,7 @@ class ReviewerSerializer(serializers.Serializer):
     )
 
 
-class TasksSerializerNoBoard(serializers.ModelSerializer):
+class TasksSerializerNoBoard(MeasuredSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for tasks excluding board information.
 
@@ -157,7 +152,7 @@ class TasksSerializerNoBoard(serializers.ModelSerializer):
     description = serializers.CharField()
     assignee = UserMinimalSerializer(read_only=True)
     reviewer = UserMinimalSerializer(read_only=True)
-    comments_count = serializers.SerializerMethodField()
+    comments_count = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Tasks
@@ -166,14 +161,107 @@ class TasksSerializerNoBoard(serializers.ModelSerializer):
             'assignee', 'reviewer', 'due_date', 'comments_count',
         ]
 
-    def get_comments_count(self, obj):
-        """
-        Returns the number of comments related to the task.
 
-        Args:
-            obj (Tasks): The task instance.
+TASK_FIELDS = (
+    'id', 'board', 'title', 'description', 'status', 'priority',
+    'assignee', 'reviewer', 'due_date', 'comments_count',
+)
+TASK_COLUMNS = {
+    'id': 'id', 'board': 'board_id', 'title': 'title', 'description': 'description', 'status': 'status',
+    'priority': 'priority', 'due_date': 'due_date', 'comments_count': 'comments_count',
+}
+USER_ROLES = ('assignee', 'reviewer')
 
-        Returns:
-            int: Count of related comments.
-        """
-        return obj.comments.count()
\ No newline at end of file
+
+def select_task_users(queryset, fieldset=ALL_FIELDS):
+    """
+    Join the assignee and reviewer of tasks if the fieldset includes them.
+
+    Args:
+        queryset (QuerySet): Tasks to serialize with `TasksSerializer`.
+        fieldset (Fieldset): The fields to serialize.
+
+    Returns:
+        QuerySet: The tasks with the requested users joined.
+    """
+    roles = [role for role in USER_ROLES if fieldset.wants(role)]
+    return queryset.select_related(*roles) if roles else queryset
+
+
+def task_rows(queryset, fieldset=ALL_FIELDS):
+    """
+    Turn a tasks queryset into `.values()` rows for `serialize_task_rows`.
+
+    Only the columns of the requested fields are selected. The id is
+    always selected, for cursor pagination. Users are joined only when
+    their email or full name is asked for; their ids come from the task.
+
+    Args:
+        queryset (QuerySet): Tasks to fetch.
+        fieldset (Fieldset): The fields to serialize.
+
+    Returns:
+        QuerySet: The rows, fetched with a single query.
+    """
+    columns = ['id'] + [column for name, column in TASK_COLUMNS.items() if name != 'id' and fieldset.wants(name)]
+    for role in USER_ROLES:
+        if not fieldset.wants(role):
+            continue
+        columns.append(f'{role}_id')
+        if fieldset[role].wants('email'):
+            columns.append(f'{role}__email')
+        if fieldset[role].wants('fullname'):
+            columns += [f'{role}__first_name', f'{role}__last_name']
+    return queryset.values(*columns)
+
+
+@measure_serialization()
+def serialize_task_rows(rows, include_board=True, fieldset=ALL_FIELDS):
+    """
+    Serialize task rows without building model instances or running serializer fields.
+
+    Produces the same documents as `TasksSerializer` (list and detail
+    reads) or, without the board, `TasksSerializerNoBoard`, limited to the
+    fieldset. Each user is serialized once per role and shared by every
+    task that refers to it.
+
+    Args:
+        rows (iterable): Rows from `task_rows` with the same fieldset.
+        include_board (bool): Whether to include the `board` field.
+        fieldset (Fieldset): The fields to serialize.
+
+    Returns:
+        list: Serialized tasks.
+    """
+    users = {role: {} for role in USER_ROLES}
+
+    def user_getter(role):
+        fields, cache = fieldset[role], users[role]
+
+        def get(row):
+            pk = row[f'{role}_id']
+            if pk is None:
+                return None
+            if pk not in cache:
+                user = {}
+                if fields.wants('id'):
+                    user['id'] = pk
+                if fields.wants('email'):
+                    user['email'] = row[f'{role}__email']
+                if fields.wants('fullname'):
+                    user['fullname'] = f"{row[f'{role}__first_name']} {row[f'{role}__last_name']}".strip()
+                cache[pk] = user
+            return cache[pk]
+        return get
+
+    getters = {name: itemgetter(column) for name, column in TASK_COLUMNS.items()}
+    getters.update(
+        assignee=user_getter('assignee'),
+        reviewer=user_getter('reviewer'),
+        due_date=lambda row: row['due_date'].isoformat() if row['due_date'] else None,
+    )
+    selected = [
+        (name, getters[name]) for name in TASK_FIELDS
+        if fieldset.wants(name) and (include_board or name != 'board')
+    ]
+    return [{name: get(row) for name, get in selected} for row in rows]
@@ -1,5 +1,5 @@
 from django.urls import path, include
-from .views import TasksViewSet, TasksAssignedToMeAsReviewerViewSet, CommentViewSet, TasksInReviewViewset
+from .views import TasksViewSet, TasksAssignedToMeAsReviewerViewSet, CommentViewSet, TasksInReviewViewset, TasksHighPrioViewset
 from boards_app.api.views import BoardsViewSet
 from rest_framework_nested.routers import DefaultRouter, NestedDefaultRouter
 
@@ -15,8 +15,9 @@ review_router = NestedDefaultRouter(router, r'tasks', lookup='task')
 
 
 urlpatterns = [
-   path('tasks/reviewing/', TasksInReviewViewset.as_view({'get': 'list'})),
-   path('tasks/assigned-to-me/', TasksAssignedToMeAsReviewerViewSet.as_view({'get': 'list'})),
+   path('tasks/reviewing/', TasksInReviewViewset.as_view({'get': 'list'}), name='tasks-reviewing'),
+   path('tasks/assigned-to-me/', TasksAssignedToMeAsReviewerViewSet.as_view({'get': 'list'}), name='tasks-assigned-to-me'),
+   path('tasks/high-prio/', TasksHighPrioViewset.as_view({'get': 'list'}), name='tasks-high-prio'),
    path('boards/<int:pk>/', BoardsViewSet.as_view({'get': 'retrieve', 'patch': 'partial_update', 'put': 'update', 'delete': 'destroy'}), name='board-detail'),
 
    path('', include(router.urls)),
@@ -3,62 +3,160 @@ from rest_framework.generics import GenericAPIView
 from rest_framework.response import Response
 from rest_framework import status
 from django.shortcuts import get_object_or_404
+from django.db import transaction
 from tasks_app.models import Tasks, Comment
+from boards_app.models import Boards
 from rest_framework import viewsets
 from rest_framework.viewsets import GenericViewSet
 from rest_framework import mixins
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.exceptions import PermissionDenied
 from .permissions import IsBoardMemberOrReadOnly
-from .serializers import TasksSerializer, CommentSerializer
+from .serializers import TasksSerializer, CommentSerializer, select_task_users, serialize_task_rows, task_rows
+from core.conditional import ConditionalRetrieveMixin
+from core.fieldsets import SparseFieldsetViewMixin
 
 
-class TasksViewSet(viewsets.ModelViewSet):
+def task_etag(stamp):
+    """
+    Return the quoted ETag of a task version stamp with `id` and `board__version`.
+    """
+    return f'"task-{stamp["id"]}-v{stamp["board__version"]}"'
+
+
+class TaskRowsListMixin(SparseFieldsetViewMixin):
+    """
+    List action serializing tasks straight from `.values()` rows.
+
+    Returns the same documents as `TasksSerializer`, paginated or not,
+    without building model instances. Only the columns and joins of the
+    requested fieldset are queried.
+    """
+
+    def list(self, request, *args, **kwargs):
+        fieldset = self.get_fieldset()
+        rows = task_rows(self.filter_queryset(self.get_queryset()), fieldset)
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(serialize_task_rows(page, fieldset=fieldset))
+        return Response(serialize_task_rows(rows, fieldset=fieldset))
+
+
+class TasksViewSet(ConditionalRetrieveMixin, TaskRowsListMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing tasks.
 
     Allows authenticated users to create, retrieve, update, and delete tasks.
     Read-only access is granted to unauthenticated users.
 
+    Writes run in a transaction together with the board counter updates
+    made by `boards_app.signals`. `retrieve` sends an ETag based on the
+    version of the task's board and answers `If-None-Match` with 304.
+    `list` serializes `.values()` rows (see `TaskRowsListMixin`).
+
     Methods:
+        get_queryset(): Restricts the list to tasks on the user's boards.
         perform_create(serializer): Sets the task owner to the current user.
     """
     queryset = Tasks.objects.all()
     serializer_class = TasksSerializer
     permission_classes = [IsBoardMemberOrReadOnly]
 
+    def get_queryset(self):
+        """
+        Returns the tasks queryset for the current action.
+
+        The list action only returns tasks on boards the user owns or is a
+        member of. The board filter is a subquery, so the whole list is
+        fetched with a single query. `retrieve` joins the assignee and
+        reviewer if they are part of the requested fieldset.
+
+        Returns:
+            QuerySet: Tasks for the current action.
+        """
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            queryset = queryset.filter(board__in=Boards.objects.visible_to(self.request.user).values('pk'))
+        elif self.action == 'retrieve':
+            queryset = select_task_users(queryset, self.get_fieldset())
+        return queryset
+
+    def get_version_stamp(self):
+        """
+        Return the ETag and last modification time of the requested task.
+
+        Every task and comment change advances the version of the task's
+        board, so the board version also identifies the task payload.
+
+        Returns:
+            tuple | None: The version stamp, or None if the task does not exist.
+        """
+        stamp = (
+            Tasks.objects
+            .filter(pk=self.kwargs['pk'])
+            .values('id', 'board__version', 'board__updated_at')
+            .first()
+        )
+        if stamp is None:
+            return None
+        return task_etag(stamp), stamp['board__updated_at']
+
+    @transaction.atomic
     def perform_create(self, serializer):
         serializer.save(owner=self.request.user)
 
+    @transaction.atomic
+    def perform_update(self, serializer):
+        serializer.save()
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        instance.delete()
 
-class CommentViewSet(viewsets.ModelViewSet):
+
+class CommentViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing comments related to a specific task.
 
     Filters comments based on the parent task ID provided in the URL.
     Allows read and write operations based on user permissions.
+    Paginated lists are ordered by creation time. The author is only
+    joined when it is part of the requested fieldset.
 
     Methods:
         get_queryset(): Returns all comments related to the given task.
         perform_create(serializer): Assigns the current user as the comment author 
             and links the comment to the task.
+        perform_destroy(instance): Deletes the comment.
+
+    Creating and deleting comments also adjusts `Tasks.comments_count` in
+    the same transaction, through the signal handlers in `boards_app.signals`.
     """
     serializer_class = CommentSerializer
     permission_classes = [IsBoardMemberOrReadOnly]
+    cursor_ordering = 'created_at'
 
     def get_queryset(self):
         task_id = self.kwargs.get('task_pk')
-        return Comment.objects.filter(task__id=task_id)
+        queryset = Comment.objects.filter(task__id=task_id)
+        if self.get_fieldset().wants('author'):
+            queryset = queryset.select_related('author')
+        return queryset
 
+    @transaction.atomic
     def perform_create(self, serializer):
         if not self.request.user.is_authenticated:
             raise PermissionDenied("You must be logged in to create a comment.")
         task_id = self.kwargs.get('task_pk')
         task = Tasks.objects.get(id=task_id)
         serializer.save(author=self.request.user, task=task)
-        
 
-class TasksAssignedToMeAsReviewerViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        instance.delete()
+
+
+class TasksAssignedToMeAsReviewerViewSet(TaskRowsListMixin, mixins.ListModelMixin, viewsets.GenericViewSet):
     serializer_class = TasksSerializer
     permission_classes = [IsAuthenticated]
 
@@ -66,7 +164,7 @@ class TasksAssignedToMeAsReviewerViewSet(mixins.ListModelMixin, viewsets.Generic
         return Tasks.objects.filter(reviewer=self.request.user)
 
 
-class TasksInReviewViewset(mixins.ListModelMixin, GenericViewSet):
+class TasksInReviewViewset(TaskRowsListMixin, mixins.ListModelMixin, GenericViewSet):
     """
     ViewSet for listing tasks with status 'review'.
 
@@ -82,7 +180,7 @@ class TasksInReviewViewset(mixins.ListModelMixin, GenericViewSet):
         return Tasks.objects.filter(status="reviewing")
     
 
-class TasksHighPrioViewset(mixins.ListModelMixin, GenericViewSet):
+class TasksHighPrioViewset(TaskRowsListMixin, mixins.ListModelMixin, GenericViewSet):
     """
     ViewSet for listing tasks with high priority.
 
@@ -0,0 +1,170 @@
+import io
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from boards_app.api.serializers import BoardsDetailSerializer
+from boards_app.models import Boards
+from core.renderers import FastJSONParser, FastJSONRenderer, orjson
+from tasks_app.api.serializers import (
+    CommentSerializer,
+    TasksSerializer,
+    TasksSerializerNoBoard,
+    serialize_task_rows,
+    task_rows,
+)
+from tasks_app.models import Comment, Tasks
+
+
+class Case:
+    """
+    One measured operation.
+
+    Attributes:
+        name (str): Label of the operation.
+        run (callable): Performs the operation and returns its result.
+        size (int): Units of work per run, e.g. tasks or bytes.
+        unit (str): Name of the unit, e.g. `tasks` or `MB`.
+        baseline (str | None): Name of the case this one must reproduce and is compared to.
+    """
+
+    def __init__(self, name, run, size, unit, baseline=None):
+        self.name = name
+        self.run = run
+        self.size = size
+        self.unit = unit
+        self.baseline = baseline
+
+
+def serialization_cases(queryset, count):
+    """
+    Build the serializations of a task list to compare.
+
+    Every case fetches the tasks itself, so model instance creation is
+    measured together with the serializer that needs it.
+
+    Args:
+        queryset (QuerySet): The tasks to serialize.
+        count (int): Number of tasks in the queryset.
+
+    Returns:
+        list: The cases.
+    """
+    instances = queryset.select_related('assignee', 'reviewer')
+    return [
+        Case('TasksSerializer', lambda: TasksSerializer(instances.all(), many=True).data, count, 'tasks'),
+        Case('serialize_task_rows', lambda: serialize_task_rows(task_rows(queryset)), count, 'tasks',
+             baseline='TasksSerializer'),
+        Case('TasksSerializerNoBoard', lambda: TasksSerializerNoBoard(instances.all(), many=True).data, count, 'tasks'),
+        Case('serialize_task_rows (no board)', lambda: serialize_task_rows(task_rows(queryset), include_board=False),
+             count, 'tasks', baseline='TasksSerializerNoBoard'),
+    ]
+
+
+def payloads(queryset):
+    """
+    Return the documents of the task list, board detail and comment list endpoints.
+
+    Args:
+        queryset (QuerySet): The tasks of the task list; the board detail
+            shows the board of the first task, the comment list the
+            comments on the tasks.
+
+    Returns:
+        dict: Payload names mapped to serialized data.
+    """
+    board = Boards.objects.with_details().get(pk=queryset[0].board_id)
+    comments = Comment.objects.filter(task__in=queryset.values('pk')).select_related('author')
+    return {
+        'task list': serialize_task_rows(task_rows(queryset)),
+        'board detail': BoardsDetailSerializer(board).data,
+        'comment list': CommentSerializer(comments, many=True).data,
+    }
+
+
+def rendering_cases(name, data):
+    """
+    Build the renderings and parsings of one payload to compare.
+
+    Args:
+        name (str): Name of the payload.
+        data: The serialized payload.
+
+    Returns:
+        list: The cases; sizes are megabytes of JSON.
+    """
+    content = JSONRenderer().render(data)
+    megabytes = len(content) / 1e6
+    return [
+        Case(f'JSONRenderer: {name}', lambda: JSONRenderer().render(data), megabytes, 'MB'),
+        Case(f'FastJSONRenderer: {name}', lambda: FastJSONRenderer().render(data), megabytes, 'MB',
+             baseline=f'JSONRenderer: {name}'),
+        Case(f'JSONParser: {name}', lambda: JSONParser().parse(io.BytesIO(content)), megabytes, 'MB'),
+        Case(f'FastJSONParser: {name}', lambda: FastJSONParser().parse(io.BytesIO(content)), megabytes, 'MB',
+             baseline=f'JSONParser: {name}'),
+    ]
+
+
+class Command(BaseCommand):
+    """
+    Measure the throughput of task serialization and of JSON rendering and parsing.
+
+    Runs each case `--repeat` times over the first `--tasks` tasks of the
+    configured database (fill it with `seed_kanmind`) and reports the best
+    run. Serialization compares `TasksSerializer` with the values-based
+    path; rendering and parsing compare DRF's JSON classes with those of
+    `core.renderers` on the task list, board detail and comment list
+    payloads. A case that does not reproduce the result of its baseline
+    fails the command.
+    """
+    help = 'Compare the throughput of task serialization and of the JSON renderers and parsers.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=1000, help='Number of tasks to serialize (default: 1000).')
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per case; the best counts (default: 5).')
+
+    def handle(self, *args, **options):
+        if options['repeat'] < 1:
+            raise CommandError('--repeat must be at least 1.')
+        queryset = Tasks.objects.order_by('pk')[:options['tasks']]
+        count = queryset.count()
+        if not count:
+            raise CommandError('No tasks to serialize; run seed_kanmind first.')
+
+        cases = serialization_cases(queryset, count)
+        for name, data in payloads(queryset).items():
+            cases += rendering_cases(name, data)
+
+        self.stdout.write(f'JSON backend of core.renderers: {"orjson" if orjson else "json"}')
+        results = {}
+        for case in cases:
+            best, result = self.measure(case.run, options['repeat'])
+            results[case.name] = best, result
+            line = f'{case.name:<32} {best * 1000:>9.2f} ms {case.size / best:>12,.1f} {case.unit}/s'
+            if case.baseline is not None:
+                baseline_best, baseline_result = results[case.baseline]
+                if self.normalize(result) != self.normalize(baseline_result):
+                    raise CommandError(f'{case.name} does not match {case.baseline}.')
+                line += f' {baseline_best / best:>6.1f}x'
+            self.stdout.write(line)
+
+    def normalize(self, result):
+        """
+        Return a comparable form of a result; rendered JSON is compared by its data.
+        """
+        return json.loads(result) if isinstance(result, bytes) else json.loads(JSONRenderer().render(result))
+
+    def measure(self, run, repeat):
+        """
+        Return the best duration in seconds and the result of the last run.
+        """
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = run()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best, result
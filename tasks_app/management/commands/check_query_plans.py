@@ -0,0 +1,174 @@
+import re
+from urllib.parse import parse_qs, urlsplit
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from boards_app.api.serializers import BoardsDetailSerializer
+from boards_app.models import Boards
+from tasks_app.api.serializers import task_rows
+from tasks_app.api.views import TaskRowsListMixin
+
+
+FULL_SCAN = re.compile(r'\bSCAN (?P<table>\w+)(?! USING (?:COVERING )?INDEX)(?!\w)')
+
+LIST_ENDPOINTS = [
+    '/api/boards/',
+    '/api/tasks/',
+    '/api/tasks/reviewing/',
+    '/api/tasks/assigned-to-me/',
+    '/api/tasks/high-prio/',
+    '/api/tasks/{task}/comments/',
+]
+
+DETAIL_ENDPOINTS = [
+    '/api/boards/{board}/',
+]
+
+
+def build_view(path, user, params=None):
+    """
+    Set up the view routed at `path` the way DRF does for a GET request.
+
+    Args:
+        path (str): Request path, resolved through the project URLconf.
+        user (User): User the request is authenticated as.
+        params (dict): Query parameters of the request.
+
+    Returns:
+        APIView: The view with its request, action and URL kwargs set.
+    """
+    match = resolve(path)
+    request = APIRequestFactory().get(path, params or {})
+    force_authenticate(request, user=user)
+    view = match.func.cls(**match.func.initkwargs)
+    view.action_map = match.func.actions
+    view.args, view.kwargs = match.args, match.kwargs
+    view.request = view.initialize_request(request, *match.args, **match.kwargs)
+    view.format_kwarg = None
+    return view
+
+
+def list_queryset(view):
+    """
+    Return the queryset the `list` action of `view` serializes.
+    """
+    queryset = view.filter_queryset(view.get_queryset())
+    if isinstance(view, TaskRowsListMixin):
+        queryset = task_rows(queryset, view.get_fieldset())
+    return queryset
+
+
+def endpoint_querysets(user, board_id, task_id):
+    """
+    Build the querysets of the hot endpoints from their views.
+
+    The querysets come from the views' own `get_queryset()` and
+    `filter_queryset()`, so the check follows changes to the endpoints.
+
+    Args:
+        user (User): User the requests are authenticated as.
+        board_id (int): Primary key used for board URLs.
+        task_id (int): Primary key used for task URLs.
+
+    Returns:
+        list: Tuples of (endpoint name, queryset).
+    """
+    querysets = []
+    for path in LIST_ENDPOINTS:
+        path = path.format(board=board_id, task=task_id)
+        querysets.append((f'GET {path}', list_queryset(build_view(path, user))))
+    for path in DETAIL_ENDPOINTS:
+        path = path.format(board=board_id, task=task_id)
+        view = build_view(path, user)
+        lookup = {view.lookup_field: view.kwargs[view.lookup_url_kwarg or view.lookup_field]}
+        querysets.append((f'GET {path}', view.filter_queryset(view.get_queryset()).filter(**lookup)))
+    board_path = DETAIL_ENDPOINTS[0].format(board=board_id)
+    querysets.append((f'GET {board_path} (tasks)', BoardsDetailSerializer.get_task_rows(Boards(pk=board_id))))
+    return querysets
+
+
+def paginated_queries(user, board_id, task_id, page_size=1):
+    """
+    Capture the SQL of the cursor-paginated list endpoints.
+
+    Each list is requested with `?page_size=` and then with the cursor of
+    its next page, through the view's own paginator. Lists with a single
+    page have no cursor request.
+
+    Args:
+        user (User): User the requests are authenticated as.
+        board_id (int): Primary key used for board URLs.
+        task_id (int): Primary key used for task URLs.
+        page_size (int): Page size requested.
+
+    Returns:
+        list: Tuples of (endpoint name, SQL).
+    """
+    queries = []
+    for path in LIST_ENDPOINTS:
+        path = path.format(board=board_id, task=task_id)
+        params = {'page_size': page_size}
+        while params is not None:
+            view = build_view(path, user, params)
+            with CaptureQueriesContext(connection) as captured:
+                view.paginate_queryset(list_queryset(view))
+            name = f'GET {path}?{"cursor=<next>" if "cursor" in params else f"page_size={page_size}"}'
+            queries += [(name, query['sql']) for query in captured.captured_queries]
+            next_link = view.paginator.get_next_link() if 'cursor' not in params else None
+            params = {key: values[0] for key, values in parse_qs(urlsplit(next_link).query).items()} if next_link else None
+    return queries
+
+
+def explain(sql):
+    """
+    Return the SQLite query plan of `sql`, formatted like `QuerySet.explain()`.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+        return '\n'.join(' '.join(str(column) for column in row) for row in cursor.fetchall())
+
+
+class Command(BaseCommand):
+    """
+    Run EXPLAIN QUERY PLAN for the queries behind each hot endpoint.
+
+    The queries are built by the endpoints' views, including the
+    cursor-paginated list pages. Fails with a non-zero exit code if any
+    plan falls back to a full table scan instead of searching an index.
+    Only SQLite plans are understood.
+    """
+    help = 'Check that the hot endpoint queries do not fall back to full table scans.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, default=1, help='Id of the user the sample requests are made as.')
+        parser.add_argument('--board', type=int, default=1, help='Board id used in the sample requests.')
+        parser.add_argument('--task', type=int, default=1, help='Task id used in the sample requests.')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('check_query_plans only understands SQLite query plans.')
+        user = User.objects.filter(pk=options['user']).first()
+        if user is None:
+            raise CommandError(f'User {options["user"]} does not exist.')
+
+        plans = [(name, queryset.explain()) for name, queryset in endpoint_querysets(user, options['board'], options['task'])]
+        plans += [(name, explain(sql)) for name, sql in paginated_queries(user, options['board'], options['task'])]
+
+        failures = []
+        for name, plan in plans:
+            scans = FULL_SCAN.findall(plan)
+            if scans:
+                failures.append(name)
+                self.stdout.write(self.style.ERROR(f'FULL SCAN  {name}: {", ".join(scans)}'))
+            else:
+                self.stdout.write(self.style.SUCCESS(f'ok         {name}'))
+            if options['verbosity'] > 1:
+                self.stdout.write(plan)
+
+        if failures:
+            raise CommandError(f'{len(failures)} endpoint quer{"y" if len(failures) == 1 else "ies"} fall back to a full table scan.')
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.5 on 2026-10-18 20:19
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('boards_app', '0009_remove_boards_tasks_to_do'),
+        ('tasks_app', '0014_rename_content_tasks_description_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='tasks',
+            index=models.Index(fields=['status', 'board'], name='tasks_status_board_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tasks',
+            index=models.Index(fields=['priority', 'board'], name='tasks_priority_board_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tasks',
+            index=models.Index(fields=['due_date'], name='tasks_due_date_idx'),
+        ),
+    ]
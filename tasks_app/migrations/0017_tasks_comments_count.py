@@ -0,0 +1,35 @@
+# Generated by Django 5.2.5 on 2026-10-18 20:28
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_comments_count(apps, schema_editor):
+    Tasks = apps.get_model('tasks_app', 'Tasks')
+    Comment = apps.get_model('tasks_app', 'Comment')
+    counted = (
+        Comment.objects
+        .filter(task=OuterRef('pk'))
+        .order_by()
+        .values('task')
+        .annotate(count=Count('pk'))
+        .values('count')
+    )
+    Tasks.objects.update(comments_count=Coalesce(Subquery(counted, output_field=IntegerField()), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks_app', '0016_comment_task_created_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tasks',
+            name='comments_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_comments_count, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,38 @@
-from django.db import models
+from django.db import models, router, transaction
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import User
 
 
+class TasksQuerySet(models.QuerySet):
+    """
+    Custom queryset for tasks.
+
+    Methods:
+        recompute_comments_count(): Rebuilds the stored comment counter.
+    """
+
+    def recompute_comments_count(self):
+        """
+        Recompute the stored comment counter from scratch in a single UPDATE.
+
+        Used to repair drift, e.g. after bulk operations that bypass the signals.
+
+        Returns:
+            int: Number of tasks updated.
+        """
+        counted = (
+            Comment.objects
+            .filter(task=OuterRef('pk'))
+            .order_by()
+            .values('task')
+            .annotate(count=Count('pk'))
+            .values('count')
+        )
+        return self.update(comments_count=Coalesce(Subquery(counted, output_field=IntegerField()), Value(0)))
+
+
 # Create your models here.
 class Tasks(models.Model):
     """
@@ -25,12 +55,20 @@ class Tasks(models.Model):
             will also delete all its associated tasks.
         status (CharField): The current status of the task, with possible choices defined 
             in STATUS_CHOICES. Defaults to 'to-do'.
+        comments_count (PositiveIntegerField): Denormalized number of comments, maintained
+            by the comment signal handlers in `boards_app.signals`.
 
     Meta:
         verbose_name (str): Human-readable singular name for the model.
         verbose_name_plural (str): Human-readable plural name for the model.
+        indexes (list): Indexes matching the hot filters of the board counters
+            and the reviewing, high-priority and due-date task lists.
 
     Methods:
+        save(): Saves the task without overwriting `comments_count` and
+            re-reads the stored board, status and priority so that signal
+            handlers can tell what changed.
+        delete(): Deletes the task, re-reading the same values first.
         __str__(): Returns a string representation of the task, including the title,
         content, and deadline.
     """
@@ -76,10 +114,71 @@ class Tasks(models.Model):
         choices=STATUS_CHOICES,
         default='to-do'
     )
-    
+    comments_count = models.PositiveIntegerField(default=0, editable=False)
+
+    objects = TasksQuerySet.as_manager()
+
     class Meta:
         verbose_name = 'Task'
         verbose_name_plural = 'Tasks'
+        indexes = [
+            models.Index(fields=['status', 'board'], name='tasks_status_board_idx'),
+            models.Index(fields=['priority', 'board'], name='tasks_priority_board_idx'),
+            models.Index(fields=['due_date'], name='tasks_due_date_idx'),
+        ]
+
+    TRACKED_FIELDS = ('board_id', 'status', 'priority')
+
+    def save(self, *args, **kwargs):
+        """
+        Save the task, leaving `comments_count` of existing tasks untouched.
+
+        The counter is only changed through atomic UPDATEs, so a full save
+        must not write back a value that was read earlier in the request.
+
+        The stored board, status and priority are re-read with the row
+        locked, in the same transaction as the write, and kept in
+        `_stored_values`. The signal handlers compute the board counter
+        deltas from them, so concurrent saves of a task that was loaded
+        with the same old values do not both apply the same change.
+        """
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using, savepoint=False):
+            self._stored_values = None
+            if not self._state.adding:
+                if kwargs.get('update_fields') is None:
+                    kwargs['update_fields'] = [
+                        field.name for field in self._meta.concrete_fields
+                        if not field.primary_key and field.name != 'comments_count'
+                    ]
+                self._stored_values = self.read_stored_values(using)
+            super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        """
+        Delete the task after re-reading its stored board, status and priority.
+
+        As in `save()`, the values are read with the row locked in the
+        delete transaction and kept in `_stored_values`, so the board
+        counters are decremented by what is stored, not by what the task
+        was loaded with. They are None if the task was already deleted.
+        """
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using, savepoint=False):
+            self._stored_values = self.read_stored_values(using)
+            return super().delete(*args, **kwargs)
+
+    def read_stored_values(self, using):
+        """
+        Return the stored `TRACKED_FIELDS` of the task, locking its row, or None if it does not exist.
+        """
+        return (
+            Tasks.objects.using(using)
+            .select_for_update()
+            .filter(pk=self.pk)
+            .values(*self.TRACKED_FIELDS)
+            .first()
+        )
 
     def __str__(self):
         return f"{self.title}, {self.description}, ({self.due_date})"
@@ -101,6 +200,7 @@ class Comment(models.Model):
     Meta:
         verbose_name (str): Human-readable singular name for the model.
         verbose_name_plural (str): Human-readable plural name for the model.
+        indexes (list): Index serving the per-task comment list ordered by creation time.
 
     Methods:
         __str__(): Returns a human-readable string representation of the comment,
@@ -122,6 +222,9 @@ class Comment(models.Model):
     class Meta:
         verbose_name = "Comment"
         verbose_name_plural = "Comments"
+        indexes = [
+            models.Index(fields=['task', 'created_at'], name='comment_task_created_idx'),
+        ]
 
     def __str__(self):
         return f"The comment on '{self.task.title}' is written by {self.author}"
@@ -1,3 +1,580 @@
-from django.test import TestCase
+import datetime
+import decimal
+import io
+import json
+import uuid
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.http import QueryDict
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils.functional import lazy
+from django.urls import resolve
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.test import APITestCase
+
+from boards_app.models import Boards
+from core.async_views import AsyncReadView
+from core.fieldsets import Fieldset, parse_paths
+from core.renderers import FastJSONParser, FastJSONRenderer
+from core.testing import QueryScalingTestCase
+from tasks_app.api.serializers import TasksSerializer, TasksSerializerNoBoard, serialize_task_rows, task_rows
+from tasks_app.models import Tasks
+
+
+class TasksListVisibilityTests(APITestCase):
+    """
+    Tests that GET /api/tasks/ only returns tasks on the user's boards.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='user', email='user@example.com')
+        self.other = User.objects.create_user(username='other', email='other@example.com')
+        self.client.force_authenticate(self.user)
+
+    def create_task(self, board, title):
+        return Tasks.objects.create(title=title, description='description', board=board, priority='low')
+
+    def test_only_tasks_on_accessible_boards_are_listed(self):
+        owned = Boards.objects.create(title='owned', owner=self.user)
+        shared = Boards.objects.create(title='shared', owner=self.other)
+        shared.members.add(self.user)
+        foreign = Boards.objects.create(title='foreign', owner=self.other)
+
+        visible = [self.create_task(owned, 'owned task'), self.create_task(shared, 'shared task')]
+        self.create_task(foreign, 'foreign task')
+
+        response = self.client.get('/api/tasks/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertCountEqual([task['id'] for task in response.data], [task.id for task in visible])
+
+
+class QueryPlanCommandTests(TestCase):
+    """
+    Tests that the hot task queries are served by indexes.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='user', email='user@example.com')
+        self.board = Boards.objects.create(title='board', owner=self.user)
+        self.tasks = [
+            Tasks.objects.create(
+                title=f'task {index}', description='description', board=self.board,
+                status='reviewing', priority='high', reviewer=self.user,
+            )
+            for index in range(2)
+        ]
+        for index in range(2):
+            self.tasks[0].comments.create(text=f'comment {index}', author=self.user)
+
+    def check_query_plans(self):
+        output = StringIO()
+        call_command(
+            'check_query_plans', user=self.user.pk, board=self.board.pk, task=self.tasks[0].pk, stdout=output,
+        )
+        return output.getvalue()
+
+    def test_no_endpoint_query_falls_back_to_full_scan(self):
+        self.assertNotIn('FULL SCAN', self.check_query_plans())
+
+    def test_paginated_pages_are_checked(self):
+        output = self.check_query_plans()
+
+        for path in ['/api/boards/', '/api/tasks/', f'/api/tasks/{self.tasks[0].pk}/comments/']:
+            self.assertIn(f'GET {path}?page_size=1', output)
+        self.assertIn('GET /api/tasks/high-prio/?cursor=<next>', output)
+        self.assertIn(f'GET /api/tasks/{self.tasks[0].pk}/comments/?cursor=<next>', output)
+
+    def test_full_scans_fail_the_check(self):
+        with mock.patch('tasks_app.api.views.TasksHighPrioViewset.get_queryset', return_value=Tasks.objects.filter(title='x')):
+            with self.assertRaises(CommandError):
+                self.check_query_plans()
+
+
+class CursorPaginationTests(APITestCase):
+    """
+    Tests for the opt-in cursor pagination of list endpoints.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='user', email='user@example.com')
+        self.board = Boards.objects.create(title='board', owner=self.user)
+        self.tasks = [
+            Tasks.objects.create(title=f'task {index}', description='description', board=self.board, priority='low')
+            for index in range(5)
+        ]
+        self.client.force_authenticate(self.user)
+
+    def test_lists_are_unpaginated_by_default(self):
+        response = self.client.get('/api/tasks/')
+
+        self.assertEqual(len(response.data), 5)
+
+    def test_cursor_pages_cover_every_task_once(self):
+        response = self.client.get('/api/tasks/', {'page_size': 2})
+        seen = [task['id'] for task in response.data['results']]
+        while response.data['next']:
+            response = self.client.get(response.data['next'])
+            seen += [task['id'] for task in response.data['results']]
+
+        self.assertEqual(seen, [task.id for task in self.tasks])
+
+    @override_settings(MAX_PAGE_SIZE=3)
+    def test_page_size_is_capped(self):
+        response = self.client.get('/api/tasks/', {'page_size': 1000})
+
+        self.assertEqual(len(response.data['results']), 3)
+
+    def test_comments_are_paginated_by_creation_time(self):
+        task = self.tasks[0]
+        comments = [task.comments.create(text=f'comment {index}', author=self.user) for index in range(3)]
+
+        response = self.client.get(f'/api/tasks/{task.id}/comments/', {'page_size': 2})
+        response = self.client.get(response.data['next'])
+
+        self.assertEqual([comment['id'] for comment in response.data['results']], [comments[2].id])
+
+
+class CommentsCountTests(APITestCase):
+    """
+    Tests for the denormalized comments_count on tasks.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='user', email='user@example.com')
+        self.board = Boards.objects.create(title='board', owner=self.user)
+        self.board.members.add(self.user)
+        self.task = Tasks.objects.create(title='task', description='description', board=self.board, priority='low')
+        self.client.force_authenticate(self.user)
+
+    def test_comment_create_and_delete_adjust_the_count(self):
+        url = f'/api/tasks/{self.task.id}/comments/'
+        first = self.client.post(url, {'content': 'first'})
+        self.client.post(url, {'content': 'second'})
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.comments_count, 2)
+
+        response = self.client.delete(f'{url}{first.data["id"]}/')
+
+        self.assertEqual(response.status_code, 204)
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.comments_count, 1)
+
+    def test_orm_writes_adjust_the_count(self):
+        author = User.objects.create_user(username='author', email='author@example.com')
+        self.task.comments.create(text='first', author=self.user)
+        self.task.comments.create(text='second', author=author)
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.comments_count, 2)
+
+        author.delete()
+
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.comments_count, 1)
+
+    def test_recompute_repairs_drift(self):
+        self.task.comments.create(text='first', author=self.user)
+        Tasks.objects.filter(pk=self.task.pk).update(comments_count=5)
+
+        call_command('recompute_board_stats', stdout=StringIO())
+
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.comments_count, 1)
+
+    def test_task_list_does_not_touch_comments(self):
+        self.client.post(f'/api/tasks/{self.task.id}/comments/', {'content': 'first'})
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/tasks/')
+
+        self.assertEqual(response.data[0]['comments_count'], 1)
+        self.assertFalse(any('tasks_app_comment' in query['sql'] for query in queries))
+
+    def test_task_save_keeps_comments_count(self):
+        stale = Tasks.objects.get(pk=self.task.pk)
+        self.client.post(f'/api/tasks/{self.task.id}/comments/', {'content': 'first'})
+
+        stale.title = 'renamed'
+        stale.save()
+
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.comments_count, 1)
+
+
+class TaskRowSerializationTests(APITestCase):
+    """
+    Tests that the values-based task serialization matches the model serializers.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='user', email='user@example.com', first_name='Ada', last_name='Lovelace',
+        )
+        nameless = User.objects.create_user(username='nameless', email='nameless@example.com')
+        surname = User.objects.create_user(username='surname', email='surname@example.com', last_name='Hopper')
+        self.board = Boards.objects.create(title='board', owner=self.user)
+        self.board.members.add(self.user)
+        Tasks.objects.create(
+            title='full', description='Beschreibung mit Ümlaut', board=self.board, priority='high',
+            status='reviewing', assignee=nameless, reviewer=self.user, due_date='2026-02-28',
+        )
+        Tasks.objects.create(title='empty', description='', board=self.board, priority='low')
+        Tasks.objects.create(
+            title='same user', description='d', board=self.board, priority='high', status='done',
+            assignee=surname, reviewer=surname,
+        )
+        self.client.force_authenticate(self.user)
+
+    def render(self, data):
+        return json.loads(JSONRenderer().render(data))
+
+    def test_matches_tasks_serializer(self):
+        queryset = Tasks.objects.order_by('pk')
+        self.assertEqual(
+            self.render(serialize_task_rows(task_rows(queryset))),
+            self.render(TasksSerializer(queryset, many=True).data),
+        )
+
+    def test_matches_tasks_serializer_without_board(self):
+        queryset = Tasks.objects.order_by('pk')
+        self.assertEqual(
+            self.render(serialize_task_rows(task_rows(queryset), include_board=False)),
+            self.render(TasksSerializerNoBoard(queryset, many=True).data),
+        )
+
+    def test_rows_are_fetched_with_one_query(self):
+        with self.assertNumQueries(1):
+            serialize_task_rows(task_rows(Tasks.objects.all()))
+
+    def test_list_endpoints_match_tasks_serializer(self):
+        Tasks.objects.update(reviewer=self.user)
+        endpoints = {
+            '/api/tasks/': Tasks.objects.all(),
+            '/api/tasks/reviewing/': Tasks.objects.filter(status='reviewing'),
+            '/api/tasks/assigned-to-me/': Tasks.objects.filter(reviewer=self.user),
+            '/api/tasks/high-prio/': Tasks.objects.filter(priority='high'),
+        }
+        for path, queryset in endpoints.items():
+            with self.subTest(path=path):
+                response = self.client.get(path)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(
+                    sorted(response.json(), key=lambda task: task['id']),
+                    self.render(TasksSerializer(queryset.order_by('pk'), many=True).data),
+                )
+
+    def test_paginated_list(self):
+        first = self.client.get('/api/tasks/?page_size=2').json()
+        second = self.client.get(first['next']).json()
+        expected = self.render(TasksSerializer(Tasks.objects.order_by('pk'), many=True).data)
+        self.assertEqual(first['results'] + second['results'], expected)
+        self.assertIsNone(second['next'])
+
+    def test_benchmark_command(self):
+        out = StringIO()
+        call_command('bench_serialization', '--repeat', '1', stdout=out)
+        lines = out.getvalue().splitlines()
+        names = [line.split('  ')[0] for line in lines[1:]]
+        self.assertEqual(names[:4], [
+            'TasksSerializer', 'serialize_task_rows', 'TasksSerializerNoBoard', 'serialize_task_rows (no board)',
+        ])
+        self.assertIn('tasks/s', lines[2])
+        for payload in ('task list', 'board detail', 'comment list'):
+            self.assertIn(f'FastJSONRenderer: {payload}', names)
+            self.assertIn(f'FastJSONParser: {payload}', names)
+
+
+class FastJSONTests(SimpleTestCase):
+    """
+    Tests that the orjson-backed renderer and parser behave like DRF's JSON classes.
+    """
+    data = {
+        'text': 'Ümlaut \u2028 \u2029 "quoted"',
+        'lazy': lazy(lambda: 'lazy text', str)(),
+        'decimal': decimal.Decimal('1.50'),
+        'date': datetime.date(2026, 2, 28),
+        'naive': datetime.datetime(2026, 2, 28, 12, 30, 5, 123456),
+        'utc': datetime.datetime(2026, 2, 28, 12, 30, tzinfo=datetime.timezone.utc),
+        'time': datetime.time(8, 15),
+        'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+        'ids': {1: 'one', 2: 'two'},
+        'nested': [{'float': 0.1, 'none': None, 'bool': True}, (1, 2)],
+    }
+
+    def test_renders_the_same_bytes_as_json_renderer(self):
+        self.assertEqual(FastJSONRenderer().render(self.data), JSONRenderer().render(self.data))
+
+    def test_falls_back_to_the_stdlib(self):
+        big = {'big': 2 ** 70}
+        self.assertEqual(FastJSONRenderer().render(big), JSONRenderer().render(big))
+        indented = 'application/json; indent=4'
+        self.assertEqual(
+            FastJSONRenderer().render(self.data, indented), JSONRenderer().render(self.data, indented),
+        )
+        with mock.patch('core.renderers.orjson', None):
+            self.assertEqual(FastJSONRenderer().render(self.data), JSONRenderer().render(self.data))
+        self.assertEqual(FastJSONRenderer().render(None), b'')
+
+    def test_parses_like_json_parser(self):
+        content = JSONRenderer().render({'title': 'Ümlaut', 'members': [1, 2], 'due_date': None})
+        self.assertEqual(
+            FastJSONParser().parse(io.BytesIO(content)), JSONParser().parse(io.BytesIO(content)),
+        )
+        latin = '{"title": "\u00dc"}'.encode('latin-1')
+        self.assertEqual(FastJSONParser().parse(io.BytesIO(latin), parser_context={'encoding': 'latin-1'}), {'title': 'Ü'})
+
+    def test_rejects_invalid_json(self):
+        for content in (b'{"title": ', b'{"value": NaN}', b''):
+            with self.subTest(content=content), self.assertRaises(ParseError):
+                FastJSONParser().parse(io.BytesIO(content))
+
+    def test_configured_for_the_api(self):
+        self.assertIsInstance(api_settings.DEFAULT_RENDERER_CLASSES[0](), FastJSONRenderer)
+        self.assertIsInstance(api_settings.DEFAULT_PARSER_CLASSES[0](), FastJSONParser)
+
+
+class FieldsetTests(SimpleTestCase):
+    """
+    Tests for parsing and applying `?fields=` and `?exclude=`.
+    """
+
+    def test_parse_paths(self):
+        self.assertEqual(
+            parse_paths('id, assignee.id,assignee.email,,tasks,tasks.title'),
+            {'id': None, 'assignee': {'id': None, 'email': None}, 'tasks': None},
+        )
+
+    def test_fields_and_exclude(self):
+        fieldset = Fieldset.from_query(QueryDict('fields=id,title,assignee&exclude=assignee.email'))
+        data = {'id': 1, 'title': 't', 'status': 's', 'assignee': {'id': 2, 'email': 'e', 'fullname': 'f'}}
+
+        self.assertTrue(fieldset.wants('assignee'))
+        self.assertFalse(fieldset.wants('status'))
+        self.assertFalse(fieldset['assignee'].wants('email'))
+        self.assertEqual(fieldset.apply(data), {'id': 1, 'title': 't', 'assignee': {'id': 2, 'fullname': 'f'}})
+        self.assertEqual(fieldset.apply([data, {'id': 3, 'assignee': None}])[1], {'id': 3, 'assignee': None})
+
+    def test_all_fields(self):
+        fieldset = Fieldset.from_query(QueryDict('fields=&exclude='))
+
+        self.assertTrue(fieldset.is_all)
+        self.assertEqual(fieldset.key, '')
+        self.assertEqual(Fieldset.from_query(QueryDict('fields=a,b')).key, Fieldset.from_query(QueryDict('fields=b,a')).key)
+        self.assertNotEqual(Fieldset.from_query(QueryDict('fields=a')).key, Fieldset.from_query(QueryDict('exclude=a')).key)
+
+
+class TaskSparseFieldsetTests(APITestCase):
+    """
+    Tests for `?fields=` and `?exclude=` on the task and comment endpoints.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='user', email='user@example.com', first_name='Ada')
+        self.board = Boards.objects.create(title='board', owner=self.user)
+        self.board.members.add(self.user)
+        self.task = Tasks.objects.create(
+            title='task', description='d', board=self.board, priority='high', status='reviewing',
+            assignee=self.user, reviewer=self.user, due_date='2026-01-01',
+        )
+        self.comment = self.task.comments.create(text='comment', author=self.user)
+        self.client.force_authenticate(self.user)
+
+    def test_list_selects_only_requested_columns(self):
+        for path in ('/api/tasks/', '/api/tasks/reviewing/', '/api/tasks/assigned-to-me/', '/api/tasks/high-prio/'):
+            with self.subTest(path=path), CaptureQueriesContext(connection) as queries:
+                response = self.client.get(f'{path}?fields=id,title,status,assignee.id')
+
+            self.assertEqual(response.json(), [
+                {'id': self.task.id, 'title': 'task', 'status': 'reviewing', 'assignee': {'id': self.user.id}},
+            ])
+            self.assertNotIn('JOIN', queries[-1]['sql'])
+            self.assertNotIn('comments_count', queries[-1]['sql'])
+
+    def test_list_exclude(self):
+        response = self.client.get('/api/tasks/?exclude=description,comments_count,reviewer,assignee.email')
+
+        self.assertEqual(response.json(), [{
+            'id': self.task.id, 'board': self.board.id, 'title': 'task', 'status': 'reviewing',
+            'priority': 'high', 'assignee': {'id': self.user.id, 'fullname': 'Ada'}, 'due_date': '2026-01-01',
+        }])
+
+    def test_paginated_list(self):
+        Tasks.objects.create(title='second', description='d', board=self.board, priority='low')
+
+        first = self.client.get('/api/tasks/?fields=title&page_size=1').json()
+        second = self.client.get(first['next']).json()
+
+        self.assertEqual(first['results'] + second['results'], [{'title': 'task'}, {'title': 'second'}])
+
+    def test_detail_skips_excluded_users(self):
+        url = f'/api/tasks/{self.task.id}/'
+        with CaptureQueriesContext(connection) as full:
+            self.client.get(url)
+        with CaptureQueriesContext(connection) as sparse:
+            response = self.client.get(f'{url}?exclude=assignee,reviewer,description')
+
+        self.assertEqual(set(response.json()), {'id', 'board', 'title', 'status', 'priority', 'due_date', 'comments_count'})
+        self.assertIn('JOIN "auth_user"', full[-1]['sql'])
+        self.assertNotIn('auth_user', sparse[-1]['sql'])
+
+    def test_comments_skip_the_author_join(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f'/api/tasks/{self.task.id}/comments/?exclude=author')
+
+        self.assertEqual(response.json(), [
+            {'id': self.comment.id, 'created_at': response.json()[0]['created_at'], 'content': 'comment'},
+        ])
+        self.assertNotIn('auth_user', queries[-1]['sql'])
+
+    def test_writes_return_the_full_document(self):
+        response = self.client.patch(f'/api/tasks/{self.task.id}/?fields=title', {'title': 'renamed'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('assignee', response.json())
+
+
+class AsyncReadPathTests(TestCase):
+    """
+    Tests that the async GET views of the ASGI application return the same
+    documents as the DRF views.
+    """
+
+    def setUp(self):
+        caches['board_detail'].clear()
+        self.owner = User.objects.create_user(username='owner', email='owner@example.com', first_name='Olga')
+        self.member = User.objects.create_user(username='member', email='member@example.com')
+        self.board = Boards.objects.create(title='board', owner=self.owner)
+        self.board.members.add(self.owner, self.member)
+        self.foreign = Boards.objects.create(title='foreign', owner=self.member)
+        self.task = Tasks.objects.create(
+            title='task', description='d', board=self.board, priority='high', status='reviewing',
+            assignee=self.member, reviewer=self.owner, due_date='2026-01-01',
+        )
+        Tasks.objects.create(title='other', description='d', board=self.board, priority='low')
+        self.task.comments.create(text='comment', author=self.owner)
+        self.auth = {'Authorization': f'Token {Token.objects.create(user=self.owner).key}'}
+
+    def sync_get(self, path, headers=None):
+        with override_settings(ROOT_URLCONF='core.urls'):
+            return self.client.get(path, headers=headers or {})
+
+    def async_get(self, path, headers=None):
+        with override_settings(ROOT_URLCONF='core.asgi_urls'):
+            return async_to_sync(self.async_client.get)(path, headers=headers or {})
+
+    def assertSameResponse(self, path, headers=None):
+        expected = self.sync_get(path, headers)
+        actual = self.async_get(path, headers)
+        self.assertTrue(issubclass(resolve(path.partition('?')[0], urlconf='core.asgi_urls').func.view_class, AsyncReadView), path)
+        self.assertEqual(actual.status_code, expected.status_code, path)
+        self.assertEqual(actual.json(), expected.json(), path)
+        return actual
+
+    def test_documents_match(self):
+        paths = [
+            '/api/boards/',
+            f'/api/boards/{self.board.id}/',
+            '/api/tasks/',
+            f'/api/tasks/{self.task.id}/',
+            '/api/tasks/reviewing/',
+            '/api/tasks/assigned-to-me/',
+            '/api/tasks/high-prio/',
+            f'/api/tasks/{self.task.id}/comments/',
+            '/api/boards/?fields=id,title',
+            f'/api/boards/{self.board.id}/?fields=id,tasks.id,tasks.assignee.id&exclude=members',
+            '/api/tasks/?fields=id,assignee.fullname',
+            f'/api/tasks/{self.task.id}/?exclude=reviewer,assignee.email',
+            f'/api/tasks/{self.task.id}/comments/?exclude=author',
+        ]
+        for path in paths:
+            with self.subTest(path=path):
+                self.assertSameResponse(path, self.auth)
+
+    def test_errors_match(self):
+        self.assertSameResponse('/api/boards/')
+        self.assertSameResponse('/api/tasks/')
+        self.assertSameResponse('/api/tasks/reviewing/', {'Authorization': 'Token invalid'})
+        self.assertSameResponse(f'/api/boards/{self.foreign.id}/', self.auth)
+        self.assertSameResponse('/api/boards/999999/', self.auth)
+        self.assertSameResponse('/api/tasks/999999/', self.auth)
+        self.assertEqual(self.async_get('/api/tasks/')['WWW-Authenticate'], 'Token')
+
+    def test_conditional_get(self):
+        etag = self.async_get(f'/api/boards/{self.board.id}/', self.auth)['ETag']
+        self.assertEqual(etag, self.sync_get(f'/api/boards/{self.board.id}/', self.auth)['ETag'])
+
+        response = self.async_get(f'/api/boards/{self.board.id}/', {**self.auth, 'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+
+    def test_writes_and_pagination_use_the_drf_views(self):
+        with override_settings(ROOT_URLCONF='core.asgi_urls'):
+            response = async_to_sync(self.async_client.patch)(
+                f'/api/tasks/{self.task.id}/', {'title': 'renamed'},
+                content_type='application/json', headers=self.auth,
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['title'], 'renamed')
+
+        response = self.async_get('/api/tasks/?page_size=1', self.auth)
+        self.assertEqual(len(response.json()['results']), 1)
+
+
+class TaskRoutesQueryScalingTests(QueryScalingTestCase):
+    """
+    Tests that the task and comment routes take the same number of queries at every data scale.
+    """
+
+    def new_task(self, data):
+        return {
+            'board': data.board.pk, 'title': 'new', 'description': 'd', 'status': 'to-do', 'priority': 'low',
+            'assignee_id': data.user.pk, 'reviewer_id': data.user.pk, 'due_date': '2030-01-01',
+        }
+
+    def test_list(self):
+        self.assertConstantQueries(lambda data: ('GET', '/api/tasks/', None))
+
+    def test_create(self):
+        self.assertConstantQueries(lambda data: ('POST', '/api/tasks/', self.new_task(data)))
+
+    def test_detail(self):
+        self.assertConstantQueries(lambda data: ('GET', f'/api/tasks/{data.task.pk}/', None))
+
+    def test_update(self):
+        self.assertConstantQueries(lambda data: ('PATCH', f'/api/tasks/{data.task.pk}/', {'status': 'done'}))
+
+    def test_delete(self):
+        self.assertConstantQueries(lambda data: ('DELETE', f'/api/tasks/{data.task.pk}/', None))
+
+    def test_reviewing(self):
+        self.assertConstantQueries(lambda data: ('GET', '/api/tasks/reviewing/', None))
+
+    def test_assigned_to_me(self):
+        self.assertConstantQueries(lambda data: ('GET', '/api/tasks/assigned-to-me/', None))
+
+    def test_high_prio(self):
+        self.assertConstantQueries(lambda data: ('GET', '/api/tasks/high-prio/', None))
+
+    def test_comments(self):
+        self.assertConstantQueries(lambda data: ('GET', f'/api/tasks/{data.task.pk}/comments/', None))
+
+    def test_create_comment(self):
+        self.assertConstantQueries(
+            lambda data: ('POST', f'/api/tasks/{data.task.pk}/comments/', {'content': 'new'})
+        )
+
+    def test_delete_comment(self):
+        self.assertConstantQueries(
+            lambda data: ('DELETE', f'/api/tasks/{data.task.pk}/comments/{data.comment.pk}/', None)
+        )
@@ -0,0 +1,192 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication, get_authorization_header
+
+
+class TokenCache:
+    """
+    Thread-safe, bounded LRU cache mapping token keys to `Token` instances.
+
+    Entries expire after `TOKEN_CACHE_TTL` seconds and the least recently
+    used entry is evicted once `TOKEN_CACHE_MAX_SIZE` entries are stored.
+    The cache lives in process memory, so signal based invalidation only
+    reaches the current worker. The TTL is therefore kept to a few
+    seconds: long enough to absorb the bursts of requests a client sends
+    at once, short enough that a token deleted or a user deactivated in
+    another worker stops authenticating almost immediately.
+
+    Methods:
+        get(key): Returns the cached token or None.
+        set(key, token): Stores a token whose `user` is already loaded.
+        invalidate(key): Drops a single token.
+        invalidate_user(user_id): Drops every token belonging to a user.
+        clear(): Drops all entries.
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._keys_by_user = {}
+        self._lock = threading.Lock()
+
+    @property
+    def max_size(self):
+        return getattr(settings, 'TOKEN_CACHE_MAX_SIZE', 10000)
+
+    @property
+    def ttl(self):
+        return getattr(settings, 'TOKEN_CACHE_TTL', 5)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            token, expires_at = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return token
+
+    def set(self, key, token):
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (token, time.monotonic() + self.ttl)
+            self._keys_by_user.setdefault(token.user_id, set()).add(key)
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, key):
+        with self._lock:
+            self._remove(key)
+
+    def invalidate_user(self, user_id):
+        with self._lock:
+            for key in list(self._keys_by_user.get(user_id, ())):
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_user.clear()
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        user_id = entry[0].user_id
+        keys = self._keys_by_user.get(user_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_user[user_id]
+
+
+token_cache = TokenCache()
+
+
+def copy_user(user):
+    """
+    Return a new instance of `user` built from its field values.
+
+    Unlike `copy.copy()`, the copy shares no model state, such as cached
+    related objects, with the cached instance.
+    """
+    names = [field.attname for field in user._meta.concrete_fields]
+    return type(user).from_db(user._state.db, names, [getattr(user, name) for name in names])
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Drop-in replacement for DRF's `TokenAuthentication`.
+
+    Successful token lookups are kept in `token_cache`, so repeated requests
+    with the same token skip the Token/User query. Entries are invalidated
+    by the signal handlers in `user_auth_app.signals` when a token is deleted
+    or replaced, or when its user is saved (e.g. deactivated) or deleted.
+    """
+
+    def authenticate_credentials(self, key):
+        """
+        Return the (user, token) pair for the key, using the cache when possible.
+
+        Args:
+            key (str): The token key sent by the client.
+
+        Returns:
+            tuple: The authenticated user and the token.
+
+        Raises:
+            AuthenticationFailed: If the token is invalid or the user is inactive.
+        """
+        token = token_cache.get(key)
+        if token is None:
+            user, token = super().authenticate_credentials(key)
+            token_cache.set(key, token)
+        # Every request gets its own user instance, so per-request changes
+        # never leak into the shared cache entry.
+        return copy_user(token.user), token
+
+    async def aauthenticate(self, request):
+        """
+        Async counterpart of `authenticate` for views running on the event loop.
+
+        Parses the `Authorization: Token <key>` header exactly like
+        `TokenAuthentication.authenticate`.
+
+        Args:
+            request (HttpRequest): The incoming request.
+
+        Returns:
+            tuple | None: The authenticated user and the token, or None if
+            no token was sent.
+
+        Raises:
+            AuthenticationFailed: If the header is malformed or the token is invalid.
+        """
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+        if len(auth) == 1:
+            raise exceptions.AuthenticationFailed(_('Invalid token header. No credentials provided.'))
+        if len(auth) > 2:
+            raise exceptions.AuthenticationFailed(_('Invalid token header. Token string should not contain spaces.'))
+        try:
+            key = auth[1].decode()
+        except UnicodeError:
+            raise exceptions.AuthenticationFailed(
+                _('Invalid token header. Token string should not contain invalid characters.')
+            )
+        return await self.aauthenticate_credentials(key)
+
+    async def aauthenticate_credentials(self, key):
+        """
+        Async counterpart of `authenticate_credentials`.
+
+        Cache hits are answered without leaving the event loop; misses load
+        the token and its user with the async ORM.
+
+        Args:
+            key (str): The token key sent by the client.
+
+        Returns:
+            tuple: The authenticated user and the token.
+
+        Raises:
+            AuthenticationFailed: If the token is invalid or the user is inactive.
+        """
+        token = token_cache.get(key)
+        if token is None:
+            try:
+                token = await self.get_model().objects.select_related('user').aget(key=key)
+            except self.get_model().DoesNotExist:
+                raise exceptions.AuthenticationFailed(_('Invalid token.'))
+            if not token.user.is_active:
+                raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+            token_cache.set(key, token)
+        return copy_user(token.user), token
@@ -1,3 +1,6 @@
+from django.db import IntegrityError, transaction
+from django.db.models import Count, IntegerField, Max, Q
+from django.db.models.functions import Cast, Substr
 from rest_framework import serializers
 from user_auth_app.models import UserProfile
 from django.contrib.auth import authenticate
@@ -5,9 +8,12 @@ from django.contrib.auth.models import User
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from boards_app.api.serializers import UserMinimalSerializer
+from user_auth_app.backends import users_with_email
+from user_auth_app.hashing import set_password
+from core.middleware import MeasuredSerializerMixin
 
 
-class UserProfileSerializer(serializers.ModelSerializer):
+class UserProfileSerializer(MeasuredSerializerMixin, serializers.ModelSerializer):
     """
 Serializer for the UserProfile model.
 
@@ -38,6 +44,8 @@ Fields:
     password (str): Password (write-only).
     repeated_password (str): Password confirmation (write-only).
 """
+    USERNAME_ATTEMPTS = 3
+
     email = serializers.EmailField(required=True)
     repeated_password = serializers.CharField(write_only=True)
     fullname = serializers.CharField(write_only=True, allow_blank=False)
@@ -59,7 +67,8 @@ Fields:
             User: The created user instance.
 
         Raises:
-            serializers.ValidationError: If passwords don't match or email is already used.
+            serializers.ValidationError: If passwords don't match, email is already used or
+                no free username was found within `USERNAME_ATTEMPTS` saves.
         """
         pw = self.validated_data.pop('password')
         repeated_pw = self.validated_data.pop('repeated_password')
@@ -68,15 +77,10 @@ Fields:
         if pw != repeated_pw:
             raise serializers.ValidationError({'error': 'Passwords do not match'})
 
-        if User.objects.filter(email=self.validated_data['email']).exists():
+        if users_with_email(self.validated_data['email']).exists():
             raise serializers.ValidationError({'error': 'This email is already taken'})
 
         base_username = fullname.strip().replace(" ", "").lower()
-        username = base_username
-        counter = 1
-        while User.objects.filter(username=username).exists():
-            username = f"{base_username}{counter}"
-            counter += 1
 
         names = fullname.split()
         first_name = names[0] if len(names) > 0 else ""
@@ -84,13 +88,51 @@ Fields:
 
         account = User(
             email=self.validated_data['email'],
-            username=username,
+            username=self.get_available_username(base_username),
             first_name=first_name,
             last_name=last_name
         )
-        account.set_password(pw)
-        account.save()
-        return account
+        set_password(account, pw)
+        for _ in range(self.USERNAME_ATTEMPTS):
+            try:
+                with transaction.atomic():
+                    account.save()
+                return account
+            except IntegrityError:
+                # A concurrent registration took the same username or email.
+                if users_with_email(account.email).exists():
+                    raise serializers.ValidationError({'error': 'This email is already taken'})
+                account.username = self.get_available_username(base_username)
+        raise serializers.ValidationError({'error': 'Could not allocate a username, please try again'})
+
+    def get_available_username(self, base_username):
+        """
+        Return `base_username` or, if taken, the base with the next free numeric suffix.
+
+        A single aggregate query over the username index checks the base
+        name and finds the highest suffix among the names continuing it
+        with a digit: the range from `base0` up to `base:`, ':' being the
+        character after '9'. SQLite casts a suffix such as `2b` to 2, which
+        can only make the result skip numbers. Concurrent registrations can
+        still pick the same name; `save()` relies on the unique constraint
+        and retries in that case.
+
+        Args:
+            base_username (str): The username derived from the full name.
+
+        Returns:
+            str: A username that was free when the query ran.
+        """
+        base = Q(username=base_username)
+        numbered = Q(username__gte=f'{base_username}0', username__lt=f'{base_username}:')
+        suffix = Cast(Substr('username', len(base_username) + 1), IntegerField())
+        taken = User.objects.filter(base | numbered).aggregate(
+            base_taken=Count('pk', filter=base),
+            highest_suffix=Max(suffix, filter=numbered),
+        )
+        if not taken['base_taken']:
+            return base_username
+        return f"{base_username}{(taken['highest_suffix'] or 0) + 1}"
 
 
 class EmailAuthTokenSerializer(serializers.Serializer):
@@ -111,6 +153,9 @@ class EmailAuthTokenSerializer(serializers.Serializer):
         """
         Validate and authenticate the user using provided email and password.
 
+        Authentication is delegated to `EmailBackend`, which looks the user
+        up by email and checks the password in one step.
+
         Args:
             attrs (dict): Dictionary containing 'email' and 'password'.
 
@@ -124,12 +169,7 @@ class EmailAuthTokenSerializer(serializers.Serializer):
         password = attrs.get('password')
 
         if email and password:
-            try:
-                user = User.objects.get(email=email)
-            except User.DoesNotExist:
-                raise serializers.ValidationError("Invalid email or password.")
-
-            user = authenticate(self.context.get('request'), username=user.username, password=password)
+            user = authenticate(self.context.get('request'), email=email, password=password)
             if not user:
                 raise serializers.ValidationError("Invalid email or password.")
         else:
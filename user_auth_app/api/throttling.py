@@ -0,0 +1,269 @@
+"""
+Token-bucket throttling for the unauthenticated auth endpoints.
+
+Every bucket holds up to N tokens and refills continuously at N tokens per
+period, configured as DRF style rates ('5/min') in
+`REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']` under `<scope>_ip` and
+`<scope>_email`. A missing or None rate disables that throttle.
+
+Buckets live in a store selected by the `THROTTLE_BUCKET_STORE` setting:
+    'memory': Process memory, shared by all threads of one worker.
+    'sqlite': A separate SQLite file shared by all workers on the host.
+Neither store touches the main database and every decision is O(1).
+"""
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+
+DURATIONS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+# Seconds a client is told to wait when the SQLite store stays locked.
+LOCKED_WAIT = 1
+
+logger = logging.getLogger(__name__)
+
+
+def parse_rate(rate):
+    """
+    Parse a rate such as '5/min' into (capacity, tokens per second).
+
+    Args:
+        rate (str | None): The configured rate.
+
+    Returns:
+        tuple | None: Bucket capacity and refill rate, or None if unlimited.
+    """
+    if rate is None:
+        return None
+    num, period = rate.split('/')
+    capacity = int(num)
+    return capacity, capacity / DURATIONS[period[0]]
+
+
+def take_token(tokens, updated, now, capacity, refill_rate):
+    """
+    Refill a bucket up to `now` and try to take one token from it.
+
+    Args:
+        tokens (float | None): Tokens left at `updated`, None for a new bucket.
+        updated (float): Time of the last update.
+        now (float): Current time.
+        capacity (int): Maximum number of tokens.
+        refill_rate (float): Tokens added per second.
+
+    Returns:
+        tuple: (allowed, tokens left, seconds until the next token).
+    """
+    if tokens is None:
+        tokens = capacity
+    else:
+        tokens = min(capacity, tokens + (now - updated) * refill_rate)
+    if tokens >= 1:
+        return True, tokens - 1, 0
+    return False, tokens, (1 - tokens) / refill_rate
+
+
+class MemoryBucketStore:
+    """
+    Bucket store kept in process memory.
+
+    Holds at most `max_keys` buckets; the least recently used bucket is
+    dropped first, which at worst hands an idle client a full bucket.
+    """
+
+    def __init__(self, max_keys=100000):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def consume(self, key, capacity, refill_rate):
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (None, now))
+            allowed, tokens, wait = take_token(tokens, updated, now, capacity, refill_rate)
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return allowed, wait
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class SQLiteBucketStore:
+    """
+    Bucket store kept in its own SQLite file, shared across worker processes.
+
+    Each thread uses its own connection; the read-modify-write of a bucket
+    runs inside a `BEGIN IMMEDIATE` transaction on its primary key. If the
+    file stays locked longer than `timeout`, the request is throttled.
+
+    Every `prune_every` writes of a thread, buckets untouched for
+    `max_idle` seconds are deleted: they have refilled, and a missing
+    bucket is a full one. Beyond `max_keys` buckets, the least recently
+    used are deleted as well, which at worst hands an idle client a full
+    bucket.
+    """
+
+    def __init__(self, path, max_keys=100000, max_idle=DURATIONS['d'], prune_every=1000, timeout=5):
+        self.path = str(path)
+        self.max_keys = max_keys
+        self.max_idle = max_idle
+        self.prune_every = prune_every
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=OFF')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS buckets '
+                '(key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL) WITHOUT ROWID'
+            )
+            connection.execute('CREATE INDEX IF NOT EXISTS buckets_updated_idx ON buckets (updated)')
+            self._local.connection = connection
+            self._local.writes = 0
+        return connection
+
+    def consume(self, key, capacity, refill_rate):
+        now = time.time()
+        connection = self._connection()
+        try:
+            connection.execute('BEGIN IMMEDIATE')
+        except sqlite3.OperationalError:
+            logger.warning('Throttle bucket store %s is locked; throttling the request.', self.path)
+            return False, LOCKED_WAIT
+        try:
+            row = connection.execute('SELECT tokens, updated FROM buckets WHERE key = ?', (key,)).fetchone()
+            tokens, updated = row if row else (None, now)
+            allowed, tokens, wait = take_token(tokens, updated, now, capacity, refill_rate)
+            connection.execute(
+                'INSERT INTO buckets (key, tokens, updated) VALUES (?, ?, ?) '
+                'ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, updated = excluded.updated',
+                (key, tokens, now),
+            )
+            connection.execute('COMMIT')
+        except Exception:
+            connection.execute('ROLLBACK')
+            raise
+        self._local.writes += 1
+        if self._local.writes % self.prune_every == 0:
+            self.prune(now)
+        return allowed, wait
+
+    def prune(self, now=None):
+        """
+        Delete refilled buckets and the least recently used ones beyond `max_keys`.
+
+        Args:
+            now (float | None): Current time; defaults to `time.time()`.
+        """
+        now = time.time() if now is None else now
+        connection = self._connection()
+        try:
+            connection.execute('DELETE FROM buckets WHERE updated < ?', (now - self.max_idle,))
+            connection.execute(
+                'DELETE FROM buckets WHERE key IN '
+                '(SELECT key FROM buckets ORDER BY updated DESC LIMIT -1 OFFSET ?)',
+                (self.max_keys,),
+            )
+        except sqlite3.OperationalError:
+            # Locked by other workers; the next prune catches up.
+            pass
+
+    def clear(self):
+        self._connection().execute('DELETE FROM buckets')
+
+
+_store = None
+_store_config = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """
+    Return the bucket store configured by `THROTTLE_BUCKET_STORE`.
+
+    Returns:
+        MemoryBucketStore | SQLiteBucketStore: The shared store of this process.
+    """
+    global _store, _store_config
+    config = getattr(settings, 'THROTTLE_BUCKET_STORE', {'BACKEND': 'memory'})
+    key = tuple(sorted((name, str(value)) for name, value in config.items()))
+    with _store_lock:
+        if _store is None or _store_config != key:
+            if config['BACKEND'] == 'sqlite':
+                _store = SQLiteBucketStore(config['PATH'], config.get('MAX_KEYS', 100000))
+            else:
+                _store = MemoryBucketStore(config.get('MAX_KEYS', 100000))
+            _store_config = key
+        return _store
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Base class for token-bucket throttles.
+
+    The view's `throttle_scope` plus the throttle's `kind` select the rate,
+    e.g. `login_ip`. Subclasses implement `get_ident_key()`.
+    """
+    kind = None
+
+    def allow_request(self, request, view):
+        scope = getattr(view, 'throttle_scope', None)
+        rate = parse_rate(api_settings.DEFAULT_THROTTLE_RATES.get(f'{scope}_{self.kind}'))
+        if scope is None or rate is None:
+            return True
+
+        ident = self.get_ident_key(request)
+        if not ident:
+            return True
+
+        allowed, self._wait = get_store().consume(f'{scope}:{self.kind}:{ident}', *rate)
+        return allowed
+
+    def wait(self):
+        return getattr(self, '_wait', None)
+
+    def get_ident_key(self, request):
+        raise NotImplementedError('.get_ident_key() must be overridden')
+
+
+class IPBucketThrottle(TokenBucketThrottle):
+    """
+    Throttles requests per client IP address.
+
+    The address is REMOTE_ADDR unless `NUM_PROXIES` trusted proxies append
+    to X-Forwarded-For; see `REST_FRAMEWORK['NUM_PROXIES']`.
+    """
+    kind = 'ip'
+
+    def get_ident_key(self, request):
+        return self.get_ident(request)
+
+
+class EmailBucketThrottle(TokenBucketThrottle):
+    """
+    Throttles requests per email address given in the body or query string.
+    """
+    kind = 'email'
+
+    def get_ident_key(self, request):
+        email = request.query_params.get('email')
+        if email is None and hasattr(request.data, 'get'):
+            email = request.data.get('email')
+        if not isinstance(email, str):
+            return None
+        return email.strip().lower()
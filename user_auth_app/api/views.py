@@ -1,7 +1,11 @@
 from rest_framework import generics, status
 from django.contrib.auth.models import User
 from user_auth_app.models import UserProfile
-from .serializers import RegistrationSerializer, EmailAuthTokenSerializer
+from .authentication import CachedTokenAuthentication
+from .serializers import RegistrationSerializer, EmailAuthTokenSerializer, UserProfileSerializer
+from core.db_router import credentials_key, pin_to_primary
+from user_auth_app.backends import users_with_email
+from .throttling import IPBucketThrottle, EmailBucketThrottle
 from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny
 from rest_framework.authtoken.models import Token
@@ -9,19 +13,30 @@ from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.response import Response
 
 
+def pin_token_to_primary(token):
+    """
+    Pin the client that will authenticate with `token` to the primary database.
+
+    The response hands out a token the client has not sent yet, so the pin
+    `ReplicaRoutingMiddleware` sets for this request does not cover its
+    next requests, which a lagging replica might answer without the token.
+    """
+    pin_to_primary(credentials_key(f'{CachedTokenAuthentication.keyword} {token.key}'))
+
+
 class UserProfileList(generics.ListCreateAPIView):
     """
     API view to list all user profiles or create a new user profile.
 
     Inherits from Django REST Framework's ListCreateAPIView.
-    Uses the RegistrationSerializer to serialize profile data.
+    Uses the UserProfileSerializer to serialize profile data.
 
     Methods:
         get(): Returns a list of all user profiles.
         post(): Creates a new user profile from request data.
     """
     queryset = UserProfile.objects.all()
-    serializer_class = RegistrationSerializer
+    serializer_class = UserProfileSerializer
 
 
 class UserProfileDetail(generics.RetrieveUpdateDestroyAPIView):
@@ -29,7 +44,7 @@ class UserProfileDetail(generics.RetrieveUpdateDestroyAPIView):
     API view to retrieve, update, or delete a specific user profile by ID.
 
     Inherits from RetrieveUpdateDestroyAPIView to provide full CRUD support
-    for individual user profiles. Uses the RegistrationSerializer.
+    for individual user profiles. Uses the UserProfileSerializer.
 
     Methods:
         get(): Retrieves a user profile by ID.
@@ -37,7 +52,7 @@ class UserProfileDetail(generics.RetrieveUpdateDestroyAPIView):
         delete(): Deletes a user profile by ID.
     """
     queryset = UserProfile.objects.all()
-    serializer_class = RegistrationSerializer
+    serializer_class = UserProfileSerializer
 
 
 class RegistrationView(APIView):
@@ -47,10 +62,14 @@ class RegistrationView(APIView):
     Accepts user data, creates a new user upon validation,
     and returns token and user details. Uses the RegistrationSerializer.
 
+    Requests are throttled per IP and per email address.
+
     Methods:
         post(): Handles user registration and token creation.
     """
     permission_classes = [AllowAny]
+    throttle_classes = [IPBucketThrottle, EmailBucketThrottle]
+    throttle_scope = 'registration'
 
     def post(self, request):
         serializer = RegistrationSerializer(data=request.data)
@@ -59,6 +78,7 @@ class RegistrationView(APIView):
         if serializer.is_valid():
             saved_account = serializer.save()
             token, _ = Token.objects.get_or_create(user=saved_account)
+            pin_token_to_primary(token)
             data = {
                 'token': token.key,
                 'fullname': f"{saved_account.first_name} {saved_account.last_name}".strip(),
@@ -77,12 +97,15 @@ class CustomLogInView(ObtainAuthToken):
 
     Authenticates user based on provided email and password.
     Returns token and user information on success.
+    Requests are throttled per IP and per email address.
 
     Methods:
         post(): Authenticates and logs in the user.
     """
     permission_classes= [AllowAny]
     serializer_class= EmailAuthTokenSerializer  
+    throttle_classes = [IPBucketThrottle, EmailBucketThrottle]
+    throttle_scope = 'login'
 
     def post(self, request):
         serializer = self.serializer_class(
@@ -96,6 +119,7 @@ class CustomLogInView(ObtainAuthToken):
         if serializer.is_valid():
             user = serializer.validated_data['user']
             token, _ = Token.objects.get_or_create(user=user)
+            pin_token_to_primary(token)
             fullname = f"{user.first_name} {user.last_name}".strip()
             data = {
                 'token': token.key,
@@ -114,16 +138,21 @@ class EmailCheckView(APIView):
     """
     API view to check if a user exists with the provided email.
 
+    Requests are throttled per IP and per email address.
+
     Methods:
         get(request): Returns user details if the email exists, otherwise an error.
     """
+    throttle_classes = [IPBucketThrottle, EmailBucketThrottle]
+    throttle_scope = 'email_check'
+
     def get(self, request):
         email = request.query_params.get('email')
         if not email:
             return Response({'error': 'Email is required'}, status=status.HTTP_400_BAD_REQUEST)
 
         try:
-            user = User.objects.get(email=email)
+            user = users_with_email(email).get()
         except User.DoesNotExist:
             return Response({'error': 'No user with this email found'}, status=status.HTTP_404_NOT_FOUND)
 
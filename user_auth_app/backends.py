@@ -0,0 +1,77 @@
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db.models import Value
+from django.db.models.functions import Lower
+from django.utils.crypto import get_random_string
+
+from user_auth_app.hashing import check_user_password, verify_password
+
+
+_dummy_password_hash = None
+
+
+def users_with_email(email):
+    """
+    Return the users whose email matches case-insensitively.
+
+    The query is shaped to hit the unique `auth_user_email_ci_uniq` index on
+    LOWER(email), which only covers non-blank emails.
+
+    Args:
+        email (str): The email address to look up.
+
+    Returns:
+        QuerySet: Matching users (at most one).
+    """
+    return User.objects.annotate(email_lower=Lower('email')).filter(
+        email_lower=Lower(Value(email)),
+        email__gt='',
+    )
+
+
+def dummy_password_hash():
+    """
+    Return a hash of a random password, created once per process with the
+    default hasher, so unknown emails cost the same PBKDF2 work as known ones.
+    """
+    global _dummy_password_hash
+    if _dummy_password_hash is None:
+        _dummy_password_hash = make_password(get_random_string(32))
+    return _dummy_password_hash
+
+
+class EmailBackend(ModelBackend):
+    """
+    Authentication backend that identifies users by email address.
+
+    Looks the user up with a single indexed, case-insensitive query and
+    checks the password against a dummy hash when no user matches, so
+    response times do not reveal whether an email is registered. Password
+    checks run in the mode configured by `PASSWORD_HASHING`.
+    """
+
+    def authenticate(self, request, email=None, password=None, **kwargs):
+        """
+        Authenticate a user by email and password.
+
+        Args:
+            request: The current HTTP request (may be None).
+            email (str): The email address of the user.
+            password (str): The raw password.
+
+        Returns:
+            User | None: The authenticated user, or None if the credentials are invalid.
+        """
+        if email is None or password is None:
+            return None
+
+        try:
+            user = users_with_email(email).get()
+        except User.DoesNotExist:
+            verify_password(password, dummy_password_hash())
+            return None
+
+        if check_user_password(user, password) and self.user_can_authenticate(user):
+            return user
+        return None
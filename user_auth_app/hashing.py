@@ -0,0 +1,228 @@
+"""
+Password hashing execution modes.
+
+PBKDF2 is deliberately CPU-bound. In the default `inline` mode it runs on
+the request worker like plain Django. In `process` mode every hash runs in
+a bounded process pool, so a login storm cannot tie up all gunicorn sync
+workers; when the pool and its queue are full the request fails fast with
+a 503 instead of queueing behind other logins.
+
+Configured through the `PASSWORD_HASHING` setting:
+    MODE: 'inline' or 'process'.
+    WORKERS: Number of hashing processes.
+    QUEUE_SIZE: Jobs allowed to wait for a free process.
+    TIMEOUT: Seconds to wait for a result before giving up.
+"""
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from core import metrics
+
+
+DEFAULTS = {
+    'MODE': 'inline',
+    'WORKERS': 2,
+    'QUEUE_SIZE': 16,
+    'TIMEOUT': 10,
+}
+
+latency = metrics.histogram('password_hashing.latency_ms')
+queue_depth = metrics.gauge('password_hashing.queue_depth')
+rejected = metrics.counter('password_hashing.rejected')
+timeouts = metrics.counter('password_hashing.timeouts')
+
+
+class PasswordHashingUnavailable(APIException):
+    """
+    Raised when the hashing pool is saturated or does not answer in time.
+    """
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'The server is busy. Please try again shortly.'
+    default_code = 'password_hashing_unavailable'
+    wait = 1
+
+
+def get_config():
+    """
+    Return the effective `PASSWORD_HASHING` configuration.
+
+    Returns:
+        dict: The defaults updated with the project settings.
+    """
+    return {**DEFAULTS, **getattr(settings, 'PASSWORD_HASHING', {})}
+
+
+class HashingPool:
+    """
+    Process pool with a hard limit on running plus queued hashing jobs.
+
+    Methods:
+        run(func, *args): Runs `func` in the pool and returns its result.
+        shutdown(): Stops the worker processes.
+    """
+
+    def __init__(self, workers, queue_size, timeout):
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        # Spawned workers only import the hashers, never the parent's
+        # threads, locks or database connections.
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('spawn'),
+        )
+
+    def run(self, func, *args):
+        if not self._slots.acquire(blocking=False):
+            rejected.inc()
+            raise PasswordHashingUnavailable()
+        queue_depth.inc()
+        try:
+            future = self._executor.submit(func, *args)
+        except Exception:
+            self._release()
+            raise
+        # The slot is only freed once the job has really finished, so jobs
+        # abandoned after a timeout still count against the queue limit.
+        future.add_done_callback(self._release)
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            timeouts.inc()
+            raise PasswordHashingUnavailable()
+
+    def _release(self, future=None):
+        queue_depth.dec()
+        self._slots.release()
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_pool = None
+_pool_config = None
+_pool_lock = threading.Lock()
+
+
+def get_pool(config):
+    """
+    Return the process pool for the given configuration.
+
+    The pool is created lazily inside each worker process, after gunicorn
+    has forked, and recreated if the configuration changes.
+    """
+    global _pool, _pool_config
+    key = (config['WORKERS'], config['QUEUE_SIZE'], config['TIMEOUT'])
+    with _pool_lock:
+        if _pool is None or _pool_config != key:
+            if _pool is not None:
+                _pool.shutdown()
+            _pool = HashingPool(*key)
+            _pool_config = key
+        return _pool
+
+
+def shutdown_pool():
+    """
+    Stop the hashing processes of this worker, if any were started.
+    """
+    global _pool, _pool_config
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+        _pool = None
+        _pool_config = None
+
+
+def _run(func, *args):
+    config = get_config()
+    started = time.perf_counter()
+    try:
+        if config['MODE'] == 'process':
+            return get_pool(config).run(func, *args)
+        return func(*args)
+    finally:
+        latency.observe((time.perf_counter() - started) * 1000)
+
+
+def hash_password(password):
+    """
+    Hash a raw password with the default hasher.
+
+    Args:
+        password (str): The raw password.
+
+    Returns:
+        str: The encoded password hash.
+
+    Raises:
+        PasswordHashingUnavailable: If the pool is saturated.
+    """
+    return _run(hashers.make_password, password)
+
+
+def verify_password(password, encoded):
+    """
+    Check a raw password against an encoded hash.
+
+    Args:
+        password (str): The raw password.
+        encoded (str): The stored password hash.
+
+    Returns:
+        bool: True if the password matches.
+
+    Raises:
+        PasswordHashingUnavailable: If the pool is saturated.
+    """
+    return _run(hashers.check_password, password, encoded)
+
+
+def set_password(user, password):
+    """
+    Set a user's password using the configured hashing mode.
+
+    Unlike `User.set_password`, the hash may be computed off the request
+    worker. The user is not saved.
+
+    Args:
+        user (User): The user to update.
+        password (str): The raw password.
+    """
+    user.password = hash_password(password)
+    user._password = password
+
+
+def check_user_password(user, password):
+    """
+    Check a user's password and upgrade outdated hashes.
+
+    Mirrors `User.check_password`, but hashing runs in the configured mode.
+
+    Args:
+        user (User): The user whose password is checked.
+        password (str): The raw password.
+
+    Returns:
+        bool: True if the password matches.
+    """
+    if not user.has_usable_password():
+        return False
+    valid = verify_password(password, user.password)
+    if valid and _must_update(user.password):
+        set_password(user, password)
+        user._password = None
+        user.save(update_fields=['password'])
+    return valid
+
+
+def _must_update(encoded):
+    preferred = hashers.get_hasher('default')
+    hasher = hashers.identify_hasher(encoded)
+    return hasher.algorithm != preferred.algorithm or preferred.must_update(encoded)
@@ -0,0 +1,50 @@
+from django.db import migrations
+from django.db.models import Count
+from django.db.models.functions import Lower
+
+
+def check_email_duplicates(apps, schema_editor):
+    """
+    Refuse to create the index while emails differ only in case.
+
+    Which of the accounts to keep is for an administrator to decide, so the
+    duplicates are listed instead of merged.
+    """
+    User = apps.get_model('auth', 'User')
+    duplicates = (
+        User.objects.filter(email__gt='')
+        .values(normalized=Lower('email'))
+        .annotate(count=Count('pk'))
+        .filter(count__gt=1)
+        .order_by('normalized')
+    )
+    if duplicates:
+        listing = ', '.join(f"{row['normalized']} ({row['count']} users)" for row in duplicates)
+        raise RuntimeError(
+            'Cannot add a case-insensitive unique index on auth_user.email: '
+            f'these emails are used by several users: {listing}. '
+            'Change or remove the duplicate accounts and run the migration again.'
+        )
+
+
+class Migration(migrations.Migration):
+    """
+    Add a case-insensitive unique index on auth_user.email.
+
+    Blank emails are left out of the index, so users created without an
+    email (e.g. via createsuperuser) do not collide. Existing emails that
+    differ only in case stop the migration before the index is created.
+    """
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('user_auth_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_email_duplicates, migrations.RunPython.noop),
+        migrations.RunSQL(
+            sql="CREATE UNIQUE INDEX auth_user_email_ci_uniq ON auth_user (LOWER(email)) WHERE email > '';",
+            reverse_sql="DROP INDEX auth_user_email_ci_uniq;",
+        ),
+    ]
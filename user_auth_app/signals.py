@@ -0,0 +1,23 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from user_auth_app.api.authentication import token_cache
+
+
+@receiver([post_save, post_delete], sender=Token)
+def invalidate_cached_token(sender, instance, **kwargs):
+    """
+    Drop a token from the authentication cache when it is replaced or deleted.
+    """
+    token_cache.invalidate(instance.key)
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_cached_user_tokens(sender, instance, **kwargs):
+    """
+    Drop all cached tokens of a user when the user is changed or deleted,
+    so deactivated users are rejected on their next request.
+    """
+    token_cache.invalidate_user(instance.pk)
@@ -1,3 +1,435 @@
-from django.test import TestCase
+import sqlite3
+import tempfile
+from importlib import import_module
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth import authenticate
+from django.contrib.auth.models import User
+from django.db import IntegrityError, connection
+from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from boards_app.seed import SEED_PASSWORD
+from core.db_router import ReplicaRoutingMiddleware, get_pin_cache
+from core.testing import QueryScalingTestCase
+from user_auth_app import hashing
+from user_auth_app.api import throttling
+from user_auth_app.api.authentication import CachedTokenAuthentication, token_cache
+from user_auth_app.api.serializers import RegistrationSerializer
+from user_auth_app.backends import users_with_email
+
+
+class CachedTokenAuthenticationTests(APITestCase):
+    """
+    Tests for the cached token authentication backend.
+    """
+
+    def setUp(self):
+        token_cache.clear()
+        self.user = User.objects.create_user(username='user', email='user@example.com')
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def tearDown(self):
+        token_cache.clear()
+
+    def get_boards(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/boards/')
+        return response, len(queries)
+
+    def test_cached_token_saves_one_query(self):
+        first, uncached_queries = self.get_boards()
+        second, cached_queries = self.get_boards()
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(cached_queries, uncached_queries - 1)
+
+    def test_deleted_token_is_rejected(self):
+        self.get_boards()
+        self.token.delete()
+
+        response, _ = self.get_boards()
+
+        self.assertEqual(response.status_code, 401)
+
+    def test_deactivated_user_is_rejected(self):
+        self.get_boards()
+        self.user.is_active = False
+        self.user.save()
+
+        response, _ = self.get_boards()
+
+        self.assertEqual(response.status_code, 401)
+
+    def test_requests_get_independent_users(self):
+        authentication = CachedTokenAuthentication()
+        first, token = authentication.authenticate_credentials(self.token.key)
+        first.first_name = 'changed'
+
+        second, _ = authentication.authenticate_credentials(self.token.key)
+
+        self.assertEqual(second, self.user)
+        self.assertEqual(second.first_name, '')
+        # Related objects cached on the shared instance are not handed out.
+        self.assertIn('auth_token', token.user._state.fields_cache)
+        self.assertNotIn('auth_token', first._state.fields_cache)
+
+    def test_cache_is_bounded(self):
+        other = User.objects.create_user(username='other', email='other@example.com')
+        other_token = Token.objects.create(user=other)
+
+        with self.settings(TOKEN_CACHE_MAX_SIZE=1):
+            token_cache.set(self.token.key, self.token)
+            token_cache.set(other_token.key, other_token)
+
+        self.assertIsNone(token_cache.get(self.token.key))
+        self.assertEqual(token_cache.get(other_token.key), other_token)
+
+    def test_expired_entries_are_dropped(self):
+        with self.settings(TOKEN_CACHE_TTL=0):
+            token_cache.set(self.token.key, self.token)
+
+        self.assertIsNone(token_cache.get(self.token.key))
+
+
+class EmailBackendTests(APITestCase):
+    """
+    Tests for email based login through EmailBackend.
+    """
+
+    def setUp(self):
+        throttling.get_store().clear()
+        self.user = User.objects.create_user(username='anna', email='Anna@Example.com', password='secret-pw-123')
+
+    def test_login_is_case_insensitive(self):
+        response = self.client.post('/api/login/', {'email': 'anna@example.com', 'password': 'secret-pw-123'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['user_id'], self.user.id)
+
+    def test_authenticate_uses_a_single_query(self):
+        with self.assertNumQueries(1):
+            user = authenticate(None, email='ANNA@example.com', password='secret-pw-123')
+        self.assertEqual(user, self.user)
+
+    def test_unknown_email_still_checks_a_password_hash(self):
+        with mock.patch('user_auth_app.backends.verify_password') as verify_password:
+            with self.assertNumQueries(1):
+                user = authenticate(None, email='nobody@example.com', password='secret-pw-123')
+
+        self.assertIsNone(user)
+        verify_password.assert_called_once()
+
+    def test_wrong_password_is_rejected(self):
+        response = self.client.post('/api/login/', {'email': 'anna@example.com', 'password': 'wrong'})
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_email_is_unique_ignoring_case(self):
+        with self.assertRaises(IntegrityError):
+            User.objects.create_user(username='anna2', email='ANNA@example.com')
+
+    def test_blank_emails_do_not_collide(self):
+        User.objects.create_user(username='first')
+        User.objects.create_user(username='second')
+
+    def test_lookup_uses_the_email_index(self):
+        self.assertIn('auth_user_email_ci_uniq', users_with_email('anna@example.com').explain())
+
+    def test_migration_reports_case_variant_duplicates(self):
+        check_email_duplicates = import_module(
+            'user_auth_app.migrations.0002_user_email_ci_unique'
+        ).check_email_duplicates
+        with connection.cursor() as cursor:
+            cursor.execute('DROP INDEX auth_user_email_ci_uniq')
+        User.objects.create_user(username='anna2', email='ANNA@example.com')
+
+        with self.assertRaisesMessage(RuntimeError, 'anna@example.com (2 users)'):
+            check_email_duplicates(apps, None)
+
+
+class UsernameAllocationTests(APITestCase):
+    """
+    Tests for username generation during registration.
+    """
+
+    def setUp(self):
+        throttling.get_store().clear()
+
+    def register(self, fullname, email):
+        return self.client.post('/api/registration/', {
+            'fullname': fullname,
+            'email': email,
+            'password': 'secret-pw-123',
+            'repeated_password': 'secret-pw-123',
+        })
+
+    def test_first_registration_uses_base_name(self):
+        response = self.register('anna müller', 'anna@example.com')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(User.objects.filter(username='annamüller').exists())
+
+    def test_next_suffix_is_found_with_one_query(self):
+        for username in ('annamüller', 'annamüller1', 'annamüller7', 'annamüllerx', 'annamüller2b'):
+            User.objects.create_user(username=username)
+        serializer = RegistrationSerializer()
+
+        with self.assertNumQueries(1):
+            username = serializer.get_available_username('annamüller')
+
+        self.assertEqual(username, 'annamüller8')
+
+    def test_username_collision_is_retried(self):
+        User.objects.create_user(username='annamüller')
+
+        with mock.patch.object(
+            RegistrationSerializer,
+            'get_available_username',
+            side_effect=['annamüller', 'annamüller1'],
+        ):
+            response = self.register('anna müller', 'anna@example.com')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(User.objects.filter(username='annamüller1', email='anna@example.com').exists())
+
+    def test_repeated_username_collisions_are_rejected(self):
+        User.objects.create_user(username='annamüller')
+
+        with mock.patch.object(RegistrationSerializer, 'get_available_username', return_value='annamüller'):
+            response = self.register('anna müller', 'anna@example.com')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(User.objects.filter(email='anna@example.com').exists())
+
+    def test_lookup_fetches_a_single_row(self):
+        for suffix in range(1, 30):
+            User.objects.create_user(username=f'annamüller{suffix}')
+        User.objects.create_user(username='annamüller')
+
+        with CaptureQueriesContext(connection) as queries:
+            username = RegistrationSerializer().get_available_username('annamüller')
+
+        with connection.cursor() as cursor:
+            cursor.execute(queries[0]['sql'])
+            self.assertEqual(len(cursor.fetchall()), 1)
+        self.assertEqual(username, 'annamüller30')
+
+    def test_lookup_uses_the_username_index(self):
+        with CaptureQueriesContext(connection) as queries:
+            RegistrationSerializer().get_available_username('annamüller')
+
+        plan = connection.cursor().execute(f"EXPLAIN QUERY PLAN {queries[0]['sql']}").fetchall()
+        self.assertNotIn('SCAN', ' '.join(row[-1] for row in plan))
+
+
+@override_settings(DATABASE_REPLICAS=['replica_0'], DATABASE_REPLICA_STICKINESS=5)
+class IssuedTokenPinningTests(APITestCase):
+    """
+    Tests that clients read from the primary right after receiving a token.
+    """
+
+    def setUp(self):
+        get_pin_cache().clear()
+        throttling.get_store().clear()
+
+    def uses_replicas(self, token):
+        request = RequestFactory().get('/api/boards/', headers={'Authorization': f'Token {token}'})
+        return ReplicaRoutingMiddleware(None).uses_replicas(request)
+
+    def test_registration_pins_the_new_token(self):
+        response = self.client.post('/api/registration/', {
+            'fullname': 'anna müller',
+            'email': 'anna@example.com',
+            'password': 'secret-pw-123',
+            'repeated_password': 'secret-pw-123',
+        })
+
+        self.assertFalse(self.uses_replicas(response.data['token']))
+        self.assertTrue(self.uses_replicas('another-token'))
+
+    def test_login_pins_the_token(self):
+        User.objects.create_user(username='anna', email='anna@example.com', password='secret-pw-123')
+
+        response = self.client.post('/api/login/', {'email': 'anna@example.com', 'password': 'secret-pw-123'})
+
+        self.assertFalse(self.uses_replicas(response.data['token']))
+
+
+@override_settings(PASSWORD_HASHING={'MODE': 'process', 'WORKERS': 1, 'QUEUE_SIZE': 1, 'TIMEOUT': 30})
+class ProcessPasswordHashingTests(APITestCase):
+    """
+    Tests for running password hashing in the bounded process pool.
+    """
+
+    def setUp(self):
+        throttling.get_store().clear()
+
+    def tearDown(self):
+        hashing.shutdown_pool()
+
+    def test_registration_and_login_hash_in_the_pool(self):
+        response = self.client.post('/api/registration/', {
+            'fullname': 'pool user',
+            'email': 'pool@example.com',
+            'password': 'secret-pw-123',
+            'repeated_password': 'secret-pw-123',
+        })
+        self.assertEqual(response.status_code, 201)
+
+        response = self.client.post('/api/login/', {'email': 'pool@example.com', 'password': 'secret-pw-123'})
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNotNone(hashing._pool)
+
+    def test_saturated_pool_fails_fast(self):
+        pool = hashing.get_pool(hashing.get_config())
+        with mock.patch.object(pool._slots, 'acquire', return_value=False):
+            response = self.client.post('/api/login/', {'email': 'nobody@example.com', 'password': 'secret-pw-123'})
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '1')
+
+    def test_metrics_are_exposed_to_staff(self):
+        admin = User.objects.create_user(username='admin', email='admin@example.com', is_staff=True)
+        hashing.verify_password('secret-pw-123', 'pbkdf2_sha256$1$salt$invalid')
+        self.client.force_authenticate(admin)
+
+        response = self.client.get('/api/metrics/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertGreaterEqual(response.data['password_hashing.latency_ms']['count'], 1)
+        self.assertEqual(response.data['password_hashing.queue_depth']['value'], 0)
+
+
+class TokenBucketThrottleTests(APITestCase):
+    """
+    Tests for the token-bucket throttles on the auth endpoints.
+    """
+
+    def setUp(self):
+        throttling.get_store().clear()
+
+    def login(self, email):
+        return self.client.post('/api/login/', {'email': email, 'password': 'wrong'})
+
+    @override_settings(REST_FRAMEWORK={'DEFAULT_THROTTLE_RATES': {'login_email': '2/min'}})
+    def test_login_is_throttled_per_email(self):
+        self.assertEqual(self.login('anna@example.com').status_code, 400)
+        self.assertEqual(self.login('ANNA@example.com').status_code, 400)
+
+        response = self.login('anna@example.com')
+
+        self.assertEqual(response.status_code, 429)
+        self.assertGreater(int(response['Retry-After']), 0)
+        self.assertEqual(self.login('bob@example.com').status_code, 400)
+
+    @override_settings(REST_FRAMEWORK={'DEFAULT_THROTTLE_RATES': {'email_check_ip': '1/min'}})
+    def test_email_check_is_throttled_per_ip(self):
+        user = User.objects.create_user(username='user', email='user@example.com')
+        self.client.force_authenticate(user)
+
+        self.assertEqual(self.client.get('/api/email-check/', {'email': 'a@example.com'}).status_code, 404)
+        self.assertEqual(self.client.get('/api/email-check/', {'email': 'b@example.com'}).status_code, 429)
+
+    @override_settings(REST_FRAMEWORK={'DEFAULT_THROTTLE_RATES': {}})
+    def test_missing_rate_disables_throttle(self):
+        for _ in range(3):
+            self.assertEqual(self.login('anna@example.com').status_code, 400)
+
+    def test_throttle_does_not_query_the_database(self):
+        store = throttling.MemoryBucketStore()
+        with self.assertNumQueries(0):
+            self.assertEqual(store.consume('login:ip:127.0.0.1', 1, 1 / 60), (True, 0))
+            allowed, wait = store.consume('login:ip:127.0.0.1', 1, 1 / 60)
+        self.assertFalse(allowed)
+        self.assertGreater(wait, 0)
+
+    def test_sqlite_store_is_shared_between_instances(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'throttle.sqlite3'
+            first = throttling.SQLiteBucketStore(path)
+            second = throttling.SQLiteBucketStore(path)
+
+            self.assertTrue(first.consume('login:email:anna', 2, 2 / 60)[0])
+            self.assertTrue(second.consume('login:email:anna', 2, 2 / 60)[0])
+            self.assertFalse(first.consume('login:email:anna', 2, 2 / 60)[0])
+            first._connection().close()
+            second._connection().close()
+
+    def bucket_keys(self, store):
+        return [key for key, in store._connection().execute('SELECT key FROM buckets ORDER BY key')]
+
+    def test_sqlite_store_prunes_idle_and_excess_buckets(self):
+        with tempfile.TemporaryDirectory() as directory:
+            store = throttling.SQLiteBucketStore(Path(directory) / 'throttle.sqlite3', max_keys=2, prune_every=3)
+            with mock.patch('user_auth_app.api.throttling.time.time', return_value=1000):
+                store.consume('login:ip:idle', 2, 2 / 60)
+            for ident in ('first', 'second'):
+                store.consume(f'login:ip:{ident}', 2, 2 / 60)
+            self.assertEqual(self.bucket_keys(store), ['login:ip:first', 'login:ip:second'])
+
+            store.consume('login:ip:third', 2, 2 / 60)
+            store.consume('login:ip:fourth', 2, 2 / 60)
+            store.prune()
+
+            self.assertEqual(self.bucket_keys(store), ['login:ip:fourth', 'login:ip:third'])
+            store._connection().close()
+
+    def test_locked_sqlite_store_throttles(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'throttle.sqlite3'
+            store = throttling.SQLiteBucketStore(path, timeout=0)
+            store.consume('login:ip:anna', 2, 2 / 60)
+            blocker = sqlite3.connect(path, isolation_level=None)
+            blocker.execute('BEGIN IMMEDIATE')
+            try:
+                with self.assertLogs('user_auth_app.api.throttling', 'WARNING'):
+                    self.assertEqual(store.consume('login:ip:anna', 2, 2 / 60), (False, throttling.LOCKED_WAIT))
+            finally:
+                blocker.execute('ROLLBACK')
+                blocker.close()
+                store._connection().close()
+
+    def test_forwarded_for_header_does_not_change_the_ip(self):
+        rest_framework = {**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': {'login_ip': '1/min'}}
+        with override_settings(REST_FRAMEWORK=rest_framework):
+            self.assertEqual(self.login('anna@example.com').status_code, 400)
+            response = self.client.post(
+                '/api/login/', {'email': 'anna@example.com', 'password': 'wrong'}, HTTP_X_FORWARDED_FOR='203.0.113.9',
+            )
+
+        self.assertEqual(response.status_code, 429)
+
+
+class AuthRoutesQueryScalingTests(QueryScalingTestCase):
+    """
+    Tests that the auth and profile routes take the same number of queries at every data scale.
+    """
+
+    def test_login(self):
+        self.assertConstantQueries(
+            lambda data: ('POST', '/api/login/', {'email': data.user.email, 'password': SEED_PASSWORD}),
+            authenticate=False,
+        )
+
+    def test_registration(self):
+        self.assertConstantQueries(lambda data: ('POST', '/api/registration/', {
+            'fullname': 'New User', 'email': f'{data.prefix}-new@example.com',
+            'password': 'password', 'repeated_password': 'password',
+        }), authenticate=False)
+
+    def test_email_check(self):
+        self.assertConstantQueries(lambda data: ('GET', f'/api/email-check/?email={data.user.email}', None))
+
+    def test_profiles(self):
+        self.assertConstantQueries(lambda data: ('GET', '/api/profiles/', None))
+
+    def test_profile_detail(self):
+        self.assertConstantQueries(lambda data: ('GET', f'/api/profiles/{data.profile.pk}/', None))